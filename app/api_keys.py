@@ -0,0 +1,184 @@
+import hashlib
+import hmac
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from typing import Dict, FrozenSet, List, NamedTuple, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Tenant da API_KEY estática e dos tokens emitidos antes dos tenants (sem a claim)
+DEFAULT_TENANT = "default"
+
+
+class ApiKeyInfo(NamedTuple):
+    """Metadados do tenant dono de uma API key"""
+    tenant: str
+    # None = sem restrição de permissões
+    permissions: Optional[FrozenSet[str]] = None
+    # None = usa ACCESS_TOKEN_EXPIRE_MINUTES
+    token_ttl_minutes: Optional[int] = None
+
+
+def hash_api_key(api_key: str) -> bytes:
+    """
+    Digest SHA-256 de uma API key (o registro guarda apenas digests)
+    """
+    return hashlib.sha256(api_key.encode("utf-8")).digest()
+
+
+# Índice do registro: prefixo do digest -> [(digest completo, metadados)]
+KeyIndex = Dict[bytes, List[Tuple[bytes, ApiKeyInfo]]]
+
+INDEX_PREFIX_SIZE = 8
+
+
+def build_index(entries: Dict[bytes, ApiKeyInfo]) -> KeyIndex:
+    """
+    Indexa os digests pelo prefixo; o digest completo é conferido em tempo constante
+    """
+    index: KeyIndex = {}
+    for digest, info in entries.items():
+        index.setdefault(digest[:INDEX_PREFIX_SIZE], []).append((digest, info))
+    return index
+
+
+def build_tenants(entries: Dict[bytes, ApiKeyInfo]) -> Dict[str, ApiKeyInfo]:
+    """
+    Metadados por tenant; com várias API keys, o tenant pode conceder a união das permissões delas
+    """
+    tenants: Dict[str, ApiKeyInfo] = {}
+    for info in entries.values():
+        current = tenants.get(info.tenant)
+        if current is None:
+            tenants[info.tenant] = info
+        elif current.permissions is not None:
+            permissions = None if info.permissions is None else current.permissions | info.permissions
+            tenants[info.tenant] = current._replace(permissions=permissions)
+    return tenants
+
+
+def parse_registry(data: dict) -> Dict[bytes, ApiKeyInfo]:
+    """
+    Converte o conteúdo do arquivo de API keys:
+
+        {
+            "keys": [
+                {
+                    "tenant": "acme",
+                    "key_sha256": "<hex do SHA-256 da API key>",
+                    "permissions": ["read", "write"],
+                    "token_ttl_minutes": 15
+                }
+            ]
+        }
+    """
+    keys = {}
+    for entry in data.get("keys", []):
+        digest = bytes.fromhex(entry["key_sha256"])
+        if len(digest) != hashlib.sha256().digest_size:
+            raise ValueError(f"key_sha256 inválido para o tenant {entry.get('tenant')}")
+
+        permissions = entry.get("permissions")
+        keys[digest] = ApiKeyInfo(
+            tenant=entry["tenant"],
+            permissions=frozenset(permissions) if permissions is not None else None,
+            token_ttl_minutes=entry.get("token_ttl_minutes")
+        )
+    return keys
+
+
+class ApiKeyRegistry:
+    """
+    Registro de API keys multi-tenant, indexado pelo SHA-256 da chave
+
+    A busca é uma consulta O(1) em dicionário pelo prefixo do digest, e o
+    digest completo é confirmado com comparação em tempo constante. O arquivo
+    é relido quando muda (verificação de mtime no máximo a cada
+    `reload_interval` segundos) e o índice é trocado de uma vez: requisições
+    em andamento continuam com o registro que já consultaram, sem reiniciar
+    o servidor.
+    """
+
+    def __init__(self, path: str = "", default_api_key: str = "", reload_interval: float = 5):
+        self.path = path
+        self.reload_interval = reload_interval
+        self._static: Dict[bytes, ApiKeyInfo] = {}
+        if default_api_key:
+            self._static[hash_api_key(default_api_key)] = ApiKeyInfo(tenant=DEFAULT_TENANT)
+
+        self._index: KeyIndex = build_index(self._static)
+        self._tenants = build_tenants(self._static)
+        self._size = len(self._static)
+        self._mtime: Optional[Tuple[int, int]] = None
+        self._next_check = 0.0
+        self._lock = threading.Lock()
+        if path:
+            self.reload()
+
+    def reload(self, blocking: bool = True) -> bool:
+        """
+        Relê o arquivo se ele mudou; retorna True se o registro foi substituído
+
+        Em caso de erro no arquivo o registro anterior é mantido. Com
+        `blocking=False`, retorna imediatamente se outra thread já está relendo.
+        """
+        if not self._lock.acquire(blocking=blocking):
+            return False
+        try:
+            self._next_check = time.monotonic() + self.reload_interval
+            try:
+                stat = os.stat(self.path)
+                mtime = (stat.st_mtime_ns, stat.st_size)
+                if mtime == self._mtime:
+                    return False
+                with open(self.path) as f:
+                    keys = parse_registry(json.load(f))
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                logger.warning("Falha ao carregar API keys de %s: %s", self.path, e)
+                return False
+
+            entries = {**self._static, **keys}
+            self._index = build_index(entries)
+            self._tenants = build_tenants(entries)
+            self._size = len(entries)
+            self._mtime = mtime
+            return True
+        finally:
+            self._lock.release()
+
+    def lookup(self, api_key: str) -> Optional[ApiKeyInfo]:
+        """
+        Retorna os metadados da API key ou None se ela não estiver registrada
+        """
+        self._check_reload()
+        digest = hash_api_key(api_key)
+        for stored_digest, info in self._index.get(digest[:INDEX_PREFIX_SIZE], ()):
+            if hmac.compare_digest(stored_digest, digest):
+                return info
+        return None
+
+    def tenant(self, name: str) -> Optional[ApiKeyInfo]:
+        """
+        Metadados do tenant ou None se ele não tiver mais nenhuma API key registrada
+        """
+        self._check_reload()
+        return self._tenants.get(name)
+
+    def _check_reload(self) -> None:
+        if self.path and time.monotonic() >= self._next_check:
+            self.reload(blocking=False)
+
+    def __len__(self) -> int:
+        return self._size
+
+
+if __name__ == "__main__":
+    # Gera o key_sha256 de uma API key: python -m app.api_keys <api-key>
+    if len(sys.argv) != 2:
+        print("Uso: python -m app.api_keys <api-key>")
+        sys.exit(1)
+    print(hash_api_key(sys.argv[1]).hex())
@@ -0,0 +1,203 @@
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+from fastapi import HTTPException
+
+from . import config
+from .metrics import audit_events_dropped_total
+
+
+def parse_sample_rates(spec: str) -> Dict[str, float]:
+    """
+    Lê taxas de amostragem por tipo de evento no formato "issued=1;validated=0.1"
+    """
+    rates = {}
+    for item in filter(None, (part.strip() for part in spec.split(";"))):
+        event, _, rate = item.partition("=")
+        rates[event.strip()] = min(1.0, max(0.0, float(rate)))
+    return rates
+
+
+class AuditLog:
+    """
+    Log de auditoria em JSON lines, gravado fora do caminho das requisições
+
+    `record` só amostra o evento e o coloca em uma fila limitada em memória (sem
+    I/O nem serialização); uma thread esvazia a fila em lotes de até `batch_size`
+    eventos a cada `flush_interval` segundos e grava cada lote de uma vez em
+    arquivos rotacionados por tamanho (`max_bytes`, `backup_count` arquivos
+    antigos). Com a fila cheia o evento é descartado e contado em
+    auth_api_audit_events_dropped_total, em vez de atrasar a requisição.
+
+    `sample_rates` define a fração registrada de cada tipo de evento (tipos não
+    listados usam `default_rate`). O caminho aceita `{pid}`, para que cada worker
+    grave o seu próprio arquivo.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        sample_rates: Optional[Dict[str, float]] = None,
+        default_rate: float = 1.0,
+        max_queue: int = 10000,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        max_bytes: int = 100 * 1024 * 1024,
+        backup_count: int = 5
+    ):
+        self.path = path
+        self.enabled = bool(path)
+        self.sample_rates = sample_rates or {}
+        self.default_rate = default_rate
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.written = 0
+        self._queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=max_queue)
+        self._handler: Optional[logging.handlers.RotatingFileHandler] = None
+        self._stopped = threading.Event()
+        self._writer: Optional[threading.Thread] = None
+
+    def record(self, event: str, **fields: Any) -> None:
+        """
+        Registra um evento (amostrado conforme o tipo); nunca bloqueia
+        """
+        if not self.enabled:
+            return
+        rate = self.sample_rates.get(event, self.default_rate)
+        if rate < 1.0 and random.random() >= rate:
+            return
+        fields["event"] = event
+        fields["ts"] = time.time()
+        try:
+            self._queue.put_nowait(fields)
+        except queue.Full:
+            audit_events_dropped_total.inc(event)
+
+    def start(self) -> None:
+        """
+        Abre o arquivo e inicia a thread de gravação (uma por processo, no startup)
+        """
+        if not self.enabled or self._writer is not None:
+            return
+        path = self.path.format(pid=os.getpid())
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._handler = logging.handlers.RotatingFileHandler(
+            path, maxBytes=self.max_bytes, backupCount=self.backup_count, encoding="utf-8"
+        )
+        self._stopped.clear()
+        self._writer = threading.Thread(target=self._run_writer, name="audit-log-writer", daemon=True)
+        self._writer.start()
+
+    def _drain(self) -> List[Dict[str, Any]]:
+        events = []
+        while len(events) < self.batch_size:
+            try:
+                events.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return events
+
+    def flush(self) -> int:
+        """
+        Grava os eventos na fila, em lotes; retorna quantos foram gravados
+        """
+        if self._handler is None:
+            return 0
+        written = 0
+        while True:
+            events = self._drain()
+            if not events:
+                return written
+            # Um lote vira um único registro: uma verificação de rotação e uma escrita
+            lines = "\n".join(
+                json.dumps(event, ensure_ascii=False, separators=(",", ":"), default=str) for event in events
+            )
+            self._handler.emit(logging.makeLogRecord({"msg": lines}))
+            written += len(events)
+            self.written += len(events)
+
+    def _run_writer(self) -> None:
+        while not self._stopped.wait(self.flush_interval):
+            self.flush()
+
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def close(self) -> None:
+        """
+        Para a thread de gravação, grava o que estiver na fila e fecha o arquivo
+        """
+        if self._writer is None:
+            return
+        self._stopped.set()
+        self._writer.join()
+        self._writer = None
+        self.flush()
+        self._handler.close()
+        self._handler = None
+
+
+# Log de auditoria do processo; a thread de gravação é iniciada no startup da aplicação
+audit_log = AuditLog(
+    config.AUDIT_LOG_PATH,
+    sample_rates=parse_sample_rates(config.AUDIT_SAMPLE_RATES),
+    max_queue=config.AUDIT_QUEUE_SIZE,
+    batch_size=config.AUDIT_BATCH_SIZE,
+    flush_interval=config.AUDIT_FLUSH_INTERVAL,
+    max_bytes=config.AUDIT_MAX_BYTES,
+    backup_count=config.AUDIT_BACKUP_COUNT
+)
+
+
+# Motivo registrado no log de auditoria para cada status de recusa
+REJECTION_REASONS = {
+    401: "unauthorized",
+    403: "forbidden",
+    413: "too_large",
+    429: "rate_limited",
+    503: "overloaded"
+}
+
+
+@contextmanager
+def audited(event: str, route: str, **fields) -> Iterator[dict]:
+    """
+    Registra o evento da requisição no log de auditoria, com a latência do handler
+
+    O bloco pode completar os campos (ex: `user_id`) ou trocar o evento por
+    "rejected" com um `reason`; uma HTTPException vira "rejected" com o motivo
+    correspondente ao status.
+    """
+    if not audit_log.enabled:
+        yield fields
+        return
+
+    start = time.perf_counter()
+    try:
+        yield fields
+    except HTTPException as e:
+        fields["event"] = "rejected"
+        fields.setdefault("reason", REJECTION_REASONS.get(e.status_code, f"http_{e.status_code}"))
+        raise
+    except Exception:
+        fields["event"] = "error"
+        raise
+    finally:
+        audit_log.record(
+            fields.pop("event", event),
+            route=route,
+            latency_ms=round((time.perf_counter() - start) * 1000, 3),
+            **fields
+        )
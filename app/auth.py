@@ -1,36 +1,480 @@
+import asyncio
+import calendar
+import json
+import secrets
+import threading
+import time
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
-from jose import JWTError, jwt
+from typing import Optional, Dict, Any, Iterable, Iterator, List, Tuple
 from . import config
+from .api_keys import DEFAULT_TENANT, ApiKeyInfo, ApiKeyRegistry
+from .cache import TTLCache, token_digest
+from .executor import CryptoExecutor
+from .jwt_engine import TokenError, build_engine
+from .metrics import observe_stage, token_verifications_total
+from .permissions import PermissionRegistry
+from .precheck import TokenPrecheck
+from .keyring import build_keyring
+from .keys import HMACKey
+from .revocation import RevocationList
+from .token_store import RefreshTokenStore
 
-def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
+keyring = build_keyring()
+
+# Engine de assinatura/verificação ("native" ou "jose"), montada uma vez na inicialização
+jwt_engine = build_engine(config.JWT_ENGINE, keyring)
+
+def offload_min_tokens(keyring) -> int:
+    """
+    Tamanho mínimo do job enviado ao pool de threads
+
+    Com alguma chave assimétrica no keyring toda operação sai do event loop, mesmo
+    a de um único token (uma assinatura RSA/ECDSA custa milissegundos); com chaves
+    HMAC só os lotes de EXECUTOR_OFFLOAD_MIN_TOKENS tokens ou mais.
+    """
+    if all(isinstance(key, HMACKey) for key in keyring.all_keys()):
+        return config.EXECUTOR_OFFLOAD_MIN_TOKENS
+    return 1
+
+# Assinatura/verificação fora do event loop; o pool de processos só compensa para chaves assimétricas
+crypto_executor = CryptoExecutor(
+    threads=config.EXECUTOR_THREADS,
+    processes=0 if isinstance(keyring.signing_key, HMACKey) else config.EXECUTOR_PROCESSES,
+    max_pending=config.EXECUTOR_MAX_PENDING,
+    min_offload=offload_min_tokens(keyring),
+    engine_name=config.JWT_ENGINE
+)
+
+# API keys autorizadas a emitir tokens, com os metadados de cada tenant
+api_key_registry = ApiKeyRegistry(
+    path=config.API_KEYS_FILE,
+    default_api_key=config.API_KEY,
+    reload_interval=config.API_KEYS_RELOAD_INTERVAL
+)
+
+# Registro de permissões -> bits dos tokens compactos
+permission_registry = PermissionRegistry.from_file(config.PERMISSIONS_REGISTRY_FILE)
+
+# Cache das verificações bem-sucedidas, indexado pelo digest do token
+# (em mmap, compartilhado entre os workers, quando SHARED_STATE_DIR está definido)
+if config.SHARED_STATE_DIR:
+    from .shared_state import SharedTTLCache, shared_table
+
+    token_cache = SharedTTLCache(shared_table(
+        config.SHARED_STATE_DIR, "token_cache", config.TOKEN_CACHE_MAX_SIZE, config.SHARED_CACHE_VALUE_SIZE
+    ))
+else:
+    token_cache = TTLCache(max_size=config.TOKEN_CACHE_MAX_SIZE)
+
+# Verificação estrutural (tamanho, segmentos, alfabeto, alg/kid) antes da criptografia
+token_precheck = TokenPrecheck(keyring, max_length=config.TOKEN_MAX_LENGTH)
+
+# Cache negativo: motivo da recusa de tokens que falharam na engine, indexado pelo digest
+rejection_cache = TTLCache(max_size=config.NEGATIVE_CACHE_MAX_SIZE)
+# Recusas definitivas (um token com `nbf` futuro, por exemplo, ainda pode passar a valer).
+# Da pré-verificação, só as que decodificam o header: as demais custam menos que o cache
+_CACHEABLE_REJECTIONS = {"malformed", "bad_signature", "unknown_kid", "expired", "bad_header", "bad_alg"}
+
+# Tokens revogados antes do `exp`, indexados pelo `jti`
+revocation_list = RevocationList(
+    db_path=config.REVOCATION_DB_PATH,
+    capacity=config.REVOCATION_BLOOM_CAPACITY,
+    prune_interval=config.REVOCATION_PRUNE_INTERVAL,
+    shared=shared_table(
+        config.SHARED_STATE_DIR, "revocations", config.REVOCATION_BLOOM_CAPACITY * 2, window=16
+    ) if config.SHARED_STATE_DIR else None
+)
+
+# Tokens de acesso já emitidos, reaproveitados em pedidos idênticos (ISSUANCE_CACHE_SECONDS)
+issuance_cache = TTLCache(max_size=config.ISSUANCE_CACHE_MAX_SIZE if config.ISSUANCE_CACHE_SECONDS > 0 else 0)
+
+# Store de refresh tokens, aberto no primeiro uso
+_refresh_store: Optional[RefreshTokenStore] = None
+_refresh_store_lock = threading.Lock()
+
+def get_refresh_store() -> RefreshTokenStore:
+    """
+    Retorna o store de refresh tokens, criando-o (e o arquivo SQLite) no primeiro uso
+    """
+    global _refresh_store
+    if _refresh_store is None:
+        with _refresh_store_lock:
+            if _refresh_store is None:
+                _refresh_store = RefreshTokenStore(
+                    config.REFRESH_TOKEN_DB_PATH,
+                    pool_size=config.REFRESH_TOKEN_POOL_SIZE,
+                    batch_size=config.REFRESH_TOKEN_BATCH_SIZE,
+                    flush_interval=config.REFRESH_TOKEN_FLUSH_INTERVAL
+                )
+    return _refresh_store
+
+def close_refresh_store() -> None:
+    """
+    Grava as operações pendentes e fecha o store de refresh tokens, se aberto
+    """
+    global _refresh_store
+    if _refresh_store is not None:
+        _refresh_store.close()
+        _refresh_store = None
+
+def access_token_claims(
+    data: dict,
+    expires_delta: Optional[timedelta] = None,
+    issued_at: Optional[datetime] = None
+) -> Dict[str, Any]:
     """
-    Cria um token JWT com os dados fornecidos
+    Monta as claims de um token de acesso (formato compacto, `exp`, `iat` e `jti`)
+
+    `issued_at` permite compartilhar o mesmo instante de emissão entre vários tokens
     """
-    to_encode = data.copy()
+    if config.COMPACT_TOKENS:
+        to_encode = permission_registry.compact_claims(data)
+    else:
+        to_encode = data.copy()
     
+    now = issued_at or datetime.utcnow()
     if expires_delta:
-        expire = datetime.utcnow() + expires_delta
+        expire = now + expires_delta
     else:
-        expire = datetime.utcnow() + timedelta(minutes=config.ACCESS_TOKEN_EXPIRE_MINUTES)
+        expire = now + timedelta(minutes=config.ACCESS_TOKEN_EXPIRE_MINUTES)
     
-    to_encode.update({"exp": expire, "iat": datetime.utcnow()})
+    to_encode.update({"exp": expire, "iat": now})
+    to_encode.setdefault("jti", secrets.token_urlsafe(16))
+    return to_encode
+
+def create_access_token(
+    data: dict,
+    expires_delta: Optional[timedelta] = None,
+    issued_at: Optional[datetime] = None
+) -> str:
+    """
+    Cria um token JWT com os dados fornecidos (assinado na thread atual)
+    """
+    to_encode = access_token_claims(data, expires_delta, issued_at)
     
-    encoded_jwt = jwt.encode(to_encode, config.SECRET_KEY, algorithm=config.ALGORITHM)
+    start = time.perf_counter()
+    encoded_jwt = jwt_engine.encode(to_encode)
+    observe_stage("sign", time.perf_counter() - start)
     return encoded_jwt
 
-def verify_token(token: str) -> Optional[Dict[str, Any]]:
+def create_access_tokens(
+    data_list: Iterable[dict],
+    expires_delta: timedelta,
+    issued_at: datetime
+) -> Iterator[str]:
+    """
+    Cria tokens JWT em lote, com emissão e expiração calculadas uma única vez
+    """
+    for data in data_list:
+        yield create_access_token(data, expires_delta=expires_delta, issued_at=issued_at)
+
+async def create_access_tokens_async(
+    data_list: Iterable[dict],
+    expires_delta: Optional[timedelta] = None,
+    issued_at: Optional[datetime] = None,
+    admit: bool = True
+) -> List[str]:
+    """
+    Cria tokens JWT com a assinatura no executor (fora do event loop em lotes
+    grandes ou com o pool de processos)
+
+    Levanta HTTPException 503 quando o executor está sobrecarregado (exceto com
+    `admit=False`, para continuações de uma requisição já admitida).
+    """
+    claims_list = [access_token_claims(data, expires_delta, issued_at) for data in data_list]
+    return await _sign_async(claims_list, admit=admit)
+
+async def _sign_async(claims_list: List[Dict[str, Any]], admit: bool = True) -> List[str]:
+    start = time.perf_counter()
+    tokens = await crypto_executor.sign(jwt_engine.encode, claims_list, admit=admit)
+    observe_stage("sign", time.perf_counter() - start)
+    return tokens
+
+async def create_access_token_async(
+    data: dict,
+    expires_delta: Optional[timedelta] = None,
+    issued_at: Optional[datetime] = None
+) -> str:
+    """
+    Cria um token JWT com a assinatura no executor (pool de processos, se configurado)
+    """
+    return (await create_access_tokens_async([data], expires_delta, issued_at))[0]
+
+def issuance_key(api_key: str, data: dict, expires_delta: timedelta) -> bytes:
+    """
+    Chave do cache de emissão: API key, user_id, permissões normalizadas e duração do token
+
+    Como no cache de verificação, a chave é um digest (a API key não fica em claro).
+    Cada permissão entra serializada em JSON, então valores de qualquer tipo são
+    ordenados sem TypeError e 1 e "1" continuam distintos.
+    """
+    permissions = sorted({json.dumps(permission, sort_keys=True, default=str) for permission in data["permissions"]})
+    return token_digest(json.dumps([
+        api_key, data["user_id"], permissions, expires_delta.total_seconds()
+    ]))
+
+async def issue_access_token_async(api_key: str, data: dict, expires_delta: timedelta) -> Tuple[str, datetime]:
+    """
+    Cria um token de acesso ou reaproveita o emitido para um pedido idêntico
+
+    Com ISSUANCE_CACHE_SECONDS, o token fica no cache durante a janela, mas nunca
+    além do instante em que resta menos que ISSUANCE_CACHE_MIN_REMAINING da sua
+    validade; tokens revogados nesse meio tempo não são reaproveitados.
+    Retorna (token, expiração).
+    """
+    key = None
+    if issuance_cache.max_size > 0:
+        key = issuance_key(api_key, data, expires_delta)
+        cached = issuance_cache.get(key)
+        if cached is not None:
+            access_token, jti, expire = cached
+            if not revocation_list.is_revoked(jti):
+                return access_token, expire
+            issuance_cache.discard(key)
+    
+    # Lidos antes da assinatura: a engine jose converte `iat` e `exp` do dict em timestamps
+    claims = access_token_claims(data, expires_delta)
+    issued, expire, jti = claims["iat"], claims["exp"], claims["jti"]
+    access_token = (await _sign_async([claims]))[0]
+    
+    if key is not None:
+        issued_at = calendar.timegm(issued.utctimetuple())
+        expires_at = calendar.timegm(expire.utctimetuple())
+        reusable_until = min(
+            issued_at + config.ISSUANCE_CACHE_SECONDS,
+            expires_at - (expires_at - issued_at) * config.ISSUANCE_CACHE_MIN_REMAINING
+        )
+        issuance_cache.set(key, (access_token, jti, expire), expires_at=reusable_until)
+    return access_token, expire
+
+def _too_long(token: str) -> bool:
+    """
+    Recusa tokens acima de TOKEN_MAX_LENGTH antes mesmo de calcular o digest
+    """
+    if len(token) <= token_precheck.max_length:
+        return False
+    token_verifications_total.inc("too_long", "precheck")
+    return True
+
+def _remember_rejection(key: bytes, reason: str) -> None:
+    if reason in _CACHEABLE_REJECTIONS:
+        rejection_cache.set(key, reason, expires_at=time.time() + config.NEGATIVE_CACHE_TTL)
+
+# Resultado de uma verificação: (claims, "valid") ou (None, motivo da recusa), com os
+# mesmos motivos do label `outcome` de auth_api_token_verifications_total
+Verification = Tuple[Optional[Dict[str, Any]], str]
+
+def _cached_verification(token: str, key: bytes) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """
+    Verificação sem criptografia: as claims (cache), a recusa (token revogado,
+    recusado recentemente pela engine ou estruturalmente inválido) ou
+    (None, None) quando o token precisa passar pela engine
+
+    A pré-verificação estrutural só roda fora do cache, então tokens válidos
+    repetidos não pagam por ela.
     """
-    Verifica se o token é válido e retorna os dados decodificados
+    cached = token_cache.get(key)
+    if cached is None:
+        reason = rejection_cache.get(key)
+        if reason is not None:
+            token_verifications_total.inc(reason, "negative_cache")
+            return None, reason
+        reason = token_precheck.check(token)
+        if reason is not None:
+            token_verifications_total.inc(reason, "precheck")
+            _remember_rejection(key, reason)
+            return None, reason
+        return None, None
+    if revocation_list.is_revoked(cached.get("jti")):
+        token_cache.discard(key)
+        token_verifications_total.inc("revoked", "cache")
+        return None, "revoked"
+    token_verifications_total.inc("valid", "cache")
+    return dict(cached), "valid"
+
+def _verify_signature(token: str, key: bytes) -> Verification:
+    """
+    Verificação completa pela engine (assinatura, claims e revogação), guardada no cache
     """
+    start = time.perf_counter()
     try:
-        payload = jwt.decode(token, config.SECRET_KEY, algorithms=[config.ALGORITHM])
-        return payload
-    except JWTError:
-        return None
+        payload = permission_registry.expand_claims(jwt_engine.decode(token))
+    except TokenError as e:
+        token_verifications_total.inc(e.reason, "engine")
+        _remember_rejection(key, e.reason)
+        return None, e.reason
+    finally:
+        observe_stage("verify", time.perf_counter() - start)
+
+    if revocation_list.is_revoked(payload.get("jti")):
+        token_verifications_total.inc("revoked", "engine")
+        return None, "revoked"
+    token_verifications_total.inc("valid", "engine")
+
+    exp_timestamp = payload.get("exp")
+    if isinstance(exp_timestamp, (int, float)):
+        token_cache.set(key, dict(payload), expires_at=exp_timestamp)
+
+    return payload, "valid"
+
+def verify_token_outcome(token: str) -> Verification:
+    """
+    Verifica o token e retorna (claims, "valid") ou (None, motivo da recusa)
+
+    Tokens estruturalmente inválidos são recusados antes de qualquer
+    criptografia. Verificações bem-sucedidas ficam em cache até o `exp` do
+    próprio token, evitando refazer a validação da assinatura em tokens
+    repetidos, e recusas da engine ficam no cache negativo por
+    NEGATIVE_CACHE_TTL segundos. Tokens revogados são recusados mesmo quando
+    ainda estão no cache. Tokens compactos são expandidos para as claims
+    completas (`user_id`, `permissions`).
+    """
+    if _too_long(token):
+        return None, "too_long"
+    key = token_digest(token)
+    payload, reason = _cached_verification(token, key)
+    if reason is None:
+        return _verify_signature(token, key)
+    return payload, reason
+
+def verify_token(token: str) -> Optional[Dict[str, Any]]:
+    """
+    Verifica se o token é válido e retorna os dados decodificados (veja verify_token_outcome)
+    """
+    return verify_token_outcome(token)[0]
+
+async def verify_token_outcome_async(token: str) -> Verification:
+    """
+    Como verify_token_outcome, com a verificação da assinatura no executor
+
+    Acertos do cache nunca saem do event loop. Levanta HTTPException 503
+    quando o executor está sobrecarregado.
+    """
+    if _too_long(token):
+        return None, "too_long"
+    key = token_digest(token)
+    payload, reason = _cached_verification(token, key)
+    if reason is None:
+        return await crypto_executor.run(_verify_signature, token, key)
+    return payload, reason
+
+async def verify_token_async(token: str) -> Optional[Dict[str, Any]]:
+    """
+    Como verify_token, com a verificação da assinatura no executor
+    """
+    return (await verify_token_outcome_async(token))[0]
+
+async def verify_tokens_async(tokens: List[str]) -> List[Optional[Dict[str, Any]]]:
+    """
+    Verifica uma lista de tokens: acertos do cache no event loop, os demais em um único job do executor
+    """
+    keys = [None if _too_long(token) else token_digest(token) for token in tokens]
+    results = [(None, "too_long") if key is None else _cached_verification(token, key)
+               for token, key in zip(tokens, keys)]
+    misses = [i for i, (_, reason) in enumerate(results) if reason is None]
+    if misses:
+        verified = await crypto_executor.run(
+            lambda: [_verify_signature(tokens[i], keys[i]) for i in misses], size=len(misses)
+        )
+        for i, result in zip(misses, verified):
+            results[i] = result
+    return [payload for payload, _ in results]
+
+def create_refresh_token(
+    user_id: str,
+    permissions: list,
+    access_ttl_minutes: Optional[int] = None,
+    tenant: Optional[str] = None
+) -> str:
+    """
+    Cria um refresh token de longa duração (armazenado apenas como hash), ligado ao tenant emissor
+    """
+    return get_refresh_store().issue(
+        user_id,
+        permissions,
+        ttl_seconds=config.REFRESH_TOKEN_EXPIRE_DAYS * 86400,
+        access_ttl_minutes=access_ttl_minutes,
+        tenant=tenant
+    )
+
+def rotate_refresh_token(refresh_token: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+    """
+    Troca um refresh token por um novo; o anterior deixa de ser aceito (uma
+    única rotação por token, mesmo entre workers)
+
+    Retorna (novo refresh token, dados do usuário) ou None se o token for inválido.
+    """
+    return get_refresh_store().rotate(
+        refresh_token, ttl_seconds=config.REFRESH_TOKEN_EXPIRE_DAYS * 86400
+    )
+
+async def rotate_refresh_token_async(refresh_token: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+    """
+    Como rotate_refresh_token, com a gravação no SQLite em uma thread (fora do event loop)
+    """
+    return await asyncio.to_thread(rotate_refresh_token, refresh_token)
+
+def _revoke(token: str, payload: Optional[Dict[str, Any]], tenant: Optional[str] = None) -> bool:
+    """
+    Revoga o token já verificado (`payload`) até o seu `exp`
+
+    Tokens sem a claim `tenant` (emitidos antes dos tenants) pertencem ao tenant padrão.
+    """
+    if payload is None or not payload.get("jti") or not payload.get("exp"):
+        return False
+    if tenant is not None and payload.get("tenant", DEFAULT_TENANT) != tenant:
+        return False
+
+    revocation_list.revoke(payload["jti"], expires_at=payload["exp"])
+    token_cache.discard(token_digest(token))
+    return True
+
+def revoke_token(token: str) -> bool:
+    """
+    Revoga um token válido até o seu `exp`
+
+    Retorna False se o token for inválido, já expirado ou não tiver `jti`.
+    """
+    return _revoke(token, verify_token(token))
+
+async def revoke_token_async(token: str, tenant: Optional[str] = None) -> bool:
+    """
+    Como revoke_token, com a verificação do token no executor
+
+    Com `tenant`, só revoga tokens emitidos para esse tenant.
+    """
+    return _revoke(token, await verify_token_async(token), tenant)
+
+def warm_up_crypto() -> None:
+    """
+    Emite e verifica um token descartável direto na engine (sem cache, métricas ou revogação)
+
+    Carrega os módulos de criptografia importados sob demanda e percorre os
+    caminhos de assinatura, verificação e formato compacto antes da primeira
+    requisição. Também toca a lista de revogação (filtro de Bloom).
+    """
+    now = datetime.utcnow()
+    claims = {"user_id": "warmup", "permissions": [], "type": "access_token"}
+    if config.COMPACT_TOKENS:
+        claims = permission_registry.compact_claims(claims)
+    claims.update({"exp": now + timedelta(minutes=1), "iat": now, "jti": "warmup"})
+    permission_registry.expand_claims(jwt_engine.decode(jwt_engine.encode(claims)))
+    revocation_list.is_revoked("warmup")
+
+def get_api_key_info(api_key: str) -> Optional[ApiKeyInfo]:
+    """
+    Retorna os metadados do tenant da API key, ou None se ela for inválida
+    """
+    return api_key_registry.lookup(api_key)
+
+def get_tenant_info(tenant: Optional[str]) -> Optional[ApiKeyInfo]:
+    """
+    Retorna os metadados do tenant, ou None se ele não tiver mais API keys registradas
+    """
+    return api_key_registry.tenant(tenant) if tenant else None
 
 def verify_api_key(api_key: str) -> bool:
     """
     Verifica se a API key é válida
     """
-    return api_key == config.API_KEY
\ No newline at end of file
+    return get_api_key_info(api_key) is not None
\ No newline at end of file
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# NO CHECKED-IN PROTOBUF GENCODE
+# source: app/auth_service.proto
+# Protobuf Python Version: 7.35.1
+"""Generated protocol buffer code."""
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import runtime_version as _runtime_version
+from google.protobuf import symbol_database as _symbol_database
+from google.protobuf.internal import builder as _builder
+_runtime_version.ValidateProtobufRuntimeVersion(
+    _runtime_version.Domain.PUBLIC,
+    7,
+    35,
+    1,
+    '',
+    'app/auth_service.proto'
+)
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+
+
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x16\x61pp/auth_service.proto\x12\x07\x61uth.v1\" \n\x0fValidateRequest\x12\r\n\x05token\x18\x01 \x01(\t\"l\n\x10ValidateResponse\x12\r\n\x05valid\x18\x01 \x01(\x08\x12\x0f\n\x07user_id\x18\x02 \x01(\t\x12\x13\n\x0bpermissions\x18\x03 \x03(\t\x12\x12\n\nexpires_at\x18\x04 \x01(\x03\x12\x0f\n\x07message\x18\x05 \x01(\t\"J\n\x11IssueTokenRequest\x12\x0f\n\x07\x61pi_key\x18\x01 \x01(\t\x12\x0f\n\x07user_id\x18\x02 \x01(\t\x12\x13\n\x0bpermissions\x18\x03 \x03(\t\"f\n\x12IssueTokenResponse\x12\x14\n\x0c\x61\x63\x63\x65ss_token\x18\x01 \x01(\t\x12\x12\n\ntoken_type\x18\x02 \x01(\t\x12\x12\n\nexpires_in\x18\x03 \x01(\x03\x12\x12\n\nexpires_at\x18\x04 \x01(\x03\x32\xdf\x01\n\x0b\x41uthService\x12?\n\x08Validate\x12\x18.auth.v1.ValidateRequest\x1a\x19.auth.v1.ValidateResponse\x12H\n\rValidateBatch\x12\x18.auth.v1.ValidateRequest\x1a\x19.auth.v1.ValidateResponse(\x01\x30\x01\x12\x45\n\nIssueToken\x12\x1a.auth.v1.IssueTokenRequest\x1a\x1b.auth.v1.IssueTokenResponseb\x06proto3')
+
+_globals = globals()
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'app.auth_service_pb2', _globals)
+if not _descriptor._USE_C_DESCRIPTORS:
+  DESCRIPTOR._loaded_options = None
+  _globals['_VALIDATEREQUEST']._serialized_start=35
+  _globals['_VALIDATEREQUEST']._serialized_end=67
+  _globals['_VALIDATERESPONSE']._serialized_start=69
+  _globals['_VALIDATERESPONSE']._serialized_end=177
+  _globals['_ISSUETOKENREQUEST']._serialized_start=179
+  _globals['_ISSUETOKENREQUEST']._serialized_end=253
+  _globals['_ISSUETOKENRESPONSE']._serialized_start=255
+  _globals['_ISSUETOKENRESPONSE']._serialized_end=357
+  _globals['_AUTHSERVICE']._serialized_start=360
+  _globals['_AUTHSERVICE']._serialized_end=583
+# @@protoc_insertion_point(module_scope)
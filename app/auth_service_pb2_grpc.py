@@ -0,0 +1,189 @@
+# Generated by the gRPC Python protocol compiler plugin. DO NOT EDIT!
+"""Client and server classes corresponding to protobuf-defined services."""
+import grpc
+import warnings
+
+from app import auth_service_pb2 as app_dot_auth__service__pb2
+
+GRPC_GENERATED_VERSION = '1.84.0'
+GRPC_VERSION = grpc.__version__
+_version_not_supported = False
+
+try:
+    from grpc._utilities import first_version_is_lower
+    _version_not_supported = first_version_is_lower(GRPC_VERSION, GRPC_GENERATED_VERSION)
+except ImportError:
+    _version_not_supported = True
+
+if _version_not_supported:
+    raise RuntimeError(
+        f'The grpc package installed is at version {GRPC_VERSION},'
+        + ' but the generated code in app/auth_service_pb2_grpc.py depends on'
+        + f' grpcio>={GRPC_GENERATED_VERSION}.'
+        + f' Please upgrade your grpc module to grpcio>={GRPC_GENERATED_VERSION}'
+        + f' or downgrade your generated code using grpcio-tools<={GRPC_VERSION}.'
+    )
+
+
+class AuthServiceStub:
+    """Serviço gRPC de autenticação para chamadas internas (mesmo núcleo da API REST)
+    """
+
+    def __init__(self, channel):
+        """Constructor.
+
+        Args:
+            channel: A grpc.Channel.
+        """
+        self.Validate = channel.unary_unary(
+                '/auth.v1.AuthService/Validate',
+                request_serializer=app_dot_auth__service__pb2.ValidateRequest.SerializeToString,
+                response_deserializer=app_dot_auth__service__pb2.ValidateResponse.FromString,
+                _registered_method=True)
+        self.ValidateBatch = channel.stream_stream(
+                '/auth.v1.AuthService/ValidateBatch',
+                request_serializer=app_dot_auth__service__pb2.ValidateRequest.SerializeToString,
+                response_deserializer=app_dot_auth__service__pb2.ValidateResponse.FromString,
+                _registered_method=True)
+        self.IssueToken = channel.unary_unary(
+                '/auth.v1.AuthService/IssueToken',
+                request_serializer=app_dot_auth__service__pb2.IssueTokenRequest.SerializeToString,
+                response_deserializer=app_dot_auth__service__pb2.IssueTokenResponse.FromString,
+                _registered_method=True)
+
+
+class AuthServiceServicer:
+    """Serviço gRPC de autenticação para chamadas internas (mesmo núcleo da API REST)
+    """
+
+    def Validate(self, request, context):
+        """Valida um token (equivalente a POST /auth/validate)
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def ValidateBatch(self, request_iterator, context):
+        """Valida um fluxo de tokens; cada resposta corresponde ao token na mesma posição
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def IssueToken(self, request, context):
+        """Emite um token de acesso (equivalente a POST /auth/token, sem refresh token)
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+
+def add_AuthServiceServicer_to_server(servicer, server):
+    rpc_method_handlers = {
+            'Validate': grpc.unary_unary_rpc_method_handler(
+                    servicer.Validate,
+                    request_deserializer=app_dot_auth__service__pb2.ValidateRequest.FromString,
+                    response_serializer=app_dot_auth__service__pb2.ValidateResponse.SerializeToString,
+            ),
+            'ValidateBatch': grpc.stream_stream_rpc_method_handler(
+                    servicer.ValidateBatch,
+                    request_deserializer=app_dot_auth__service__pb2.ValidateRequest.FromString,
+                    response_serializer=app_dot_auth__service__pb2.ValidateResponse.SerializeToString,
+            ),
+            'IssueToken': grpc.unary_unary_rpc_method_handler(
+                    servicer.IssueToken,
+                    request_deserializer=app_dot_auth__service__pb2.IssueTokenRequest.FromString,
+                    response_serializer=app_dot_auth__service__pb2.IssueTokenResponse.SerializeToString,
+            ),
+    }
+    generic_handler = grpc.method_handlers_generic_handler(
+            'auth.v1.AuthService', rpc_method_handlers)
+    server.add_generic_rpc_handlers((generic_handler,))
+    server.add_registered_method_handlers('auth.v1.AuthService', rpc_method_handlers)
+
+
+ # This class is part of an EXPERIMENTAL API.
+class AuthService:
+    """Serviço gRPC de autenticação para chamadas internas (mesmo núcleo da API REST)
+    """
+
+    @staticmethod
+    def Validate(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/auth.v1.AuthService/Validate',
+            app_dot_auth__service__pb2.ValidateRequest.SerializeToString,
+            app_dot_auth__service__pb2.ValidateResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def ValidateBatch(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_stream(
+            request_iterator,
+            target,
+            '/auth.v1.AuthService/ValidateBatch',
+            app_dot_auth__service__pb2.ValidateRequest.SerializeToString,
+            app_dot_auth__service__pb2.ValidateResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def IssueToken(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/auth.v1.AuthService/IssueToken',
+            app_dot_auth__service__pb2.IssueTokenRequest.SerializeToString,
+            app_dot_auth__service__pb2.IssueTokenResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
@@ -0,0 +1,93 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+
+def token_digest(token: str) -> bytes:
+    """
+    Gera a chave de cache de um token (SHA-256), evitando guardar o token em claro
+    """
+    return hashlib.sha256(token.encode("utf-8")).digest()
+
+
+class TTLCache:
+    """
+    Cache LRU com tamanho máximo e expiração individual por entrada
+
+    Cada entrada expira em um timestamp absoluto (ex: o `exp` do token).
+    Ao atingir o limite de tamanho, a entrada usada há mais tempo é descartada.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._data: "OrderedDict[bytes, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: bytes) -> Optional[Any]:
+        """
+        Retorna o valor armazenado ou None se ausente/expirado
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            value, expires_at = entry
+            if expires_at <= time.time():
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: bytes, value: Any, expires_at: float) -> None:
+        """
+        Armazena um valor até o timestamp `expires_at`
+        """
+        if self.max_size <= 0 or expires_at <= time.time():
+            return
+
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def discard(self, key: bytes) -> None:
+        """
+        Remove uma entrada, se existir
+        """
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """
+        Remove todas as entradas (os contadores são mantidos)
+        """
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Retorna os contadores do cache
+        """
+        with self._lock:
+            return {
+                "size": len(self._data),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
@@ -3,4 +3,129 @@ from decouple import config
 SECRET_KEY = config("SECRET_KEY", default="dev-secret-key")
 ALGORITHM = config("ALGORITHM", default="HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = config("ACCESS_TOKEN_EXPIRE_MINUTES", default=30, cast=int)
-API_KEY = config("API_KEY", default="dev-api-key")
\ No newline at end of file
+API_KEY = config("API_KEY", default="dev-api-key")
+
+# Registro multi-tenant de API keys (JSON com digests SHA-256), relido quando o arquivo muda.
+# API_KEY, se definida, continua válida como tenant "default".
+API_KEYS_FILE = config("API_KEYS_FILE", default="")
+API_KEYS_RELOAD_INTERVAL = config("API_KEYS_RELOAD_INTERVAL", default=5, cast=float)
+
+# Chaves PEM locais para algoritmos assimétricos (RS256, ES256, EdDSA...)
+PRIVATE_KEY_PATH = config("PRIVATE_KEY_PATH", default="")
+PUBLIC_KEY_PATH = config("PUBLIC_KEY_PATH", default="")
+PRIVATE_KEY_PASSWORD = config("PRIVATE_KEY_PASSWORD", default="")
+
+# Tempo (segundos) que clientes e proxies podem manter o /.well-known/jwks.json em cache
+JWKS_CACHE_MAX_AGE = config("JWKS_CACHE_MAX_AGE", default=3600, cast=int)
+
+# Keyring para rotação de chaves: diretório com keyring.json ou o manifesto JSON em variável
+# de ambiente. Quando definido, substitui SECRET_KEY/ALGORITHM/PEM na assinatura e verificação.
+KEYRING_DIR = config("KEYRING_DIR", default="")
+KEYRING_JSON = config("KEYRING_JSON", default="")
+# Carência (segundos) após `retired_at` em que uma chave aposentada ainda verifica tokens
+KEY_GRACE_SECONDS = config("KEY_GRACE_SECONDS", default=ACCESS_TOKEN_EXPIRE_MINUTES * 60, cast=int)
+
+# Engine JWT: "native" (HMAC com chave pré-computada) ou "jose" (python-jose)
+JWT_ENGINE = config("JWT_ENGINE", default="native")
+
+# Cache de tokens já verificados (0 desativa o cache)
+TOKEN_CACHE_MAX_SIZE = config("TOKEN_CACHE_MAX_SIZE", default=10000, cast=int)
+
+# Reaproveitamento de tokens emitidos: pedidos idênticos em /auth/token (mesma API key,
+# user_id e permissões) dentro da janela recebem o mesmo token (0 desativa), desde que
+# reste pelo menos a fração ISSUANCE_CACHE_MIN_REMAINING da sua validade
+ISSUANCE_CACHE_SECONDS = config("ISSUANCE_CACHE_SECONDS", default=0, cast=int)
+ISSUANCE_CACHE_MAX_SIZE = config("ISSUANCE_CACHE_MAX_SIZE", default=10000, cast=int)
+ISSUANCE_CACHE_MIN_REMAINING = config("ISSUANCE_CACHE_MIN_REMAINING", default=0.5, cast=float)
+
+# Pré-verificação estrutural dos tokens: tamanho máximo (caracteres) aceito antes da criptografia
+TOKEN_MAX_LENGTH = config("TOKEN_MAX_LENGTH", default=4096, cast=int)
+# Cache negativo de tokens recusados pela engine (assinatura, expiração...); 0 desativa
+NEGATIVE_CACHE_MAX_SIZE = config("NEGATIVE_CACHE_MAX_SIZE", default=1000, cast=int)
+NEGATIVE_CACHE_TTL = config("NEGATIVE_CACHE_TTL", default=300, cast=int)
+
+# Quantidade máxima de tokens por chamada de /auth/validate/batch
+VALIDATE_BATCH_MAX_SIZE = config("VALIDATE_BATCH_MAX_SIZE", default=100, cast=int)
+
+# Quantidade máxima de tokens por chamada de /auth/token/bulk
+TOKEN_BULK_MAX_SIZE = config("TOKEN_BULK_MAX_SIZE", default=5000, cast=int)
+
+# Revogação de tokens (jti): arquivo SQLite (vazio = somente em memória),
+# capacidade do filtro de Bloom e intervalo (segundos) de limpeza/sincronização
+REVOCATION_DB_PATH = config("REVOCATION_DB_PATH", default="")
+REVOCATION_BLOOM_CAPACITY = config("REVOCATION_BLOOM_CAPACITY", default=100000, cast=int)
+REVOCATION_PRUNE_INTERVAL = config("REVOCATION_PRUNE_INTERVAL", default=60, cast=int)
+
+# Refresh tokens: duração (dias), arquivo SQLite (WAL), tamanho do pool de conexões
+# e gravação em lote (máximo de operações por transação / intervalo em segundos)
+REFRESH_TOKEN_EXPIRE_DAYS = config("REFRESH_TOKEN_EXPIRE_DAYS", default=30, cast=int)
+REFRESH_TOKEN_DB_PATH = config("REFRESH_TOKEN_DB_PATH", default="refresh_tokens.db")
+REFRESH_TOKEN_POOL_SIZE = config("REFRESH_TOKEN_POOL_SIZE", default=4, cast=int)
+REFRESH_TOKEN_BATCH_SIZE = config("REFRESH_TOKEN_BATCH_SIZE", default=100, cast=int)
+REFRESH_TOKEN_FLUSH_INTERVAL = config("REFRESH_TOKEN_FLUSH_INTERVAL", default=0.05, cast=float)
+
+# Rate limit por rota (token bucket), aplicado por IP e por API key.
+# Formato: "/auth/token=60/60;/auth/validate=1000/60" (requisições/segundos); vazio desativa
+RATE_LIMITS = config("RATE_LIMITS", default="")
+# Backend dos buckets: "memory" (por processo), "shared" (workers da mesma máquina,
+# requer SHARED_STATE_DIR) ou "redis" (compartilhado entre instâncias)
+RATE_LIMIT_BACKEND = config("RATE_LIMIT_BACKEND", default="memory")
+RATE_LIMIT_REDIS_URL = config("RATE_LIMIT_REDIS_URL", default="redis://localhost:6379/0")
+RATE_LIMIT_MAX_KEYS = config("RATE_LIMIT_MAX_KEYS", default=100000, cast=int)
+# Usa X-Forwarded-For para identificar o cliente (somente atrás de proxy confiável)
+TRUST_PROXY_HEADERS = config("TRUST_PROXY_HEADERS", default=False, cast=bool)
+
+# Métricas Prometheus em /metrics. Com vários workers, defina um diretório compartilhado
+# onde cada processo grava seu snapshot (a cada METRICS_FLUSH_INTERVAL segundos)
+METRICS_MULTIPROC_DIR = config("METRICS_MULTIPROC_DIR", default="")
+METRICS_FLUSH_INTERVAL = config("METRICS_FLUSH_INTERVAL", default=5, cast=float)
+
+# Log de auditoria (emissões, validações e recusas) em JSON lines, gravado em segundo plano.
+# Vazio desativa; "{pid}" no caminho separa um arquivo por worker
+AUDIT_LOG_PATH = config("AUDIT_LOG_PATH", default="")
+# Fração registrada por tipo de evento: "issued=1;validated=0.1;rejected=1" (demais tipos: 1)
+AUDIT_SAMPLE_RATES = config("AUDIT_SAMPLE_RATES", default="")
+AUDIT_QUEUE_SIZE = config("AUDIT_QUEUE_SIZE", default=10000, cast=int)
+AUDIT_BATCH_SIZE = config("AUDIT_BATCH_SIZE", default=500, cast=int)
+AUDIT_FLUSH_INTERVAL = config("AUDIT_FLUSH_INTERVAL", default=1.0, cast=float)
+# Rotação por tamanho: bytes por arquivo e quantidade de arquivos antigos mantidos
+AUDIT_MAX_BYTES = config("AUDIT_MAX_BYTES", default=100 * 1024 * 1024, cast=int)
+AUDIT_BACKUP_COUNT = config("AUDIT_BACKUP_COUNT", default=5, cast=int)
+
+# Serviço gRPC (Validate, ValidateBatch, IssueToken) para chamadas internas, no mesmo processo
+# da API REST; 0 desativa. Sem TLS: exponha a porta apenas na rede interna
+GRPC_PORT = config("GRPC_PORT", default=0, cast=int)
+
+# Respostas montadas como dict e serializadas com orjson, sem revalidar pelo response_model
+FAST_RESPONSES = config("FAST_RESPONSES", default=False, cast=bool)
+
+
+# Tokens compactos: permissões como máscara de bits do registro versionado
+# (PERMISSIONS_REGISTRY_FILE) e nomes curtos de claims; a expansão na validação é automática
+COMPACT_TOKENS = config("COMPACT_TOKENS", default=False, cast=bool)
+PERMISSIONS_REGISTRY_FILE = config("PERMISSIONS_REGISTRY_FILE", default="")
+
+# Introspecção (RFC 7662): max-age máximo das respostas de tokens ativos. Limita por quanto
+# tempo o cache do cliente pode continuar respondendo "active" para um token revogado
+INTROSPECTION_MAX_AGE = config("INTROSPECTION_MAX_AGE", default=60, cast=int)
+
+# Estado compartilhado entre workers (gunicorn): diretório das tabelas em mmap, de preferência
+# em memória (ex: /dev/shm/auth-api). Quando definido, o cache de tokens e as revogações são
+# compartilhados por todos os workers da máquina; vazio mantém o estado em cada processo
+SHARED_STATE_DIR = config("SHARED_STATE_DIR", default="")
+# Tamanho máximo (bytes, JSON) das claims de um token no cache compartilhado
+SHARED_CACHE_VALUE_SIZE = config("SHARED_CACHE_VALUE_SIZE", default=1024, cast=int)
+
+# Aquecimento na inicialização: emite/verifica um token descartável e serializa uma resposta de
+# cada formato antes de aceitar requisições (o /_ah/warmup do App Engine executa o mesmo)
+WARMUP_ON_STARTUP = config("WARMUP_ON_STARTUP", default=True, cast=bool)
+
+# Executor da criptografia JWT: jobs com EXECUTOR_OFFLOAD_MIN_TOKENS tokens ou mais (lotes; com chaves
+# assimétricas qualquer job) rodam em threads, fora do event loop; EXECUTOR_THREADS=0 mantém tudo no
+# event loop. EXECUTOR_PROCESSES>0 assina em processos (só chaves assimétricas, um pool por worker).
+# Acima de EXECUTOR_MAX_PENDING jobs em andamento por worker (inclusive os executados no event loop)
+# as requisições recebem 503 com Retry-After (0 desativa o limite)
+EXECUTOR_THREADS = config("EXECUTOR_THREADS", default=4, cast=int)
+EXECUTOR_PROCESSES = config("EXECUTOR_PROCESSES", default=0, cast=int)
+EXECUTOR_MAX_PENDING = config("EXECUTOR_MAX_PENDING", default=256, cast=int)
+EXECUTOR_OFFLOAD_MIN_TOKENS = config("EXECUTOR_OFFLOAD_MIN_TOKENS", default=8, cast=int)
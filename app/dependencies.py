@@ -0,0 +1,181 @@
+import hashlib
+from datetime import datetime
+from typing import Any, Callable, Dict, FrozenSet
+
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+
+from . import config
+from .audit import audit_log
+from .auth import get_api_key_info, get_tenant_info, verify_token_async
+from .rate_limit import RateLimiter, build_backend, parse_rate_limits, retry_after_header
+
+# Limites por rota, aplicados separadamente por IP do cliente e por API key
+rate_limiter = RateLimiter(
+    parse_rate_limits(config.RATE_LIMITS),
+    build_backend(
+        config.RATE_LIMIT_BACKEND,
+        redis_url=config.RATE_LIMIT_REDIS_URL,
+        max_keys=config.RATE_LIMIT_MAX_KEYS,
+        shared_state_dir=config.SHARED_STATE_DIR
+    )
+)
+
+def client_ip(request: Request) -> str:
+    """
+    IP do cliente; usa o primeiro X-Forwarded-For apenas atrás de um proxy confiável
+    """
+    if config.TRUST_PROXY_HEADERS:
+        forwarded_for = request.headers.get("x-forwarded-for")
+        if forwarded_for:
+            return forwarded_for.split(",")[0].strip()
+    return request.client.host if request.client else "unknown"
+
+async def enforce_rate_limit(route: str, scope: str, identity: str) -> None:
+    """
+    Recusa a requisição com 429 e Retry-After quando o limite da rota foi atingido
+    """
+    retry_after = await rate_limiter.check(route, scope, identity)
+    if retry_after is not None:
+        if scope == "ip":
+            # Recusa antes do handler; as recusas por API key entram no evento do próprio handler
+            audit_log.record("rejected", route=route, reason="rate_limited")
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Limite de requisições excedido",
+            headers={"Retry-After": retry_after_header(retry_after)}
+        )
+
+async def enforce_api_key_rate_limit(route: str, api_key: str) -> None:
+    """
+    Aplica o limite da rota à API key (identificada pelo digest, nunca em claro)
+    """
+    digest = hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:32]
+    await enforce_rate_limit(route, "api_key", digest)
+
+def authorize_api_key(api_key: str, requested_permissions: list):
+    """
+    Valida a API key e se o tenant pode conceder as permissões pedidas
+    """
+    api_key_info = get_api_key_info(api_key)
+    if api_key_info is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="API key inválida"
+        )
+    check_granted_permissions(api_key_info, requested_permissions, "esta API key")
+    return api_key_info
+
+def authorize_tenant(tenant, requested_permissions: list):
+    """
+    Valida se o tenant de um refresh token ainda está registrado e pode conceder as permissões
+
+    Remover as API keys de um tenant do registro encerra também as cadeias de refresh dos seus usuários.
+    """
+    tenant_info = get_tenant_info(tenant)
+    if tenant_info is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Refresh token de um tenant sem API key ativa"
+        )
+    check_granted_permissions(tenant_info, requested_permissions, "este tenant")
+    return tenant_info
+
+def check_granted_permissions(api_key_info, requested_permissions: list, grantor: str) -> None:
+    """
+    Recusa com 403 permissões fora das que o tenant pode conceder
+    """
+    if api_key_info.permissions is not None:
+        # As permissões concedíveis são strings: números ou objetos pedidos nunca estão entre elas
+        denied = {
+            str(permission) for permission in requested_permissions
+            if not isinstance(permission, str) or permission not in api_key_info.permissions
+        }
+        if denied:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=f"Permissões não autorizadas para {grantor}: {', '.join(sorted(denied))}"
+            )
+
+def token_ttl_minutes(api_key_info) -> int:
+    """
+    Duração dos tokens do tenant (ou o padrão ACCESS_TOKEN_EXPIRE_MINUTES)
+    """
+    return api_key_info.token_ttl_minutes or config.ACCESS_TOKEN_EXPIRE_MINUTES
+
+def rate_limit(route: str) -> Callable:
+    """
+    Dependência que aplica o limite da rota ao IP do cliente
+    """
+    async def dependency(request: Request) -> None:
+        await enforce_rate_limit(route, "ip", client_ip(request))
+    return dependency
+
+
+bearer_scheme = HTTPBearer()
+
+async def current_token_payload(
+    credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme)
+) -> Dict[str, Any]:
+    """
+    Claims do bearer token da requisição (401 se inválido ou expirado)
+
+    O FastAPI guarda o resultado de cada dependência durante a requisição, então
+    o token é verificado uma única vez mesmo que várias dependências o usem.
+    """
+    payload = await verify_token_async(credentials.credentials)
+    
+    if payload is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token inválido ou expirado",
+            headers={"WWW-Authenticate": "Bearer"}
+        )
+    
+    # Verifica se o token não expirou
+    exp_timestamp = payload.get("exp")
+    if exp_timestamp and datetime.utcfromtimestamp(exp_timestamp) < datetime.utcnow():
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token expirado",
+            headers={"WWW-Authenticate": "Bearer"}
+        )
+    
+    return payload
+
+async def current_permissions(payload: Dict[str, Any] = Depends(current_token_payload)) -> FrozenSet[str]:
+    """
+    Permissões do token como frozenset, montado uma vez por requisição
+
+    Só as strings entram: `require_permissions` exige nomes, e outros valores
+    (aceitos em `permissions` na emissão) não são hasheáveis em todos os casos.
+    """
+    return frozenset(
+        permission for permission in payload.get("permissions") or () if isinstance(permission, str)
+    )
+
+def require_permissions(*permissions: str) -> Callable:
+    """
+    Dependência que exige todas as `permissions` no bearer token (403 se faltar alguma)
+
+    O conjunto exigido é montado na definição da rota; por requisição resta só a
+    verificação de subconjunto, que não depende do tamanho da lista do token.
+    Retorna as claims do token:
+
+        @app.get("/relatorios")
+        async def relatorios(payload: dict = Depends(require_permissions("read", "reports"))):
+            ...
+    """
+    required = frozenset(permissions)
+
+    async def dependency(
+        payload: Dict[str, Any] = Depends(current_token_payload),
+        granted: FrozenSet[str] = Depends(current_permissions)
+    ) -> Dict[str, Any]:
+        if not required <= granted:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=f"Permissões insuficientes: {', '.join(sorted(required - granted))}"
+            )
+        return payload
+    return dependency
\ No newline at end of file
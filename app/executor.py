@@ -0,0 +1,179 @@
+import asyncio
+import contextvars
+import functools
+import math
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List
+
+from fastapi import HTTPException, status
+
+from .metrics import executor_rejections_total
+from .rate_limit import retry_after_header
+from .signer import init_signing_process, sign_claims
+
+# Claims por job no pool de processos: lotes grandes são divididos entre os processos
+PROCESS_CHUNK_SIZE = 64
+
+
+class CryptoExecutor:
+    """
+    Executa a criptografia JWT fora do event loop, com controle de admissão
+
+    Jobs com pelo menos `min_offload` tokens (lotes de emissão e validação) rodam
+    em um pool de threads; jobs menores continuam no event loop, onde uma única
+    assinatura ou verificação HMAC custa menos que a troca de thread e a disputa
+    pelo GIL (com chaves assimétricas use `min_offload=1`: nenhuma operação de
+    chave fica no event loop). Com `processes` todas as assinaturas vão para um
+    pool de processos (chaves assimétricas, cujo custo de CPU justifica a troca
+    de mensagens e que assim usam os outros núcleos). Com `threads=0` nada sai
+    do event loop.
+
+    `max_pending` limita os jobs em andamento (na fila dos pools, executando ou
+    no event loop) neste processo; acima do limite toda requisição que precisa
+    de criptografia, inclusive as de um único token executadas no event loop, é
+    recusada com 503 e Retry-After, estimado pelo tempo médio que os jobs levam
+    para concluir, em vez de a latência de todas as requisições crescer sem limite.
+    """
+
+    def __init__(
+        self,
+        threads: int,
+        processes: int = 0,
+        max_pending: int = 0,
+        min_offload: int = 1,
+        engine_name: str = "native"
+    ):
+        self.threads = threads
+        self.processes = processes
+        self.max_pending = max_pending
+        self.min_offload = min_offload
+        self.pending = 0
+        self.rejected = 0
+        self._lock = threading.Lock()
+        # Média móvel (exponencial) do tempo de conclusão dos jobs, em segundos
+        self._average_seconds = 0.0
+
+        self._thread_pool = (
+            ThreadPoolExecutor(max_workers=threads, thread_name_prefix="jwt") if threads > 0 else None
+        )
+        # "spawn": os processos não herdam locks nem threads do worker, só importam o signer
+        self._process_pool = ProcessPoolExecutor(
+            max_workers=processes,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=init_signing_process,
+            initargs=(engine_name,)
+        ) if processes > 0 else None
+
+    def retry_after(self) -> float:
+        """
+        Segundos sugeridos no Retry-After quando a fila está cheia
+        """
+        return max(1.0, self._average_seconds)
+
+    @contextmanager
+    def _admitted(self, admit: bool = True) -> Iterator[None]:
+        with self._lock:
+            if admit and self.max_pending and self.pending >= self.max_pending:
+                self.rejected += 1
+                executor_rejections_total.inc()
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Servidor sobrecarregado, tente novamente",
+                    headers={"Retry-After": retry_after_header(self.retry_after())}
+                )
+            self.pending += 1
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.pending -= 1
+                if self._average_seconds:
+                    self._average_seconds = 0.9 * self._average_seconds + 0.1 * elapsed
+                else:
+                    self._average_seconds = elapsed
+
+    async def _in_thread(self, func: Callable, *args) -> Any:
+        # O contexto (ex: rota atual das métricas) acompanha a função na thread
+        context = contextvars.copy_context()
+        return await asyncio.get_running_loop().run_in_executor(
+            self._thread_pool, functools.partial(context.run, func, *args)
+        )
+
+    def offloads(self, size: int) -> bool:
+        """
+        Se um job de `size` tokens vai para o pool de threads
+        """
+        return self._thread_pool is not None and size >= self.min_offload
+
+    async def run(self, func: Callable, *args, size: int = 1) -> Any:
+        """
+        Executa `func(*args)`, no pool de threads se o job tiver `size` >= min_offload
+
+        Levanta HTTPException 503 se a fila estiver cheia, mesmo para jobs no event loop.
+        """
+        with self._admitted():
+            if not self.offloads(size):
+                return func(*args)
+            return await self._in_thread(func, *args)
+
+    async def sign(
+        self,
+        encode: Callable[[Dict[str, Any]], str],
+        claims_list: List[Dict[str, Any]],
+        admit: bool = True
+    ) -> List[str]:
+        """
+        Assina as claims: no pool de processos, se configurado, ou com `encode`
+        (no pool de threads ou no event loop, conforme o tamanho do lote)
+
+        `admit=False` dispensa o controle de admissão (continuação de uma requisição
+        já admitida, ex: os lotes seguintes de uma emissão em streaming).
+        """
+        with self._admitted(admit):
+            if self._process_pool is None and not self.offloads(len(claims_list)):
+                return [encode(claims) for claims in claims_list]
+            if self._process_pool is None:
+                return await self._in_thread(lambda: [encode(claims) for claims in claims_list])
+
+            loop = asyncio.get_running_loop()
+            chunk_size = min(PROCESS_CHUNK_SIZE, max(1, math.ceil(len(claims_list) / self.processes)))
+            chunks = await asyncio.gather(*(
+                loop.run_in_executor(self._process_pool, sign_claims, claims_list[i:i + chunk_size])
+                for i in range(0, len(claims_list), chunk_size)
+            ))
+            return [token for chunk in chunks for token in chunk]
+
+    def warm_up(self) -> None:
+        """
+        Inicia os processos do pool (import e montagem das chaves) antes da primeira requisição
+        """
+        if self._process_pool is not None:
+            wait([self._process_pool.submit(sign_claims, []) for _ in range(self.processes)])
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                "threads": self.threads,
+                "processes": self.processes,
+                "pending": self.pending,
+                "max_pending": self.max_pending,
+                "min_offload": self.min_offload,
+                "rejected": self.rejected,
+                "average_seconds": self._average_seconds
+            }
+
+    def shutdown(self) -> None:
+        """
+        Encerra os pools (chamado no shutdown da aplicação)
+        """
+        if self._thread_pool is not None:
+            self._thread_pool.shutdown(wait=False, cancel_futures=True)
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=True, cancel_futures=True)
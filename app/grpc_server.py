@@ -0,0 +1,172 @@
+import calendar
+import functools
+import time
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Callable, Optional
+
+import grpc
+from fastapi import HTTPException, status
+
+from . import config
+from .audit import audited
+from .auth import issue_access_token_async, verify_token_async, verify_token_outcome_async
+from .auth_service_pb2 import IssueTokenRequest, IssueTokenResponse, ValidateRequest, ValidateResponse
+from .auth_service_pb2_grpc import AuthServiceServicer, add_AuthServiceServicer_to_server
+from .dependencies import authorize_api_key, enforce_api_key_rate_limit, enforce_rate_limit, token_ttl_minutes
+from .metrics import current_route, request_duration, requests_total
+
+SERVICE_NAME = "auth.v1.AuthService"
+
+# Status gRPC de cada HTTPException levantada pelo núcleo compartilhado com a API REST
+STATUS_CODES = {
+    401: grpc.StatusCode.UNAUTHENTICATED,
+    403: grpc.StatusCode.PERMISSION_DENIED,
+    413: grpc.StatusCode.INVALID_ARGUMENT,
+    429: grpc.StatusCode.RESOURCE_EXHAUSTED,
+    503: grpc.StatusCode.UNAVAILABLE,
+}
+
+
+def peer_ip(context: grpc.aio.ServicerContext) -> str:
+    """
+    IP do cliente a partir do peer gRPC ("ipv4:10.0.0.1:51234", "ipv6:[::1]:51234")
+    """
+    peer = context.peer() or "unknown"
+    address = peer.partition(":")[2].rpartition(":")[0]
+    return address.strip("[]") or peer
+
+
+def rpc(method: str) -> Callable:
+    """
+    Envolve um método do serviço: métricas por método (mesmas séries das rotas REST,
+    com method="GRPC") e conversão das HTTPException do núcleo em status gRPC
+    """
+    route = f"/{SERVICE_NAME}/{method}"
+
+    def decorator(handler: Callable) -> Callable:
+        @functools.wraps(handler)
+        async def wrapper(self, request, context: grpc.aio.ServicerContext):
+            route_token = current_route.set(route)
+            code = grpc.StatusCode.OK
+            start = time.perf_counter()
+            try:
+                return await handler(self, request, context)
+            except HTTPException as e:
+                code = STATUS_CODES.get(e.status_code, grpc.StatusCode.UNKNOWN)
+                retry_after = (e.headers or {}).get("Retry-After")
+                await context.abort(
+                    code, str(e.detail), trailing_metadata=(("retry-after", retry_after),) if retry_after else ()
+                )
+            except Exception:
+                code = grpc.StatusCode.INTERNAL
+                raise
+            finally:
+                requests_total.inc(route, "GRPC", code.name)
+                request_duration.observe(time.perf_counter() - start, route, "GRPC")
+                current_route.reset(route_token)
+        return wrapper
+    return decorator
+
+
+def validate_response(payload: Optional[dict]) -> ValidateResponse:
+    """
+    Resposta de validação a partir das claims verificadas (mesmas regras do /auth/validate)
+    """
+    if payload is None:
+        return ValidateResponse(valid=False, message="Token inválido ou expirado")
+
+    exp_timestamp = payload.get("exp")
+    if exp_timestamp and exp_timestamp < time.time():
+        return ValidateResponse(valid=False, message="Token expirado")
+
+    return ValidateResponse(
+        valid=True,
+        user_id=payload.get("user_id") or "",
+        # O campo é `repeated string`: permissões de outros tipos (tokens legados) viram texto
+        permissions=[str(permission) for permission in payload.get("permissions") or []],
+        expires_at=int(exp_timestamp or 0),
+        message="Token válido"
+    )
+
+
+class AuthService(AuthServiceServicer):
+    """
+    Implementação do serviço gRPC sobre o mesmo núcleo da API REST
+
+    Verificação e emissão usam verify_token_async/issue_access_token_async (com
+    os mesmos caches, executor, revogação e métricas), e os limites de RATE_LIMITS
+    das rotas REST equivalentes valem também aqui, pelo IP do peer e pela API key.
+    """
+
+    @rpc("Validate")
+    async def Validate(self, request: ValidateRequest, context: grpc.aio.ServicerContext) -> ValidateResponse:
+        await enforce_rate_limit("/auth/validate", "ip", peer_ip(context))
+        with audited("validated", current_route.get()) as audit:
+            payload, reason = await verify_token_outcome_async(request.token)
+            response = validate_response(payload)
+            if response.valid:
+                audit["user_id"] = response.user_id
+            else:
+                audit.update(event="rejected", reason="expired" if payload is not None else reason)
+        return response
+
+    @rpc("ValidateBatch")
+    async def ValidateBatch(
+        self, request_iterator: AsyncIterator[ValidateRequest], context: grpc.aio.ServicerContext
+    ) -> None:
+        # Cada stream equivale a um POST /auth/validate/batch: um consumo do limite da rota e no
+        # máximo VALIDATE_BATCH_MAX_SIZE tokens. As respostas seguem a ordem dos tokens
+        await enforce_rate_limit("/auth/validate/batch", "ip", peer_ip(context))
+        with audited("validated", current_route.get()) as audit:
+            count = invalid = 0
+            async for request in request_iterator:
+                if count >= config.VALIDATE_BATCH_MAX_SIZE:
+                    audit.update(count=count, invalid=invalid)
+                    raise HTTPException(
+                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        detail=f"Máximo de {config.VALIDATE_BATCH_MAX_SIZE} tokens por stream"
+                    )
+                response = validate_response(await verify_token_async(request.token))
+                count += 1
+                invalid += not response.valid
+                await context.write(response)
+            audit.update(count=count, invalid=invalid)
+
+    @rpc("IssueToken")
+    async def IssueToken(self, request: IssueTokenRequest, context: grpc.aio.ServicerContext) -> IssueTokenResponse:
+        await enforce_rate_limit("/auth/token", "ip", peer_ip(context))
+        user_id = request.user_id or "anonymous"
+        permissions = list(request.permissions)
+        with audited("issued", current_route.get(), user_id=user_id) as audit:
+            await enforce_api_key_rate_limit("/auth/token", request.api_key)
+            api_key_info = authorize_api_key(request.api_key, permissions)
+            audit.update(tenant=api_key_info.tenant, permissions=permissions)
+
+            token_data = {
+                "user_id": user_id, "permissions": permissions, "type": "access_token", "tenant": api_key_info.tenant
+            }
+            access_token, expires_at = await issue_access_token_async(
+                request.api_key, token_data, timedelta(minutes=token_ttl_minutes(api_key_info))
+            )
+        return IssueTokenResponse(
+            access_token=access_token,
+            token_type="bearer",
+            expires_in=max(0, round((expires_at - datetime.utcnow()).total_seconds())),
+            expires_at=calendar.timegm(expires_at.utctimetuple())
+        )
+
+
+async def start_server(port: int) -> grpc.aio.Server:
+    """
+    Inicia o servidor gRPC no event loop atual (chamado no startup da aplicação)
+
+    Com vários workers, cada um abre o seu servidor na mesma porta (SO_REUSEPORT)
+    e o kernel distribui as conexões entre eles, como na porta HTTP. Levanta
+    RuntimeError se a porta não puder ser aberta, em vez de seguir sem o serviço.
+    """
+    server = grpc.aio.server(options=[("grpc.so_reuseport", 1)])
+    add_AuthServiceServicer_to_server(AuthService(), server)
+    if server.add_insecure_port(f"0.0.0.0:{port}") == 0:
+        raise RuntimeError(f"Não foi possível abrir a porta gRPC {port}")
+    await server.start()
+    return server
@@ -0,0 +1,248 @@
+import calendar
+import json
+from datetime import datetime
+from typing import Any, Dict, List
+
+from .keys import HMACKey, b64url_decode, b64url_encode
+
+
+class TokenError(Exception):
+    """Token inválido (erro genérico de decodificação/validação)"""
+    reason = "invalid"
+
+
+class MalformedTokenError(TokenError):
+    """Token com estrutura inválida"""
+    reason = "malformed"
+
+
+class InvalidSignatureError(TokenError):
+    """Assinatura do token não confere"""
+    reason = "bad_signature"
+
+
+class UnknownKeyError(TokenError):
+    """Token assinado com um `kid` desconhecido ou aposentado"""
+    reason = "unknown_kid"
+
+
+class ExpiredTokenError(TokenError):
+    """Token expirado"""
+    reason = "expired"
+
+
+def header_segment(key, with_kid: bool = True) -> bytes:
+    """
+    Segmento base64url do header JWT da chave, com a mesma serialização do python-jose
+    """
+    header = {"alg": key.alg, "typ": "JWT"}
+    if with_kid:
+        header["kid"] = key.kid
+    return b64url_encode(json.dumps(header, separators=(",", ":"), sort_keys=True).encode("utf-8"))
+
+
+def _timestamp(value: Any) -> Any:
+    """
+    Converte datetimes (UTC) em timestamp inteiro, como o python-jose faz
+    """
+    if isinstance(value, datetime):
+        return calendar.timegm(value.utctimetuple())
+    return value
+
+
+class JoseEngine:
+    """
+    Engine baseada no python-jose (caminho original, mantido como fallback)
+    """
+
+    name = "jose"
+
+    # python-jose não implementa EdDSA
+    UNSUPPORTED_ALGORITHMS = {"EdDSA"}
+
+    # Mensagens do python-jose para segmentos, base64 ou JSON (header/payload) inválidos:
+    # recusas `malformed`, como na engine nativa
+    MALFORMED_ERRORS = ("Not enough segments", "Invalid header", "Invalid payload", "Invalid crypto padding")
+
+    def __init__(self, keyring):
+        from jose import jwk, jwt
+
+        self._jwt = jwt
+        self.keyring = keyring
+        self.algorithm = keyring.signing_key.alg
+
+        # Objetos de chave do python-jose construídos uma vez (evita reprocessar o PEM a cada token)
+        self._jose_keys = {}
+        for key in keyring.all_keys():
+            if key.alg in self.UNSUPPORTED_ALGORITHMS:
+                raise ValueError(f"Algoritmo não suportado pela engine jose: {key.alg}")
+            if isinstance(key, HMACKey):
+                self._jose_keys[key.kid] = jwk.construct(key.secret, key.alg)
+            else:
+                self._jose_keys[key.kid] = jwk.construct(key.public_pem(), key.alg)
+
+        signing_key = keyring.signing_key
+        if isinstance(signing_key, HMACKey):
+            self._signing_key = self._jose_keys[signing_key.kid]
+        else:
+            self._signing_key = jwk.construct(signing_key.private_pem(), signing_key.alg)
+        self._headers = {"kid": signing_key.kid}
+
+    def encode(self, claims: Dict[str, Any]) -> str:
+        return self._jwt.encode(claims, self._signing_key, algorithm=self.algorithm, headers=self._headers)
+
+    def decode(self, token: str) -> Dict[str, Any]:
+        from jose import ExpiredSignatureError, JWTError
+
+        try:
+            header = self._jwt.get_unverified_header(token)
+        except JWTError as e:
+            raise MalformedTokenError(str(e)) from e
+
+        kid = header.get("kid", self.keyring.legacy_kid)
+        key = self.keyring.get(kid) if isinstance(kid, str) else None
+        if key is None:
+            raise UnknownKeyError(f"Chave desconhecida: {kid}")
+
+        try:
+            return self._jwt.decode(token, self._jose_keys[kid], algorithms=[key.alg])
+        except ExpiredSignatureError as e:
+            raise ExpiredTokenError(str(e)) from e
+        except JWTError as e:
+            message = str(e)
+            if "Signature verification failed" in message:
+                raise InvalidSignatureError(message) from e
+            if message.startswith(self.MALFORMED_ERRORS):
+                raise MalformedTokenError(message) from e
+            raise TokenError(message) from e
+
+    def public_jwks(self) -> Dict[str, List[Dict[str, Any]]]:
+        return self.keyring.public_jwks()
+
+
+class NativeEngine:
+    """
+    Engine nativa com chaves e headers pré-computados
+
+    As chaves (HMAC ou assimétricas) e o segmento base64 do header de cada `kid`
+    são montados uma única vez na criação. Na verificação, o segmento do header
+    é resolvido para a chave com uma consulta O(1) em dicionário, sem decodificar
+    o JSON do header; cada token só paga pelo JSON compacto das claims, pela
+    assinatura e pela comparação em tempo constante.
+    """
+
+    name = "native"
+
+    def __init__(self, keyring):
+        self.keyring = keyring
+        self.algorithm = keyring.signing_key.alg
+        self._signing_key = keyring.signing_key
+        self._signing_prefix = header_segment(keyring.signing_key) + b"."
+
+        # Segmento do header -> kid, para todas as chaves do keyring
+        self._kid_by_header = {}
+        for key in keyring.all_keys():
+            self._kid_by_header[header_segment(key)] = key.kid
+            if key.kid == keyring.legacy_kid:
+                self._kid_by_header[header_segment(key, with_kid=False)] = key.kid
+
+    def encode(self, claims: Dict[str, Any]) -> str:
+        payload = {key: _timestamp(value) for key, value in claims.items()}
+        payload_segment = b64url_encode(json.dumps(payload, separators=(",", ":")).encode("utf-8"))
+        signing_input = self._signing_prefix + payload_segment
+        signature = b64url_encode(self._signing_key.sign(signing_input))
+        return (signing_input + b"." + signature).decode("ascii")
+
+    def _resolve_key(self, header_segment: bytes):
+        """
+        Encontra a chave de verificação a partir do segmento do header
+        """
+        kid = self._kid_by_header.get(header_segment)
+        if kid is not None:
+            key = self.keyring.get(kid)
+            if key is None:
+                raise UnknownKeyError(f"Chave aposentada: {kid}")
+            return key
+
+        # Header com serialização diferente da nossa: decodifica e valida alg/kid
+        header = json.loads(b64url_decode(header_segment))
+        if not isinstance(header, dict):
+            raise MalformedTokenError("Header do token deve ser um objeto JSON")
+
+        kid = header.get("kid", self.keyring.legacy_kid)
+        key = self.keyring.get(kid) if isinstance(kid, str) else None
+        if key is None:
+            raise UnknownKeyError(f"Chave desconhecida: {kid}")
+        if header.get("alg") != key.alg:
+            raise TokenError("Algoritmo não permitido")
+        return key
+
+    def decode(self, token: str) -> Dict[str, Any]:
+        try:
+            raw = token.encode("ascii")
+        except UnicodeEncodeError:
+            raise MalformedTokenError("Token contém caracteres inválidos")
+
+        signing_input, _, signature_segment = raw.rpartition(b".")
+        header_segment, _, payload_segment = signing_input.partition(b".")
+        if not header_segment or not payload_segment or b"." in payload_segment:
+            raise MalformedTokenError("Token deve ter três segmentos")
+
+        try:
+            key = self._resolve_key(header_segment)
+            signature = b64url_decode(signature_segment)
+        except (ValueError, TypeError) as e:
+            raise MalformedTokenError(str(e)) from e
+
+        if not key.verify(signing_input, signature):
+            raise InvalidSignatureError("Signature verification failed.")
+
+        try:
+            claims = json.loads(b64url_decode(payload_segment))
+        except ValueError as e:
+            raise MalformedTokenError(str(e)) from e
+        if not isinstance(claims, dict):
+            raise MalformedTokenError("Payload do token deve ser um objeto JSON")
+
+        self._validate_claims(claims)
+        return claims
+
+    @staticmethod
+    def _validate_claims(claims: Dict[str, Any]) -> None:
+        """
+        Valida `exp`, `nbf` e `iat` com as mesmas regras do python-jose
+        """
+        now = calendar.timegm(datetime.utcnow().utctimetuple())
+
+        try:
+            if "iat" in claims:
+                int(claims["iat"])
+            nbf = int(claims["nbf"]) if "nbf" in claims else None
+            exp = int(claims["exp"]) if "exp" in claims else None
+        except (ValueError, TypeError) as e:
+            raise TokenError("Claims iat, nbf e exp devem ser inteiros") from e
+
+        if nbf is not None and nbf > now:
+            raise TokenError("The token is not yet valid (nbf)")
+
+        if exp is not None and exp < now:
+            raise ExpiredTokenError("Signature has expired.")
+
+    def public_jwks(self) -> Dict[str, List[Dict[str, Any]]]:
+        return self.keyring.public_jwks()
+
+
+ENGINES = {
+    JoseEngine.name: JoseEngine,
+    NativeEngine.name: NativeEngine,
+}
+
+
+def build_engine(name: str, keyring):
+    """
+    Cria a engine configurada para o keyring
+    """
+    if name not in ENGINES:
+        raise ValueError(f"Engine JWT desconhecida: {name}")
+
+    return ENGINES[name](keyring)
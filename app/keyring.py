@@ -0,0 +1,185 @@
+import json
+import os
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from . import config
+from .keys import load_signing_key
+
+KEYRING_MANIFEST = "keyring.json"
+
+
+class Keyring:
+    """
+    Conjunto de chaves indexado por `kid`: uma chave de assinatura e várias de verificação
+
+    Chaves aposentadas continuam aceitas na verificação até o fim da janela de
+    carência (`retired_at` + `grace_seconds`), permitindo rotacionar a chave de
+    assinatura sem invalidar os tokens já emitidos.
+    """
+
+    def __init__(
+        self,
+        keys: List[Any],
+        signing_kid: str,
+        retired: Optional[Dict[str, float]] = None,
+        legacy_kid: Optional[str] = None
+    ):
+        self._keys = {}
+        for key in keys:
+            if key.kid in self._keys:
+                raise ValueError(f"kid duplicado no keyring: {key.kid}")
+            self._keys[key.kid] = key
+
+        if signing_kid not in self._keys:
+            raise ValueError(f"Chave de assinatura não encontrada no keyring: {signing_kid}")
+        # Timestamp até o qual cada chave aposentada ainda verifica tokens
+        self._valid_until = dict(retired or {})
+        if signing_kid in self._valid_until:
+            raise ValueError(f"A chave de assinatura não pode estar aposentada: {signing_kid}")
+
+        self.signing_key = self._keys[signing_kid]
+        if not self.signing_key.can_sign:
+            raise ValueError(f"Chave de assinatura sem parte privada: {signing_kid}")
+
+        # Chave usada para tokens sem `kid` no header (emitidos antes do keyring)
+        if legacy_kid is not None and legacy_kid not in self._keys:
+            raise ValueError(f"Chave legada não encontrada no keyring: {legacy_kid}")
+        self.legacy_kid = legacy_kid
+
+    @classmethod
+    def single(cls, key) -> "Keyring":
+        """
+        Keyring com uma única chave (configuração clássica de SECRET_KEY/PEM)
+        """
+        return cls([key], signing_kid=key.kid, legacy_kid=key.kid)
+
+    @property
+    def signing_kid(self) -> str:
+        return self.signing_key.kid
+
+    def get(self, kid: str):
+        """
+        Retorna a chave de verificação do `kid` ou None (desconhecida ou fora da carência)
+        """
+        key = self._keys.get(kid)
+        if key is None:
+            return None
+
+        valid_until = self._valid_until.get(kid)
+        if valid_until is not None and valid_until < time.time():
+            return None
+        return key
+
+    def all_keys(self) -> List[Any]:
+        """
+        Todas as chaves do keyring, inclusive as aposentadas fora da carência
+        """
+        return list(self._keys.values())
+
+    def verification_keys(self) -> List[Any]:
+        """
+        Chaves aceitas para verificação neste momento
+        """
+        return [key for key in (self.get(kid) for kid in self._keys) if key is not None]
+
+    def public_jwks(self) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        JWK Set com as chaves públicas ativas e aposentadas ainda na carência
+        """
+        return {"keys": [jwk for jwk in (key.public_jwk() for key in self.verification_keys()) if jwk is not None]}
+
+
+def _parse_timestamp(value: Any) -> float:
+    if isinstance(value, (int, float)):
+        return float(value)
+    return datetime.fromisoformat(str(value).replace("Z", "+00:00")).timestamp()
+
+
+def keyring_from_manifest(manifest: Dict[str, Any], base_dir: str = ".", grace_seconds: int = 0) -> Keyring:
+    """
+    Monta o keyring a partir do manifesto:
+
+        {
+            "signing_kid": "2025-06",
+            "legacy_kid": "2025-01",
+            "keys": [
+                {"kid": "2025-06", "alg": "HS256", "secret": "..."},
+                {"kid": "2025-01", "alg": "RS256", "private_key": "2025-01.pem", "retired_at": "2025-06-01T00:00:00Z"}
+            ]
+        }
+
+    Caminhos de arquivos PEM são relativos a `base_dir`. `legacy_kid` (opcional)
+    indica a chave que verifica tokens emitidos sem `kid` no header.
+    """
+    keys = []
+    retired = {}
+    for entry in manifest.get("keys", []):
+        kid = entry.get("kid")
+        if not kid:
+            raise ValueError("Toda chave do keyring precisa de um kid")
+
+        def path(name):
+            value = entry.get(name)
+            return os.path.join(base_dir, value) if value else None
+
+        keys.append(load_signing_key(
+            entry["alg"],
+            secret_key=entry.get("secret"),
+            private_key_path=path("private_key"),
+            public_key_path=path("public_key"),
+            password=entry.get("password"),
+            kid=kid
+        ))
+
+        if entry.get("retired_at") is not None:
+            retired[kid] = _parse_timestamp(entry["retired_at"]) + grace_seconds
+
+    return Keyring(
+        keys,
+        signing_kid=manifest["signing_kid"],
+        retired=retired,
+        legacy_kid=manifest.get("legacy_kid")
+    )
+
+
+def load_keyring(
+    keyring_dir: Optional[str] = None,
+    keyring_json: Optional[str] = None,
+    grace_seconds: int = 0
+) -> Optional[Keyring]:
+    """
+    Carrega o keyring de `<keyring_dir>/keyring.json` ou de um JSON em variável de ambiente
+    """
+    if keyring_dir:
+        with open(os.path.join(keyring_dir, KEYRING_MANIFEST)) as f:
+            manifest = json.load(f)
+        return keyring_from_manifest(manifest, base_dir=keyring_dir, grace_seconds=grace_seconds)
+
+    if keyring_json:
+        return keyring_from_manifest(json.loads(keyring_json), grace_seconds=grace_seconds)
+
+    return None
+
+
+def build_keyring() -> Keyring:
+    """
+    Monta o keyring da configuração: KEYRING_DIR/KEYRING_JSON ou a chave única
+    (SECRET_KEY para HS*, arquivos PEM locais para RS*/ES*/EdDSA)
+    """
+    keyring = load_keyring(
+        keyring_dir=config.KEYRING_DIR or None,
+        keyring_json=config.KEYRING_JSON or None,
+        grace_seconds=config.KEY_GRACE_SECONDS
+    )
+    if keyring is not None:
+        return keyring
+
+    return Keyring.single(load_signing_key(
+        config.ALGORITHM,
+        secret_key=config.SECRET_KEY,
+        private_key_path=config.PRIVATE_KEY_PATH or None,
+        public_key_path=config.PUBLIC_KEY_PATH or None,
+        password=config.PRIVATE_KEY_PASSWORD or None
+    ))
@@ -0,0 +1,253 @@
+import base64
+import hashlib
+import hmac
+import json
+from typing import Any, Dict, Optional
+
+HMAC_ALGORITHMS = {
+    "HS256": "sha256",
+    "HS384": "sha384",
+    "HS512": "sha512",
+}
+
+RSA_ALGORITHMS = {"RS256", "RS384", "RS512"}
+
+EC_ALGORITHMS = {
+    # algoritmo: (curva JWK, tamanho em bytes de cada coordenada)
+    "ES256": ("P-256", 32),
+    "ES384": ("P-384", 48),
+    "ES512": ("P-521", 66),
+}
+
+EDDSA_ALGORITHMS = {"EdDSA"}
+
+ASYMMETRIC_ALGORITHMS = RSA_ALGORITHMS | set(EC_ALGORITHMS) | EDDSA_ALGORITHMS
+
+SUPPORTED_ALGORITHMS = set(HMAC_ALGORITHMS) | ASYMMETRIC_ALGORITHMS
+
+
+def b64url_encode(data: bytes) -> bytes:
+    """
+    Codifica em base64url sem padding (RFC 7515)
+    """
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+def b64url_decode(data: bytes) -> bytes:
+    """
+    Decodifica base64url sem padding
+    """
+    return base64.urlsafe_b64decode(data + b"=" * (-len(data) % 4))
+
+
+def _int_to_b64(value: int, length: Optional[int] = None) -> str:
+    length = length or (value.bit_length() + 7) // 8
+    return b64url_encode(value.to_bytes(length, "big")).decode("ascii")
+
+
+def _hash_algorithm(alg: str):
+    from cryptography.hazmat.primitives import hashes
+
+    return {"256": hashes.SHA256, "384": hashes.SHA384, "512": hashes.SHA512}[alg[-3:]]()
+
+
+def jwk_thumbprint(jwk: Dict[str, Any]) -> str:
+    """
+    Calcula o thumbprint RFC 7638 de uma chave pública JWK (usado como `kid`)
+    """
+    required = {
+        "RSA": ("e", "kty", "n"),
+        "EC": ("crv", "kty", "x", "y"),
+        "OKP": ("crv", "kty", "x"),
+    }[jwk["kty"]]
+    canonical = json.dumps({name: jwk[name] for name in required}, separators=(",", ":"), sort_keys=True)
+    return b64url_encode(hashlib.sha256(canonical.encode("utf-8")).digest()).decode("ascii")
+
+
+class HMACKey:
+    """
+    Chave simétrica HS256/HS384/HS512 (não é publicada no JWKS)
+    """
+
+    def __init__(self, secret: str, alg: str, kid: str = "default"):
+        if alg not in HMAC_ALGORITHMS:
+            raise ValueError(f"Algoritmo HMAC não suportado: {alg}")
+        self.alg = alg
+        self.kid = kid
+        self.can_sign = True
+        self.secret = secret
+        self._secret = secret.encode("utf-8")
+        self._digest = HMAC_ALGORITHMS[alg]
+
+    def sign(self, message: bytes) -> bytes:
+        return hmac.digest(self._secret, message, self._digest)
+
+    def verify(self, message: bytes, signature: bytes) -> bool:
+        return hmac.compare_digest(self.sign(message), signature)
+
+    def public_jwk(self) -> Optional[Dict[str, Any]]:
+        return None
+
+
+class AsymmetricKey:
+    """
+    Chave assimétrica (RSA, EC ou Ed25519/Ed448) carregada de arquivos PEM
+
+    Sem chave privada a instância só verifica; a chave pública é publicada no JWKS.
+    """
+
+    def __init__(self, alg: str, private_key=None, public_key=None, kid: Optional[str] = None):
+        if alg not in ASYMMETRIC_ALGORITHMS:
+            raise ValueError(f"Algoritmo assimétrico não suportado: {alg}")
+        if private_key is None and public_key is None:
+            raise ValueError("Informe a chave privada e/ou a chave pública")
+
+        self.alg = alg
+        self._private_key = private_key
+        self._public_key = public_key or private_key.public_key()
+        self.can_sign = private_key is not None
+        self._check_key_type()
+        self._jwk = self._build_jwk()
+        self.thumbprint = jwk_thumbprint(self._jwk)
+        self.kid = kid or self.thumbprint
+
+        # Objetos de padding/hash resolvidos uma vez, fora do caminho de cada token
+        from cryptography.exceptions import InvalidSignature
+        from cryptography.hazmat.primitives.asymmetric import ec, padding, utils
+
+        self._invalid_signature = InvalidSignature
+        self._dss = utils
+        if alg in RSA_ALGORITHMS:
+            self._sign_args = (padding.PKCS1v15(), _hash_algorithm(alg))
+        elif alg in EC_ALGORITHMS:
+            self._sign_args = (ec.ECDSA(_hash_algorithm(alg)),)
+            self._coordinate_size = EC_ALGORITHMS[alg][1]
+        else:
+            self._sign_args = ()
+
+    def _check_key_type(self) -> None:
+        from cryptography.hazmat.primitives.asymmetric import ec, ed448, ed25519, rsa
+
+        if self.alg in RSA_ALGORITHMS:
+            expected = (rsa.RSAPublicKey,)
+        elif self.alg in EC_ALGORITHMS:
+            expected = (ec.EllipticCurvePublicKey,)
+        else:
+            expected = (ed25519.Ed25519PublicKey, ed448.Ed448PublicKey)
+
+        if not isinstance(self._public_key, expected):
+            raise ValueError(f"Tipo de chave incompatível com o algoritmo {self.alg}")
+
+        if self.alg in EC_ALGORITHMS:
+            curve = {"P-256": "secp256r1", "P-384": "secp384r1", "P-521": "secp521r1"}[EC_ALGORITHMS[self.alg][0]]
+            if self._public_key.curve.name != curve:
+                raise ValueError(f"Curva {self._public_key.curve.name} incompatível com {self.alg}")
+
+    def _build_jwk(self) -> Dict[str, Any]:
+        from cryptography.hazmat.primitives.asymmetric import ed25519
+        from cryptography.hazmat.primitives.serialization import Encoding, PublicFormat
+
+        if self.alg in RSA_ALGORITHMS:
+            numbers = self._public_key.public_numbers()
+            return {"kty": "RSA", "n": _int_to_b64(numbers.n), "e": _int_to_b64(numbers.e)}
+
+        if self.alg in EC_ALGORITHMS:
+            crv, size = EC_ALGORITHMS[self.alg]
+            numbers = self._public_key.public_numbers()
+            return {"kty": "EC", "crv": crv, "x": _int_to_b64(numbers.x, size), "y": _int_to_b64(numbers.y, size)}
+
+        raw = self._public_key.public_bytes(Encoding.Raw, PublicFormat.Raw)
+        crv = "Ed25519" if isinstance(self._public_key, ed25519.Ed25519PublicKey) else "Ed448"
+        return {"kty": "OKP", "crv": crv, "x": b64url_encode(raw).decode("ascii")}
+
+    def sign(self, message: bytes) -> bytes:
+        if not self.can_sign:
+            raise ValueError("Chave sem parte privada não pode assinar")
+
+        signature = self._private_key.sign(message, *self._sign_args)
+        if self.alg in EC_ALGORITHMS:
+            # JWS usa a assinatura no formato r || s (RFC 7518, seção 3.4)
+            r, s = self._dss.decode_dss_signature(signature)
+            size = self._coordinate_size
+            return r.to_bytes(size, "big") + s.to_bytes(size, "big")
+        return signature
+
+    def verify(self, message: bytes, signature: bytes) -> bool:
+        if self.alg in EC_ALGORITHMS:
+            size = self._coordinate_size
+            if len(signature) != 2 * size:
+                return False
+            signature = self._dss.encode_dss_signature(
+                int.from_bytes(signature[:size], "big"),
+                int.from_bytes(signature[size:], "big")
+            )
+
+        try:
+            self._public_key.verify(signature, message, *self._sign_args)
+        except self._invalid_signature:
+            return False
+        return True
+
+    def public_jwk(self) -> Optional[Dict[str, Any]]:
+        return {**self._jwk, "use": "sig", "alg": self.alg, "kid": self.kid}
+
+    def private_pem(self) -> Optional[str]:
+        """PEM da chave privada (usado pela engine python-jose)"""
+        if self._private_key is None:
+            return None
+        from cryptography.hazmat.primitives.serialization import Encoding, NoEncryption, PrivateFormat
+
+        return self._private_key.private_bytes(Encoding.PEM, PrivateFormat.PKCS8, NoEncryption()).decode("ascii")
+
+    def public_pem(self) -> str:
+        """PEM da chave pública (usado pela engine python-jose)"""
+        from cryptography.hazmat.primitives.serialization import Encoding, PublicFormat
+
+        return self._public_key.public_bytes(Encoding.PEM, PublicFormat.SubjectPublicKeyInfo).decode("ascii")
+
+
+def load_pem_key(
+    alg: str,
+    private_key_path: Optional[str] = None,
+    public_key_path: Optional[str] = None,
+    password: Optional[str] = None,
+    kid: Optional[str] = None
+) -> AsymmetricKey:
+    """
+    Carrega uma chave assimétrica de arquivos PEM locais
+    """
+    from cryptography.hazmat.primitives.serialization import load_pem_private_key, load_pem_public_key
+
+    private_key = public_key = None
+    if private_key_path:
+        with open(private_key_path, "rb") as f:
+            private_key = load_pem_private_key(f.read(), password=password.encode("utf-8") if password else None)
+    if public_key_path:
+        with open(public_key_path, "rb") as f:
+            public_key = load_pem_public_key(f.read())
+
+    return AsymmetricKey(alg, private_key=private_key, public_key=public_key, kid=kid)
+
+
+def load_signing_key(
+    alg: str,
+    secret_key: Optional[str] = None,
+    private_key_path: Optional[str] = None,
+    public_key_path: Optional[str] = None,
+    password: Optional[str] = None,
+    kid: Optional[str] = None
+):
+    """
+    Cria a chave adequada ao algoritmo: segredo HMAC ou par de chaves PEM
+    """
+    if alg in HMAC_ALGORITHMS:
+        if not secret_key:
+            raise ValueError(f"{alg} requer SECRET_KEY")
+        return HMACKey(secret_key, alg, kid=kid or "default")
+
+    if alg in ASYMMETRIC_ALGORITHMS:
+        if not private_key_path and not public_key_path:
+            raise ValueError(f"{alg} requer PRIVATE_KEY_PATH e/ou PUBLIC_KEY_PATH")
+        return load_pem_key(alg, private_key_path, public_key_path, password, kid=kid)
+
+    raise ValueError(f"Algoritmo não suportado: {alg}")
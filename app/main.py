@@ -1,8 +1,34 @@
-from fastapi import FastAPI, HTTPException, Depends, status
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+import time
+
+# Início da importação do app (framework, modelos e rotas), exportado em /metrics
+_import_started = time.perf_counter()
+
+from fastapi import FastAPI, HTTPException, Depends, Form, Header, Response, status
+from fastapi.responses import StreamingResponse
 from datetime import datetime, timedelta
-from .models import TokenRequest, TokenResponse, TokenValidation, TokenValidationResponse
-from .auth import create_access_token, verify_token, verify_api_key
+from typing import Callable, Optional
+import hashlib
+import json
+from .models import (
+    TokenRequest, TokenResponse, TokenValidation, TokenValidationResponse,
+    TokenBatchValidation, TokenBatchValidationResponse,
+    TokenBulkRequest, TokenBulkResponse, IssuedToken,
+    TokenRevocation, TokenRevocationResponse, RefreshRequest, IntrospectionResponse
+)
+from .auth import (
+    create_access_token_async, create_access_tokens_async, verify_token_outcome_async, verify_tokens_async,
+    revoke_token_async, create_refresh_token, rotate_refresh_token_async,
+    close_refresh_store, token_cache, jwt_engine, permission_registry, warm_up_crypto, crypto_executor,
+    issuance_cache, issue_access_token_async, rejection_cache, revocation_list
+)
+from .audit import audit_log, audited
+from .dependencies import (
+    rate_limit, enforce_api_key_rate_limit, current_token_payload, authorize_api_key, authorize_tenant,
+    token_ttl_minutes
+)
+from .responses import ResponseShape, fast_json
+from .metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, MetricsRoute, current_route, registry as metrics_registry
+from .warmup import Warmup
 from . import config
 
 app = FastAPI(
@@ -10,8 +36,124 @@ app = FastAPI(
     description="Sistema simples para gerar e validar tokens JWT",
     version="1.0.0"
 )
+# Todas as rotas registram latência total, do endpoint e do framework
+app.router.route_class = MetricsRoute
+
+# Formatos das respostas (modelo Pydantic ou dict pronto com FAST_RESPONSES)
+token_response_shape = ResponseShape(TokenResponse, exclude_none=True)
+refresh_response_shape = ResponseShape(TokenResponse)
+bulk_response_shape = ResponseShape(TokenBulkResponse)
+issued_token_shape = ResponseShape(IssuedToken)
+validation_response_shape = ResponseShape(TokenValidationResponse)
+batch_validation_response_shape = ResponseShape(TokenBatchValidationResponse)
+revocation_response_shape = ResponseShape(TokenRevocationResponse)
+
+# Tokens assinados por job do executor na emissão em lote com streaming
+BULK_STREAM_CHUNK_SIZE = 100
+
+def cache_metrics(name: str, cache) -> Callable[[], list]:
+    """
+    Coletor dos contadores de um cache no formato Prometheus (por processo)
+    """
+    def collect():
+        stats = cache.stats()
+        lines = []
+        for counter in ("hits", "misses", "evictions", "expirations"):
+            lines.append(f"# TYPE auth_api_{name}_{counter}_total counter")
+            lines.append(f"auth_api_{name}_{counter}_total {stats[counter]}")
+        if "oversized" in stats:
+            # Cache compartilhado: claims maiores que SHARED_CACHE_VALUE_SIZE não são cacheadas
+            lines.append(f"# TYPE auth_api_{name}_oversized_total counter")
+            lines.append(f"auth_api_{name}_oversized_total {stats['oversized']}")
+        lines.append(f"# TYPE auth_api_{name}_size gauge")
+        lines.append(f"auth_api_{name}_size {stats['size']}")
+        return lines
+    return collect
+
+# Tokens verificados, tokens recusados (cache negativo) e tokens reaproveitados na emissão
+metrics_registry.add_collector(cache_metrics("token_cache", token_cache))
+metrics_registry.add_collector(cache_metrics("negative_cache", rejection_cache))
+metrics_registry.add_collector(cache_metrics("issuance_cache", issuance_cache))
+
+def executor_metrics():
+    """
+    Jobs em andamento no executor de criptografia e limite de admissão (por processo)
+    """
+    stats = crypto_executor.stats()
+    return [
+        "# TYPE auth_api_executor_pending gauge",
+        f"auth_api_executor_pending {stats['pending']}",
+        "# TYPE auth_api_executor_max_pending gauge",
+        f"auth_api_executor_max_pending {stats['max_pending']}"
+    ]
+
+metrics_registry.add_collector(executor_metrics)
 
-security = HTTPBearer()
+def audit_metrics():
+    """
+    Eventos de auditoria aguardando gravação (por processo)
+    """
+    return [
+        "# TYPE auth_api_audit_queue_size gauge",
+        f"auth_api_audit_queue_size {audit_log.pending()}"
+    ]
+
+metrics_registry.add_collector(audit_metrics)
+
+def warm_up_responses():
+    """
+    Monta e serializa as respostas de emissão e validação (modelos Pydantic ou orjson)
+    """
+    expires_at = datetime.utcnow()
+    responses = [
+        token_response_shape.response(
+            access_token="warmup", token_type="bearer", expires_in=60, expires_at=expires_at
+        ),
+        validation_response_shape.response(
+            valid=True, user_id="warmup", permissions=[], expires_at=expires_at, message="Token válido"
+        )
+    ]
+    for response in responses:
+        if not isinstance(response, Response):
+            response.model_dump_json()
+
+# Aquecimento (WARMUP_ON_STARTUP e /_ah/warmup) e tempos de inicialização em /metrics
+warmup = Warmup()
+warmup.add_step("crypto", warm_up_crypto)
+warmup.add_step("responses", warm_up_responses)
+warmup.add_step("executor", crypto_executor.warm_up)
+metrics_registry.add_collector(warmup.metrics)
+
+@app.on_event("startup")
+async def startup():
+    """
+    Inicia a gravação periódica das métricas (modo multiprocesso) e do log de auditoria,
+    a limpeza das revogações, aquece o processo e inicia o servidor gRPC (GRPC_PORT)
+    """
+    metrics_registry.start_flusher()
+    audit_log.start()
+    revocation_list.start()
+    if config.WARMUP_ON_STARTUP:
+        warmup.run()
+    if config.GRPC_PORT:
+        # Importado só quando habilitado: grpc e protobuf pesam no cold start
+        from .grpc_server import start_server
+        app.state.grpc_server = await start_server(config.GRPC_PORT)
+
+@app.on_event("shutdown")
+async def shutdown():
+    """
+    Encerra o servidor gRPC, grava as operações pendentes do store de refresh tokens e os
+    eventos de auditoria na fila, para a limpeza das revogações e encerra os pools do executor
+    """
+    grpc_server = getattr(app.state, "grpc_server", None)
+    if grpc_server is not None:
+        # Chamadas em andamento têm alguns segundos para terminar
+        await grpc_server.stop(grace=5)
+    close_refresh_store()
+    audit_log.close()
+    revocation_list.close()
+    crypto_executor.shutdown()
 
 @app.get("/")
 async def root():
@@ -20,48 +162,200 @@ async def root():
     """
     return {"message": "API de Autenticação está funcionando!", "timestamp": datetime.utcnow()}
 
-@app.post("/auth/token", response_model=TokenResponse)
+@app.post(
+    "/auth/token",
+    response_model=TokenResponse,
+    response_model_exclude_none=True,
+    dependencies=[Depends(rate_limit("/auth/token"))]
+)
 async def generate_token(token_request: TokenRequest):
     """
     Gera um token JWT temporário
     """
-    # Verifica se a API key é válida
-    if not verify_api_key(token_request.api_key):
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="API key inválida"
+    with audited("issued", "/auth/token", user_id=token_request.user_id or "anonymous") as audit:
+        await enforce_api_key_rate_limit("/auth/token", token_request.api_key)
+        
+        # Verifica se a API key é válida e pode conceder as permissões
+        api_key_info = authorize_api_key(token_request.api_key, token_request.permissions or [])
+        audit.update(tenant=api_key_info.tenant, permissions=token_request.permissions or [])
+        
+        # Dados para incluir no token
+        token_data = {
+            "user_id": token_request.user_id or "anonymous",
+            "permissions": token_request.permissions or [],
+            "type": "access_token",
+            "tenant": api_key_info.tenant
+        }
+        
+        # Define expiração
+        ttl_minutes = token_ttl_minutes(api_key_info)
+        expires_delta = timedelta(minutes=ttl_minutes)
+        
+        # Cria o token (ou reaproveita o de um pedido idêntico, com ISSUANCE_CACHE_SECONDS)
+        access_token, expires_at = await issue_access_token_async(
+            token_request.api_key, token_data, expires_delta
+        )
+        # Um token reaproveitado já consumiu parte da validade
+        expires_in = max(0, round((expires_at - datetime.utcnow()).total_seconds()))
+        
+        refresh_token = None
+        if token_request.include_refresh_token:
+            refresh_token = create_refresh_token(
+                token_data["user_id"], token_data["permissions"],
+                access_ttl_minutes=ttl_minutes, tenant=api_key_info.tenant
+            )
+        
+        return token_response_shape.response(
+            access_token=access_token,
+            token_type="bearer",
+            expires_in=expires_in,  # em segundos
+            expires_at=expires_at,
+            refresh_token=refresh_token
         )
-    
-    # Dados para incluir no token
-    token_data = {
-        "user_id": token_request.user_id or "anonymous",
-        "permissions": token_request.permissions or [],
-        "type": "access_token"
-    }
-    
-    # Define expiração
-    expires_delta = timedelta(minutes=config.ACCESS_TOKEN_EXPIRE_MINUTES)
-    expires_at = datetime.utcnow() + expires_delta
-    
-    # Cria o token
-    access_token = create_access_token(data=token_data, expires_delta=expires_delta)
-    
-    return TokenResponse(
-        access_token=access_token,
-        token_type="bearer",
-        expires_in=config.ACCESS_TOKEN_EXPIRE_MINUTES * 60,  # em segundos
-        expires_at=expires_at
-    )
 
-@app.post("/auth/validate", response_model=TokenValidationResponse)
-async def validate_token(token_validation: TokenValidation):
+@app.post(
+    "/auth/refresh",
+    response_model=TokenResponse,
+    dependencies=[Depends(rate_limit("/auth/refresh"))]
+)
+async def refresh(refresh_request: RefreshRequest):
     """
-    Valida se um token JWT é válido
+    Troca um refresh token por um novo access token (e um novo refresh token)
+
+    O tenant que emitiu o refresh token precisa continuar registrado e autorizado
+    a conceder as permissões; caso contrário o refresh token é consumido e recusado.
+    """
+    with audited("issued", "/auth/refresh") as audit:
+        rotated = await rotate_refresh_token_async(refresh_request.refresh_token)
+        if rotated is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Refresh token inválido, expirado ou já utilizado"
+            )
+        
+        new_refresh_token, record = rotated
+        audit.update(user_id=record["user_id"], tenant=record["tenant"], permissions=record["permissions"])
+        authorize_tenant(record["tenant"], record["permissions"])
+        token_data = {
+            "user_id": record["user_id"],
+            "permissions": record["permissions"],
+            "type": "access_token",
+            "tenant": record["tenant"]
+        }
+        
+        ttl_minutes = record["access_ttl_minutes"] or config.ACCESS_TOKEN_EXPIRE_MINUTES
+        expires_delta = timedelta(minutes=ttl_minutes)
+        expires_at = datetime.utcnow() + expires_delta
+        access_token = await create_access_token_async(data=token_data, expires_delta=expires_delta)
+        
+        return refresh_response_shape.response(
+            access_token=access_token,
+            token_type="bearer",
+            expires_in=ttl_minutes * 60,
+            expires_at=expires_at,
+            refresh_token=new_refresh_token
+        )
+
+@app.post(
+    "/auth/token/bulk",
+    response_model=TokenBulkResponse,
+    dependencies=[Depends(rate_limit("/auth/token/bulk"))]
+)
+async def generate_token_bulk(bulk_request: TokenBulkRequest):
+    """
+    Gera tokens JWT em lote, validando a API key uma única vez
+
+    Com `stream=true` a resposta é enviada em NDJSON (um token por linha),
+    à medida que os tokens são assinados.
+    """
+    with audited("issued", "/auth/token/bulk", count=len(bulk_request.tokens)) as audit:
+        await enforce_api_key_rate_limit("/auth/token/bulk", bulk_request.api_key)
+        
+        if len(bulk_request.tokens) > config.TOKEN_BULK_MAX_SIZE:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"Máximo de {config.TOKEN_BULK_MAX_SIZE} tokens por requisição"
+            )
+        
+        requested_permissions = [
+            permission for item in bulk_request.tokens for permission in (item.permissions or [])
+        ]
+        api_key_info = authorize_api_key(bulk_request.api_key, requested_permissions)
+        audit["tenant"] = api_key_info.tenant
+        
+        # Emissão e expiração compartilhadas por todos os tokens do lote
+        ttl_minutes = token_ttl_minutes(api_key_info)
+        expires_delta = timedelta(minutes=ttl_minutes)
+        issued_at = datetime.utcnow()
+        expires_at = issued_at + expires_delta
+        expires_in = ttl_minutes * 60
+        
+        user_ids = [item.user_id or "anonymous" for item in bulk_request.tokens]
+        token_data = [
+            {
+                "user_id": user_id,
+                "permissions": item.permissions or [],
+                "type": "access_token",
+                "tenant": api_key_info.tenant
+            }
+            for user_id, item in zip(user_ids, bulk_request.tokens)
+        ]
+        
+        if bulk_request.stream:
+            # O primeiro lote é assinado antes da resposta (503 ainda pode ser enviado);
+            # os seguintes são assinados à medida que o cliente consome o stream
+            chunk_size = BULK_STREAM_CHUNK_SIZE
+            first_tokens = await create_access_tokens_async(
+                token_data[:chunk_size], expires_delta=expires_delta, issued_at=issued_at
+            )
+            
+            # O corpo é enviado depois que o handler retorna, fora do contexto da rota
+            route = current_route.get()
+            
+            async def ndjson_lines():
+                expires_at_iso = expires_at.isoformat()
+                tokens = first_tokens
+                for start in range(0, len(token_data), chunk_size):
+                    if start:
+                        route_token = current_route.set(route)
+                        try:
+                            tokens = await create_access_tokens_async(
+                                token_data[start:start + chunk_size],
+                                expires_delta=expires_delta,
+                                issued_at=issued_at,
+                                admit=False
+                            )
+                        finally:
+                            current_route.reset(route_token)
+                    for user_id, access_token in zip(user_ids[start:start + chunk_size], tokens):
+                        yield json.dumps({
+                            "user_id": user_id,
+                            "access_token": access_token,
+                            "token_type": "bearer",
+                            "expires_in": expires_in,
+                            "expires_at": expires_at_iso
+                        }, separators=(",", ":")) + "\n"
+            
+            return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
+        
+        tokens = await create_access_tokens_async(token_data, expires_delta=expires_delta, issued_at=issued_at)
+        
+        return bulk_response_shape.response(
+            tokens=[
+                issued_token_shape.item(user_id=user_id, access_token=access_token)
+                for user_id, access_token in zip(user_ids, tokens)
+            ],
+            token_type="bearer",
+            expires_in=expires_in,
+            expires_at=expires_at
+        )
+
+def validation_fields(payload: Optional[dict]) -> dict:
+    """
+    Monta os campos da resposta de validação a partir das claims verificadas (None se inválido)
     """
-    payload = verify_token(token_validation.token)
-    
     if payload is None:
-        return TokenValidationResponse(
+        return dict(
             valid=False,
             message="Token inválido ou expirado"
         )
@@ -69,12 +363,12 @@ async def validate_token(token_validation: TokenValidation):
     # Verifica se o token não expirou
     exp_timestamp = payload.get("exp")
     if exp_timestamp and datetime.utcfromtimestamp(exp_timestamp) < datetime.utcnow():
-        return TokenValidationResponse(
+        return dict(
             valid=False,
             message="Token expirado"
         )
     
-    return TokenValidationResponse(
+    return dict(
         valid=True,
         user_id=payload.get("user_id"),
         permissions=payload.get("permissions", []),
@@ -82,36 +376,212 @@ async def validate_token(token_validation: TokenValidation):
         message="Token válido"
     )
 
-@app.get("/auth/me")
-async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
+def audit_validation(audit: dict, reason: str, fields: dict) -> None:
     """
-    Endpoint protegido que retorna informações do usuário atual
+    Completa o evento de auditoria de uma validação: `user_id` ou a recusa com o
+    motivo da verificação (bad_signature, malformed, revoked, unknown_kid...)
+    """
+    if fields["valid"]:
+        audit["user_id"] = fields["user_id"]
+    else:
+        # Claims verificadas mas com `exp` vencido (ainda no cache) contam como expired
+        audit.update(event="rejected", reason="expired" if reason == "valid" else reason)
+
+@app.post(
+    "/auth/validate",
+    response_model=TokenValidationResponse,
+    dependencies=[Depends(rate_limit("/auth/validate"))]
+)
+async def validate_token(token_validation: TokenValidation):
     """
-    token = credentials.credentials
-    payload = verify_token(token)
+    Valida se um token JWT é válido
+    """
+    with audited("validated", "/auth/validate") as audit:
+        payload, reason = await verify_token_outcome_async(token_validation.token)
+        fields = validation_fields(payload)
+        audit_validation(audit, reason, fields)
+        return validation_response_shape.response(**fields)
+
+@app.post(
+    "/auth/validate/batch",
+    response_model=TokenBatchValidationResponse,
+    dependencies=[Depends(rate_limit("/auth/validate/batch"))]
+)
+async def validate_token_batch(batch: TokenBatchValidation):
+    """
+    Valida uma lista de tokens JWT, retornando os resultados na mesma ordem
+    """
+    with audited("validated", "/auth/validate/batch", count=len(batch.tokens)) as audit:
+        if len(batch.tokens) > config.VALIDATE_BATCH_MAX_SIZE:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"Máximo de {config.VALIDATE_BATCH_MAX_SIZE} tokens por requisição"
+            )
+        
+        # Tokens repetidos no lote são verificados uma única vez
+        unique_tokens = list(dict.fromkeys(batch.tokens))
+        payloads = await verify_tokens_async(unique_tokens)
+        fields = {token: validation_fields(payload) for token, payload in zip(unique_tokens, payloads)}
+        results = {token: validation_response_shape.item(**fields[token]) for token in unique_tokens}
+        audit["invalid"] = sum(not fields[token]["valid"] for token in batch.tokens)
+        
+        return batch_validation_response_shape.response(
+            results=[results[token] for token in batch.tokens]
+        )
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Compara o If-None-Match com o ETag (comparação fraca, RFC 7232)
+    """
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or etag in (candidate.removeprefix("W/") for candidate in candidates)
+
+async def introspection_response(token: str, if_none_match: Optional[str]) -> Response:
+    """
+    Resposta de introspecção (RFC 7662) com cabeçalhos de cache HTTP
+
+    Tokens ativos podem ser cacheados pelo cliente que consultou (`private`: a
+    resposta é de uma chamada autenticada) até o menor valor entre a vida
+    restante do token e INTROSPECTION_MAX_AGE; o ETag permite revalidar com
+    If-None-Match e receber 304. Tokens inativos nunca são cacheados.
+    """
+    with audited("validated", "/auth/introspect") as audit:
+        payload, reason = await verify_token_outcome_async(token)
+        exp_timestamp = payload.get("exp") if payload else None
+        remaining = exp_timestamp - time.time() if exp_timestamp else config.INTROSPECTION_MAX_AGE
+        if payload is None or remaining <= 0:
+            audit.update(event="rejected", reason="expired" if payload is not None else reason)
+        else:
+            audit["user_id"] = payload.get("user_id")
     
-    if payload is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Token inválido ou expirado",
-            headers={"WWW-Authenticate": "Bearer"}
+    if payload is None or remaining <= 0:
+        return Response(
+            json.dumps({"active": False}, separators=(",", ":")),
+            media_type="application/json",
+            headers={"Cache-Control": "no-store"}
         )
     
-    # Verifica se o token não expirou
-    exp_timestamp = payload.get("exp")
-    if exp_timestamp and datetime.utcfromtimestamp(exp_timestamp) < datetime.utcnow():
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Token expirado",
-            headers={"WWW-Authenticate": "Bearer"}
+    content = {
+        "active": True,
+        # Tokens emitidos antes da tipagem de `permissions` podem trazer valores que não são strings
+        "scope": " ".join(map(str, payload.get("permissions") or [])) or None,
+        "sub": payload.get("user_id"),
+        "exp": exp_timestamp,
+        "iat": payload.get("iat"),
+        "jti": payload.get("jti"),
+        "token_type": "Bearer"
+    }
+    body = json.dumps(
+        {key: value for key, value in content.items() if value is not None},
+        ensure_ascii=False,
+        separators=(",", ":")
+    ).encode("utf-8")
+    
+    headers = {
+        "Cache-Control": f"private, max-age={min(int(remaining), config.INTROSPECTION_MAX_AGE)}",
+        "ETag": f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+    }
+    if etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(body, media_type="application/json", headers=headers)
+
+@app.post(
+    "/auth/introspect",
+    response_model=IntrospectionResponse,
+    response_model_exclude_none=True,
+    dependencies=[Depends(rate_limit("/auth/introspect"))]
+)
+async def introspect(
+    token: str = Form(...),
+    api_key: str = Form(...),
+    token_type_hint: Optional[str] = Form(None),
+    if_none_match: Optional[str] = Header(None)
+):
+    """
+    Introspecção de token (RFC 7662): formulário `application/x-www-form-urlencoded`
+
+    Só POST: na query string o token iria para os logs de acesso e para caches
+    compartilhados. Quem consulta se autentica com a API key (RFC 7662, seção 2.1).
+    """
+    await enforce_api_key_rate_limit("/auth/introspect", api_key)
+    authorize_api_key(api_key, [])
+    return await introspection_response(token, if_none_match)
+
+@app.post(
+    "/auth/revoke",
+    response_model=TokenRevocationResponse,
+    dependencies=[Depends(rate_limit("/auth/revoke"))]
+)
+async def revoke(token_revocation: TokenRevocation):
+    """
+    Revoga um token JWT antes da sua expiração (somente tokens do tenant da API key)
+    """
+    await enforce_api_key_rate_limit("/auth/revoke", token_revocation.api_key)
+    
+    api_key_info = authorize_api_key(token_revocation.api_key, [])
+    
+    if not await revoke_token_async(token_revocation.token, tenant=api_key_info.tenant):
+        return revocation_response_shape.response(
+            revoked=False,
+            message="Token inválido, expirado, sem jti ou de outro tenant"
         )
     
-    return {
+    return revocation_response_shape.response(revoked=True, message="Token revogado")
+
+@app.get(
+    "/auth/me",
+    dependencies=[Depends(rate_limit("/auth/me"))]
+)
+async def get_current_user(payload: dict = Depends(current_token_payload)):
+    """
+    Endpoint protegido que retorna informações do usuário atual
+    """
+    exp_timestamp = payload.get("exp")
+    return fast_json({
         "user_id": payload.get("user_id"),
         "permissions": payload.get("permissions", []),
         "token_type": payload.get("type"),
         "expires_at": datetime.utcfromtimestamp(exp_timestamp) if exp_timestamp else None
-    }
+    })
+
+@app.get("/.well-known/jwks.json")
+async def jwks(response: Response):
+    """
+    Publica as chaves públicas de verificação (JWK Set) para validação local dos tokens
+    """
+    response.headers["Cache-Control"] = f"public, max-age={config.JWKS_CACHE_MAX_AGE}"
+    return jwt_engine.public_jwks()
+
+@app.get("/.well-known/permissions.json")
+async def permissions_registry(response: Response):
+    """
+    Publica o registro versionado de permissões usado nos tokens compactos
+    """
+    response.headers["Cache-Control"] = f"public, max-age={config.JWKS_CACHE_MAX_AGE}"
+    return permission_registry.to_json()
+
+@app.get("/auth/cache/stats")
+async def cache_stats():
+    """
+    Retorna os contadores do cache de tokens verificados (hits, misses, evictions)
+    """
+    return token_cache.stats()
+
+@app.get("/metrics")
+async def metrics():
+    """
+    Métricas no formato texto do Prometheus (latência por rota e estágio, resultados de validação)
+    """
+    return Response(metrics_registry.render(), media_type=METRICS_CONTENT_TYPE)
+
+@app.get("/_ah/warmup", include_in_schema=False)
+async def app_engine_warmup():
+    """
+    Warmup request do App Engine (inbound_services: warmup): aquece a instância antes do tráfego
+    """
+    return {"status": "warm", "seconds": warmup.run()}
 
 @app.get("/health")
 async def health_check():
@@ -123,4 +593,6 @@ async def health_check():
         "timestamp": datetime.utcnow(),
         "service": "auth-api",
         "version": "1.0.0"
-    }
\ No newline at end of file
+    }
+
+warmup.import_seconds = time.perf_counter() - _import_started
@@ -0,0 +1,411 @@
+import asyncio
+import bisect
+import fcntl
+import functools
+import glob
+import json
+import os
+import threading
+import time
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from fastapi import HTTPException, Request, Response
+from fastapi.exceptions import RequestValidationError
+from fastapi.routing import APIRoute
+
+from . import config
+
+# Buckets (segundos) dos histogramas de latência: de 50µs a 2,5s
+LATENCY_BUCKETS = (
+    0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+    0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5
+)
+
+# O Starlette acrescenta "; charset=utf-8" a media types text/*
+CONTENT_TYPE = "text/plain; version=0.0.4"
+
+
+def _format_labels(labelnames: Tuple[str, ...], labels: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, labels)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Counter:
+    """
+    Contador monotônico com labels
+    """
+
+    type = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            return {json.dumps(labels): value for labels, value in self._values.items()}
+
+    @staticmethod
+    def merge(total: Dict[str, float], snapshot: Dict[str, float]) -> None:
+        for key, value in snapshot.items():
+            total[key] = total.get(key, 0) + value
+
+    def render(self, snapshot: Dict[str, float]) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, tuple(json.loads(key)))} {_format_value(value)}"
+            for key, value in sorted(snapshot.items())
+        ]
+
+
+class Histogram:
+    """
+    Histograma com buckets fixos e labels
+
+    Cada observação custa uma busca binária nos limites e um incremento.
+    """
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Tuple[float, ...] = LATENCY_BUCKETS
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [contagem por bucket (+Inf no fim), soma]
+        self._values: Dict[Tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(labels)
+            if entry is None:
+                entry = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            entry[0][index] += 1
+            entry[1] += value
+
+    def snapshot(self) -> Dict[str, list]:
+        with self._lock:
+            return {json.dumps(labels): [list(counts), total] for labels, (counts, total) in self._values.items()}
+
+    @staticmethod
+    def merge(total: Dict[str, list], snapshot: Dict[str, list]) -> None:
+        for key, (counts, value_sum) in snapshot.items():
+            if key not in total:
+                total[key] = [list(counts), value_sum]
+            else:
+                total[key][0] = [a + b for a, b in zip(total[key][0], counts)]
+                total[key][1] += value_sum
+
+    def render(self, snapshot: Dict[str, list]) -> List[str]:
+        lines = []
+        bounds = self.buckets + (float("inf"),)
+        for key, (counts, value_sum) in sorted(snapshot.items()):
+            labels = tuple(json.loads(key))
+            cumulative = 0
+            for bound, count in zip(bounds, counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, labels)} {_format_value(value_sum)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Registro das métricas do processo, exportadas no formato texto do Prometheus
+
+    Com `multiprocess_dir` cada worker grava periodicamente um snapshot em
+    `<dir>/metrics_<pid>.json` e a exportação soma os snapshots de todos os
+    workers, então qualquer worker que receba o scrape responde pelo total.
+    Os snapshots de workers encerrados são incorporados a
+    `<dir>/metrics_retired.json` no scrape seguinte.
+    """
+
+    def __init__(self, multiprocess_dir: str = "", flush_interval: float = 5):
+        self.multiprocess_dir = multiprocess_dir
+        self.flush_interval = flush_interval
+        self._metrics: List = []
+        self._collectors: List[Callable[[], List[str]]] = []
+        self._flusher: Optional[threading.Thread] = None
+        self._flusher_pid: Optional[int] = None
+
+    def counter(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Counter:
+        metric = Counter(name, documentation, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name: str, documentation: str, labelnames: Iterable[str] = (), **kwargs) -> Histogram:
+        metric = Histogram(name, documentation, labelnames, **kwargs)
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector: Callable[[], List[str]]) -> None:
+        """
+        Registra uma função que gera linhas prontas (ex: gauges do processo)
+        """
+        self._collectors.append(collector)
+
+    def snapshot(self) -> Dict[str, dict]:
+        return {metric.name: metric.snapshot() for metric in self._metrics}
+
+    def _snapshot_path(self, pid: int) -> str:
+        return os.path.join(self.multiprocess_dir, f"metrics_{pid}.json")
+
+    def flush(self) -> None:
+        """
+        Grava o snapshot deste processo (modo multiprocesso)
+        """
+        if not self.multiprocess_dir:
+            return
+        os.makedirs(self.multiprocess_dir, exist_ok=True)
+        path = self._snapshot_path(os.getpid())
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.snapshot(), f)
+        os.replace(tmp_path, path)
+
+    def start_flusher(self) -> None:
+        """
+        Inicia a thread que grava o snapshot periodicamente (uma por processo)
+        """
+        if not self.multiprocess_dir or self._flusher_pid == os.getpid():
+            return
+        self._flusher_pid = os.getpid()
+
+        def run():
+            while True:
+                time.sleep(self.flush_interval)
+                self.flush()
+
+        self._flusher = threading.Thread(target=run, name="metrics-flusher", daemon=True)
+        self._flusher.start()
+
+    def _aggregated(self) -> Dict[str, dict]:
+        if not self.multiprocess_dir:
+            return self.snapshot()
+
+        self.flush()
+        self._retire_dead_snapshots()
+        totals: Dict[str, dict] = {metric.name: {} for metric in self._metrics}
+        for path in glob.glob(os.path.join(self.multiprocess_dir, "metrics_*.json")):
+            self._merge_into(totals, self._read_snapshot(path))
+        return totals
+
+    def _merge_into(self, totals: Dict[str, dict], snapshot: Dict[str, dict]) -> None:
+        merge = {metric.name: metric.merge for metric in self._metrics}
+        for name, values in snapshot.items():
+            if name in merge:
+                merge[name](totals.setdefault(name, {}), values)
+
+    @staticmethod
+    def _read_snapshot(path: str) -> Dict[str, dict]:
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def _is_alive(pid: int) -> bool:
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            pass
+        return True
+
+    def _retire_dead_snapshots(self) -> None:
+        """
+        Incorpora os snapshots de workers encerrados em `metrics_retired.json`
+
+        Os contadores continuam monotônicos (o que o worker contou não some do
+        total) e o diretório não acumula um arquivo por pid já reciclado pelo
+        gunicorn. O lock de arquivo evita que dois workers somem o mesmo
+        snapshot no scrape simultâneo.
+        """
+        dead = []
+        for path in glob.glob(os.path.join(self.multiprocess_dir, "metrics_*.json")):
+            pid = os.path.basename(path)[len("metrics_"):-len(".json")]
+            if pid.isdigit() and not self._is_alive(int(pid)):
+                dead.append(path)
+        if not dead:
+            return
+
+        with open(os.path.join(self.multiprocess_dir, ".retired.lock"), "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            retired_path = os.path.join(self.multiprocess_dir, "metrics_retired.json")
+            retired = self._read_snapshot(retired_path)
+            dead = [path for path in dead if os.path.exists(path)]
+            for path in dead:
+                self._merge_into(retired, self._read_snapshot(path))
+            if not dead:
+                return
+            tmp_path = f"{retired_path}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(retired, f)
+            os.replace(tmp_path, retired_path)
+            for path in dead:
+                os.remove(path)
+
+    def render(self) -> str:
+        """
+        Exporta todas as métricas no formato texto do Prometheus
+        """
+        aggregated = self._aggregated()
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            lines.extend(metric.render(aggregated.get(metric.name, {})))
+        for collector in self._collectors:
+            lines.extend(collector())
+        return "\n".join(lines) + "\n"
+
+
+# Rota em atendimento, usada para atribuir os estágios internos (sign/verify) à rota
+current_route: ContextVar[str] = ContextVar("current_route", default="")
+# Tempo gasto no corpo do endpoint da requisição atual
+_endpoint_time: ContextVar[Optional[list]] = ContextVar("endpoint_time", default=None)
+
+registry = MetricsRegistry(
+    multiprocess_dir=config.METRICS_MULTIPROC_DIR,
+    flush_interval=config.METRICS_FLUSH_INTERVAL
+)
+
+requests_total = registry.counter(
+    "auth_api_requests_total",
+    "Requisições atendidas por rota, método e status",
+    ("route", "method", "status")
+)
+request_duration = registry.histogram(
+    "auth_api_request_duration_seconds",
+    "Latência por rota (da entrada no roteamento até a resposta montada)",
+    ("route", "method")
+)
+stage_duration = registry.histogram(
+    "auth_api_stage_duration_seconds",
+    "Latência por estágio interno: sign, verify, endpoint (corpo do handler) "
+    "e framework (parse/validação Pydantic e serialização da resposta)",
+    ("route", "stage")
+)
+token_verifications_total = registry.counter(
+    "auth_api_token_verifications_total",
+    "Resultados da verificação de tokens (valid, expired, bad_signature, malformed, revoked...)",
+    ("outcome", "source")
+)
+executor_rejections_total = registry.counter(
+    "auth_api_executor_rejections_total",
+    "Requisições recusadas com 503 pelo controle de admissão do executor de criptografia"
+)
+audit_events_dropped_total = registry.counter(
+    "auth_api_audit_events_dropped_total",
+    "Eventos de auditoria descartados com a fila cheia",
+    ("event",)
+)
+
+
+def observe_stage(stage: str, seconds: float) -> None:
+    """
+    Registra a duração de um estágio interno na rota em atendimento
+    """
+    stage_duration.observe(seconds, current_route.get(), stage)
+
+
+def timed_endpoint(endpoint: Callable) -> Callable:
+    """
+    Envolve o endpoint para medir o tempo do corpo do handler (assinatura preservada)
+    """
+    if asyncio.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def async_wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return await endpoint(*args, **kwargs)
+            finally:
+                _record_endpoint_time(time.perf_counter() - start)
+        return async_wrapper
+
+    @functools.wraps(endpoint)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return endpoint(*args, **kwargs)
+        finally:
+            _record_endpoint_time(time.perf_counter() - start)
+    return wrapper
+
+
+def _record_endpoint_time(seconds: float) -> None:
+    accumulator = _endpoint_time.get()
+    if accumulator is not None:
+        accumulator[0] += seconds
+
+
+class MetricsRoute(APIRoute):
+    """
+    Rota do FastAPI que mede latência total, corpo do endpoint e overhead do framework
+    """
+
+    def __init__(self, path: str, endpoint: Callable, **kwargs):
+        super().__init__(path, timed_endpoint(endpoint), **kwargs)
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+        route = self.path
+
+        async def metrics_handler(request: Request) -> Response:
+            route_token = current_route.set(route)
+            accumulator = [0.0]
+            endpoint_token = _endpoint_time.set(accumulator)
+            status_code = 500
+            start = time.perf_counter()
+            try:
+                response = await handler(request)
+                status_code = response.status_code
+                return response
+            except HTTPException as e:
+                status_code = e.status_code
+                raise
+            except RequestValidationError:
+                status_code = 422
+                raise
+            finally:
+                elapsed = time.perf_counter() - start
+                method = request.method
+                requests_total.inc(route, method, str(status_code))
+                request_duration.observe(elapsed, route, method)
+                stage_duration.observe(accumulator[0], route, "endpoint")
+                stage_duration.observe(max(0.0, elapsed - accumulator[0]), route, "framework")
+                _endpoint_time.reset(endpoint_token)
+                current_route.reset(route_token)
+
+        return metrics_handler
@@ -1,17 +1,22 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import Optional, List
 from datetime import datetime
 
 class TokenRequest(BaseModel):
     api_key: str
     user_id: Optional[str] = None
     permissions: Optional[list] = []
+    include_refresh_token: bool = False
 
 class TokenResponse(BaseModel):
     access_token: str
     token_type: str
     expires_in: int
     expires_at: datetime
+    refresh_token: Optional[str] = None
+
+class RefreshRequest(BaseModel):
+    refresh_token: str
 
 class TokenValidation(BaseModel):
     token: str
@@ -21,4 +26,47 @@ class TokenValidationResponse(BaseModel):
     user_id: Optional[str] = None
     permissions: Optional[list] = []
     expires_at: Optional[datetime] = None
-    message: Optional[str] = None
\ No newline at end of file
+    message: Optional[str] = None
+
+class TokenBatchValidation(BaseModel):
+    tokens: List[str]
+
+class TokenBatchValidationResponse(BaseModel):
+    results: List[TokenValidationResponse]
+
+class TokenBulkItem(BaseModel):
+    user_id: Optional[str] = None
+    permissions: Optional[list] = []
+
+class TokenBulkRequest(BaseModel):
+    api_key: str
+    tokens: List[TokenBulkItem]
+    stream: bool = False
+
+class IssuedToken(BaseModel):
+    user_id: str
+    access_token: str
+
+class TokenBulkResponse(BaseModel):
+    tokens: List[IssuedToken]
+    token_type: str
+    expires_in: int
+    expires_at: datetime
+
+class TokenRevocation(BaseModel):
+    api_key: str
+    token: str
+
+class TokenRevocationResponse(BaseModel):
+    revoked: bool
+    message: str
+
+
+class IntrospectionResponse(BaseModel):
+    active: bool
+    scope: Optional[str] = None
+    sub: Optional[str] = None
+    exp: Optional[int] = None
+    iat: Optional[int] = None
+    jti: Optional[str] = None
+    token_type: Optional[str] = None
\ No newline at end of file
@@ -0,0 +1,167 @@
+import json
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .jwt_engine import TokenError
+
+# Claims do formato compacto: nome completo -> nome curto
+COMPACT_CLAIMS = {"user_id": "sub", "type": "typ", "tenant": "tn"}
+# Valores de `type` abreviados no formato compacto
+COMPACT_TYPES = {"access_token": "at"}
+EXPANDED_TYPES = {code: name for name, code in COMPACT_TYPES.items()}
+
+PERMISSION_MASK_CLAIM = "pm"
+PERMISSION_VERSION_CLAIM = "pv"
+PERMISSION_EXTRAS_CLAIM = "px"
+
+
+class UnknownPermissionVersionError(TokenError):
+    """Token compacto emitido com uma versão do registro de permissões desconhecida"""
+    reason = "unknown_permission_version"
+
+
+def parse_permission_registry(data: dict) -> Dict[int, Tuple[str, ...]]:
+    """
+    Converte o conteúdo do arquivo do registro de permissões:
+
+        {
+            "versions": [
+                {"version": 1, "permissions": ["read", "write"]},
+                {"version": 2, "permissions": ["read", "write", "admin"]}
+            ]
+        }
+
+    A posição de cada permissão na lista é o seu bit na máscara. Versões
+    antigas devem ser mantidas enquanto houver tokens emitidos com elas.
+    """
+    versions = {}
+    for entry in data.get("versions", []):
+        version = int(entry["version"])
+        permissions = tuple(entry["permissions"])
+        if len(set(permissions)) != len(permissions):
+            raise ValueError(f"Permissões duplicadas na versão {version} do registro")
+        if version in versions:
+            raise ValueError(f"Versão {version} do registro de permissões repetida")
+        versions[version] = permissions
+    return versions
+
+
+class PermissionRegistry:
+    """
+    Registro versionado de permissões -> posições de bit
+
+    Tokens compactos levam as permissões como uma máscara inteira (`pm`) com a
+    versão do registro usada na emissão (`pv`); permissões fora do registro
+    seguem por nome em `px`. A expansão usa a versão do próprio token, então
+    novas versões podem ser publicadas sem invalidar tokens já emitidos.
+    """
+
+    def __init__(self, versions: Optional[Dict[int, Iterable[str]]] = None):
+        self.versions: Dict[int, Tuple[str, ...]] = {
+            version: tuple(permissions) for version, permissions in (versions or {}).items()
+        }
+        self.current_version = max(self.versions) if self.versions else 0
+        self._bits = {
+            permission: bit
+            for bit, permission in enumerate(self.versions.get(self.current_version, ()))
+        }
+
+    @classmethod
+    def from_file(cls, path: str) -> "PermissionRegistry":
+        """
+        Carrega o registro do arquivo JSON (registro vazio se `path` não for informado)
+        """
+        if not path:
+            return cls()
+        with open(path) as f:
+            return cls(parse_permission_registry(json.load(f)))
+
+    def encode(self, permissions: Iterable[str]) -> Tuple[int, List[str]]:
+        """
+        Converte nomes em (máscara, permissões fora do registro)
+
+        Valores que não são strings (aceitos em `permissions` na emissão) nunca
+        estão no registro e vão para os extras como estão.
+        """
+        mask = 0
+        extras = []
+        for permission in permissions:
+            bit = self._bits.get(permission) if isinstance(permission, str) else None
+            if bit is None:
+                if permission not in extras:
+                    extras.append(permission)
+            else:
+                mask |= 1 << bit
+        return mask, extras
+
+    def decode(self, mask: int, version: int, extras: Iterable[str] = ()) -> List[str]:
+        """
+        Converte a máscara de volta em nomes (ordem do registro, depois os extras)
+        """
+        names = self.versions.get(version)
+        if names is None and (mask or version):
+            raise UnknownPermissionVersionError(f"Versão {version} do registro de permissões desconhecida")
+
+        permissions = []
+        while mask:
+            lowest = mask & -mask
+            bit = lowest.bit_length() - 1
+            if bit >= len(names):
+                raise UnknownPermissionVersionError(
+                    f"Bit {bit} fora da versão {version} do registro de permissões"
+                )
+            permissions.append(names[bit])
+            mask ^= lowest
+        permissions.extend(extras)
+        return permissions
+
+    def compact_claims(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Converte as claims de um token para o formato compacto
+        """
+        compact = {}
+        for name, value in data.items():
+            if name == "permissions":
+                mask, extras = self.encode(value or [])
+                compact[PERMISSION_MASK_CLAIM] = mask
+                compact[PERMISSION_VERSION_CLAIM] = self.current_version
+                if extras:
+                    compact[PERMISSION_EXTRAS_CLAIM] = extras
+            elif name == "type":
+                compact[COMPACT_CLAIMS[name]] = COMPACT_TYPES.get(value, value)
+            else:
+                compact[COMPACT_CLAIMS.get(name, name)] = value
+        return compact
+
+    def expand_claims(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Converte um token compacto de volta para as claims completas
+
+        Tokens no formato completo são retornados sem alterações.
+        """
+        if PERMISSION_VERSION_CLAIM not in payload:
+            return payload
+
+        expanded = dict(payload)
+        expanded["permissions"] = self.decode(
+            expanded.pop(PERMISSION_MASK_CLAIM, 0),
+            expanded.pop(PERMISSION_VERSION_CLAIM),
+            expanded.pop(PERMISSION_EXTRAS_CLAIM, ())
+        )
+        for name, short_name in COMPACT_CLAIMS.items():
+            if short_name in expanded:
+                expanded[name] = expanded.pop(short_name)
+        if "type" in expanded:
+            expanded["type"] = EXPANDED_TYPES.get(expanded["type"], expanded["type"])
+        return expanded
+
+    def to_json(self) -> Dict[str, Any]:
+        """
+        Registro publicado para quem valida tokens compactos localmente
+        """
+        return {
+            "current_version": self.current_version,
+            "versions": [
+                {"version": version, "permissions": list(permissions)}
+                for version, permissions in sorted(self.versions.items())
+            ]
+        }
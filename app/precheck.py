@@ -0,0 +1,64 @@
+import json
+import re
+from typing import Optional
+
+from .jwt_engine import header_segment
+from .keys import b64url_decode
+
+# Três segmentos não vazios no alfabeto base64url (sem padding)
+_TOKEN_PATTERN = re.compile(r"[A-Za-z0-9_-]+\.[A-Za-z0-9_-]+\.[A-Za-z0-9_-]+")
+_ALPHABET_PATTERN = re.compile(r"[A-Za-z0-9_.-]*")
+
+
+class TokenPrecheck:
+    """
+    Verificação estrutural do token antes de qualquer criptografia
+
+    Recusa, sem exceções e sem tocar na assinatura, tokens maiores que
+    `max_length`, sem exatamente três segmentos, fora do alfabeto base64url ou
+    com um header cujo `kid` não está no keyring ou cujo `alg` não é o da chave.
+    Os headers emitidos por este serviço são conhecidos de antemão e aceitos
+    com uma consulta em conjunto; só headers com outra serialização são
+    decodificados. `check` retorna o motivo da recusa ou None.
+    """
+
+    def __init__(self, keyring, max_length: int):
+        self.keyring = keyring
+        self.max_length = max_length
+        self._known_headers = set()
+        for key in keyring.all_keys():
+            self._known_headers.add(header_segment(key).decode("ascii"))
+            if key.kid == keyring.legacy_kid:
+                self._known_headers.add(header_segment(key, with_kid=False).decode("ascii"))
+
+    def check(self, token: str) -> Optional[str]:
+        """
+        Motivo da recusa (too_long, bad_segments, bad_alphabet, bad_header,
+        unknown_kid, bad_alg) ou None se o token pode seguir para a verificação
+        """
+        if len(token) > self.max_length:
+            return "too_long"
+        if _TOKEN_PATTERN.fullmatch(token) is None:
+            # Só com caracteres válidos, o que falhou foi a quantidade de segmentos
+            return "bad_alphabet" if _ALPHABET_PATTERN.fullmatch(token) is None else "bad_segments"
+
+        segment = token[:token.index(".")]
+        if segment in self._known_headers:
+            return None
+        return self._check_header(segment)
+
+    def _check_header(self, segment: str) -> Optional[str]:
+        try:
+            header = json.loads(b64url_decode(segment.encode("ascii")))
+        except ValueError:
+            return "bad_header"
+        if not isinstance(header, dict):
+            return "bad_header"
+
+        kid = header.get("kid", self.keyring.legacy_kid)
+        key = self.keyring.get(kid) if isinstance(kid, str) else None
+        if key is None:
+            return "unknown_kid"
+        if header.get("alg") != key.alg:
+            return "bad_alg"
+        return None
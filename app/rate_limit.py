@@ -0,0 +1,204 @@
+import math
+import struct
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+
+class RateLimit:
+    """
+    Limite de um token bucket: `capacity` requisições, repostas à taxa de `capacity / period`
+    """
+
+    def __init__(self, capacity: int, period: float):
+        if capacity <= 0 or period <= 0:
+            raise ValueError("Capacidade e período do rate limit devem ser positivos")
+        self.capacity = capacity
+        self.period = period
+        self.refill_rate = capacity / period
+
+    @classmethod
+    def parse(cls, spec: str) -> "RateLimit":
+        """
+        Converte "60/60" (60 requisições a cada 60 segundos) em RateLimit
+        """
+        capacity, _, period = spec.partition("/")
+        return cls(int(capacity), float(period or 1))
+
+
+def parse_rate_limits(spec: str) -> Dict[str, RateLimit]:
+    """
+    Lê limites por rota no formato "/auth/token=60/60;/auth/validate=1000/60"
+    """
+    limits = {}
+    for item in filter(None, (part.strip() for part in spec.split(";"))):
+        route, _, limit = item.partition("=")
+        limits[route.strip()] = RateLimit.parse(limit.strip())
+    return limits
+
+
+class InMemoryBackend:
+    """
+    Token buckets em memória do processo
+
+    Cada bucket guarda só (tokens, último acesso); a reposição é calculada de
+    forma preguiçosa no próximo acesso, então cada requisição custa O(1).
+    O número de buckets é limitado: os menos usados são descartados (um bucket
+    descartado volta cheio, o que só favorece o cliente inativo).
+    Também serve de substituto em processo para o backend compartilhado em testes.
+    Como nos demais backends, `consume` é assíncrono; aqui sem I/O, não cede o event loop.
+    """
+
+    def __init__(self, max_keys: int = 100000):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def consume(self, key: str, limit: RateLimit, cost: float = 1) -> float:
+        """
+        Consome `cost` tokens do bucket; retorna 0 se permitido ou os segundos até haver saldo
+        """
+        now = time.monotonic()
+        with self._lock:
+            tokens, last = self._buckets.get(key, (limit.capacity, now))
+            tokens = min(limit.capacity, tokens + (now - last) * limit.refill_rate)
+
+            if tokens >= cost:
+                retry_after = 0.0
+                tokens -= cost
+            else:
+                retry_after = (cost - tokens) / limit.refill_rate
+
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return retry_after
+
+
+class RedisBackend:
+    """
+    Token buckets compartilhados entre instâncias via Redis (script Lua atômico)
+
+    Usa o cliente assíncrono (`redis.asyncio`): a ida e volta ao Redis não trava
+    o event loop, então um Redis lento atrasa só as requisições que esperam por
+    ele. Requer o pacote `redis` (opcional, não incluído no requirements.txt).
+    """
+
+    SCRIPT = """
+    local capacity = tonumber(ARGV[1])
+    local rate = tonumber(ARGV[2])
+    local cost = tonumber(ARGV[3])
+    local now = tonumber(ARGV[4])
+    local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+    local tokens = tonumber(state[1]) or capacity
+    local last = tonumber(state[2]) or now
+    tokens = math.min(capacity, tokens + math.max(0, now - last) * rate)
+    local retry_after = 0
+    if tokens >= cost then
+        tokens = tokens - cost
+    else
+        retry_after = (cost - tokens) / rate
+    end
+    redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+    redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+    return tostring(retry_after)
+    """
+
+    def __init__(self, url: str, prefix: str = "auth-api:ratelimit:"):
+        try:
+            import redis.asyncio as redis
+        except ImportError as e:
+            raise RuntimeError("RATE_LIMIT_BACKEND=redis requer o pacote 'redis' (pip install redis)") from e
+
+        self.prefix = prefix
+        self._client = redis.Redis.from_url(url)
+        self._script = self._client.register_script(self.SCRIPT)
+
+    async def consume(self, key: str, limit: RateLimit, cost: float = 1) -> float:
+        result = await self._script(
+            keys=[self.prefix + key],
+            args=[limit.capacity, limit.refill_rate, cost, time.time()]
+        )
+        return float(result)
+
+
+class SharedMemoryBackend:
+    """
+    Token buckets compartilhados pelos workers da mesma máquina (SharedTable em mmap)
+
+    Leitura, reposição e consumo acontecem sob o lock da faixa da tabela, então
+    workers concorrentes não consomem o mesmo saldo duas vezes. Um bucket sai da
+    tabela quando estaria cheio de novo, sem mudar o resultado para o cliente.
+    """
+
+    STATE = struct.Struct("<dd")
+
+    def __init__(self, table):
+        self.table = table
+
+    async def consume(self, key: str, limit: RateLimit, cost: float = 1) -> float:
+        def apply(value):
+            now = time.time()
+            tokens, last = self.STATE.unpack(value) if value is not None else (limit.capacity, now)
+            tokens = min(limit.capacity, tokens + max(0.0, now - last) * limit.refill_rate)
+
+            if tokens >= cost:
+                retry_after = 0.0
+                tokens -= cost
+            else:
+                retry_after = (cost - tokens) / limit.refill_rate
+
+            full_at = now + (limit.capacity - tokens) / limit.refill_rate + 1
+            return self.STATE.pack(tokens, now), full_at, retry_after
+
+        return self.table.update(key.encode("utf-8"), apply)
+
+
+class RateLimiter:
+    """
+    Aplica os limites configurados por rota a cada identidade (IP, API key)
+    """
+
+    def __init__(self, limits: Dict[str, RateLimit], backend):
+        self.limits = limits
+        self.backend = backend
+
+    async def check(self, route: str, scope: str, identity: str) -> Optional[float]:
+        """
+        Retorna None se permitido, ou o tempo (segundos) para o Retry-After
+        """
+        limit = self.limits.get(route)
+        if limit is None:
+            return None
+
+        retry_after = await self.backend.consume(f"{route}:{scope}:{identity}", limit)
+        if retry_after <= 0:
+            return None
+        return retry_after
+
+
+def build_backend(name: str, redis_url: str = "", max_keys: int = 100000, shared_state_dir: str = ""):
+    """
+    Cria o backend de rate limit configurado ("memory", "shared" ou "redis")
+    """
+    if name == "memory":
+        return InMemoryBackend(max_keys=max_keys)
+    if name == "shared":
+        if not shared_state_dir:
+            raise ValueError("RATE_LIMIT_BACKEND=shared requer SHARED_STATE_DIR")
+        from .shared_state import shared_table
+        return SharedMemoryBackend(shared_table(
+            shared_state_dir, "rate_limit", max_keys, SharedMemoryBackend.STATE.size
+        ))
+    if name == "redis":
+        return RedisBackend(redis_url)
+    raise ValueError(f"Backend de rate limit desconhecido: {name}")
+
+
+def retry_after_header(retry_after: float) -> str:
+    """
+    Valor do header Retry-After (segundos inteiros, arredondados para cima)
+    """
+    return str(max(1, math.ceil(retry_after)))
@@ -0,0 +1,89 @@
+from datetime import datetime
+from typing import Any, Dict, List, Tuple, Type
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from pydantic import BaseModel
+from pydantic_core import PydanticUndefined
+
+from . import config
+
+try:
+    import orjson  # noqa: F401
+except ImportError:  # sem orjson o modo rápido ainda evita a revalidação
+    FastJSONResponse = JSONResponse
+else:
+    FastJSONResponse = ORJSONResponse
+
+
+def json_datetime(value: datetime) -> str:
+    """
+    Serializa datetime exatamente como o Pydantic (UTC com offset zero vira "Z")
+    """
+    text = value.isoformat()
+    if text.endswith("+00:00"):
+        text = text[:-6] + "Z"
+    return text
+
+
+class ResponseShape:
+    """
+    Formato pré-calculado da resposta de um modelo Pydantic
+
+    No modo normal retorna a instância do modelo, que o FastAPI valida de novo
+    pelo `response_model` e serializa com o encoder padrão. Com FAST_RESPONSES
+    monta um dict com os campos na ordem e com os defaults do modelo e o
+    devolve pronto para o orjson, sem a segunda validação; os bytes da
+    resposta são os mesmos nos dois modos.
+    """
+
+    def __init__(self, model: Type[BaseModel], exclude_none: bool = False, enabled: bool = None):
+        self.model = model
+        self.exclude_none = exclude_none
+        self.enabled = config.FAST_RESPONSES if enabled is None else enabled
+        self.fields: List[Tuple[str, Any]] = [
+            (name, field.default) for name, field in model.model_fields.items()
+        ]
+
+    def build(self, **values) -> Dict[str, Any]:
+        """
+        Monta o dict pronto para serialização JSON
+        """
+        content = {}
+        for name, default in self.fields:
+            value = values.get(name, default)
+            if value is PydanticUndefined:
+                raise TypeError(f"Campo obrigatório ausente em {self.model.__name__}: {name}")
+            if value is None and self.exclude_none:
+                continue
+            if isinstance(value, datetime):
+                value = json_datetime(value)
+            content[name] = value
+        return content
+
+    def item(self, **values):
+        """
+        Elemento de uma resposta aninhada (dict no modo rápido, modelo no normal)
+        """
+        if self.enabled:
+            return self.build(**values)
+        return self.model(**values)
+
+    def response(self, **values):
+        """
+        Resposta do endpoint (FastJSONResponse no modo rápido, modelo no normal)
+        """
+        if self.enabled:
+            return FastJSONResponse(self.build(**values))
+        return self.model(**values)
+
+
+def fast_json(content: Dict[str, Any]):
+    """
+    Resposta de endpoints sem `response_model`: no modo rápido evita o jsonable_encoder
+    """
+    if not config.FAST_RESPONSES:
+        return content
+    return FastJSONResponse({
+        key: value.isoformat() if isinstance(value, datetime) else value
+        for key, value in content.items()
+    })
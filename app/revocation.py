@@ -0,0 +1,215 @@
+import hashlib
+import logging
+import math
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+class BloomFilter:
+    """
+    Filtro de Bloom: responde "com certeza não está" ou "talvez esteja"
+
+    Dimensionado para `capacity` itens com taxa de falso positivo `error_rate`.
+    Os k índices saem de um único SHA-256 por double hashing.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        capacity = max(capacity, 1)
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _indexes(self, item: str):
+        digest = hashlib.sha256(item.encode("utf-8")).digest()
+        h1 = int.from_bytes(digest[:8], "big")
+        h2 = int.from_bytes(digest[8:16], "big") | 1
+        for i in range(self.hash_count):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, item: str) -> None:
+        for index in self._indexes(item):
+            self._bits[index >> 3] |= 1 << (index & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[index >> 3] & (1 << (index & 7)) for index in self._indexes(item))
+
+
+class RevocationList:
+    """
+    Lista de `jti` revogados com caminho rápido por filtro de Bloom
+
+    A verificação consulta primeiro o filtro de Bloom (sem acesso a disco) e só
+    em caso de "talvez" confere o conjunto exato em memória. As revogações são
+    persistidas em SQLite e removidas automaticamente quando o token revogado
+    expiraria de qualquer forma, mantendo a memória limitada.
+
+    A limpeza e a sincronização com o SQLite rodam em uma thread própria a cada
+    `prune_interval` (iniciada por `start`, no startup), fora do caminho das
+    requisições: `is_revoked` só consulta memória.
+
+    Com `shared` (SharedTable em mmap) as revogações ficam em uma tabela única
+    para todos os workers: uma revogação feita em um worker vale imediatamente
+    nos demais. Revogações que não couberem na tabela (ela nunca descarta
+    revogações válidas) ficam no filtro local e chegam aos outros workers pelo
+    SQLite a cada `prune_interval`.
+    """
+
+    def __init__(
+        self,
+        db_path: str = "",
+        capacity: int = 100000,
+        error_rate: float = 0.001,
+        prune_interval: int = 60,
+        shared=None
+    ):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.prune_interval = prune_interval
+        self._shared = shared
+        self._revoked: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._last_id = 0
+        self._stopped = threading.Event()
+        self._maintainer: Optional[threading.Thread] = None
+
+        self._db = sqlite3.connect(db_path or ":memory:", check_same_thread=False)
+        self._create_table()
+
+        self._bloom = BloomFilter(capacity, error_rate)
+        self.sync()
+
+    def _create_table(self) -> None:
+        """
+        Cria a tabela de revogações, migrando a tabela sem AUTOINCREMENT de versões anteriores
+
+        Com AUTOINCREMENT um `id` nunca é reaproveitado, nem depois que o prune
+        apaga as linhas mais recentes; o sync incremental (`id` maior que o último
+        visto) não perde, assim, revogações novas gravadas por outros processos.
+        """
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS revocations ("
+                " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+                " jti TEXT NOT NULL UNIQUE,"
+                " expires_at REAL NOT NULL"
+                ")"
+            )
+            legacy = self._db.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'revoked_tokens'"
+            ).fetchone()
+            if legacy:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO revocations (jti, expires_at)"
+                    " SELECT jti, expires_at FROM revoked_tokens"
+                )
+                self._db.execute("DROP TABLE revoked_tokens")
+            self._db.commit()
+        except BaseException:
+            self._db.rollback()
+            raise
+
+    def sync(self) -> None:
+        """
+        Carrega revogações gravadas no SQLite (inclusive por outros processos)
+        """
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT id, jti, expires_at FROM revocations WHERE id > ? AND expires_at > ?",
+                (self._last_id, time.time())
+            ).fetchall()
+            for row_id, jti, expires_at in rows:
+                self._last_id = max(self._last_id, row_id)
+                self._remember(jti, expires_at)
+
+    def revoke(self, jti: str, expires_at: float) -> None:
+        """
+        Revoga o `jti` até `expires_at` (o `exp` do token)
+        """
+        if expires_at <= time.time():
+            return
+
+        with self._lock:
+            # `_last_id` não avança aqui: linhas de outros processos com id menor
+            # ainda não sincronizadas seriam puladas; o próximo sync relê esta
+            self._db.execute(
+                "INSERT OR REPLACE INTO revocations (jti, expires_at) VALUES (?, ?)",
+                (jti, expires_at)
+            )
+            self._db.commit()
+            self._remember(jti, expires_at)
+
+    def _remember(self, jti: str, expires_at: float) -> None:
+        if self._shared is not None:
+            if self._shared.set(jti.encode("utf-8"), b"", expires_at, evict=False):
+                return
+            logger.warning("Tabela compartilhada de revogações cheia; jti mantido apenas neste worker")
+        self._revoked[jti] = expires_at
+        self._bloom.add(jti)
+
+    def is_revoked(self, jti: Optional[str]) -> bool:
+        """
+        Verifica se o `jti` foi revogado
+        """
+        if not jti:
+            return False
+
+        if self._shared is not None and self._shared.get(jti.encode("utf-8")) is not None:
+            return True
+
+        if jti not in self._bloom:
+            return False
+
+        expires_at = self._revoked.get(jti)
+        return expires_at is not None and expires_at > time.time()
+
+    def prune(self) -> None:
+        """
+        Remove revogações de tokens já expirados e reconstrói o filtro de Bloom
+        """
+        now = time.time()
+        with self._lock:
+            self._db.execute("DELETE FROM revocations WHERE expires_at <= ?", (now,))
+            self._db.commit()
+            self._revoked = {jti: exp for jti, exp in self._revoked.items() if exp > now}
+
+            bloom = BloomFilter(max(self.capacity, len(self._revoked) * 2), self.error_rate)
+            for jti in self._revoked:
+                bloom.add(jti)
+            self._bloom = bloom
+
+        self.sync()
+
+    def start(self) -> None:
+        """
+        Inicia a thread de limpeza e sincronização (uma por processo, no startup)
+        """
+        if self._maintainer is not None or self.prune_interval <= 0:
+            return
+        self._stopped.clear()
+        self._maintainer = threading.Thread(target=self._run_maintenance, name="revocation-maintenance", daemon=True)
+        self._maintainer.start()
+
+    def _run_maintenance(self) -> None:
+        while not self._stopped.wait(self.prune_interval):
+            try:
+                self.prune()
+            except sqlite3.Error:
+                # Banco ocupado ou indisponível: as revogações em memória seguem valendo
+                logger.exception("Falha na limpeza das revogações; nova tentativa em %ss", self.prune_interval)
+
+    def close(self) -> None:
+        """
+        Para a thread de limpeza e sincronização
+        """
+        if self._maintainer is None:
+            return
+        self._stopped.set()
+        self._maintainer.join()
+        self._maintainer = None
+
+    def __len__(self) -> int:
+        return len(self._revoked)
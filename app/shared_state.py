@@ -0,0 +1,304 @@
+import fcntl
+import hashlib
+import json
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"AUTHSHM1"
+# Cabeçalho: magic, número de slots, tamanho do valor, janela de busca
+HEADER = struct.Struct("<8sQII")
+HEADER_SIZE = 64
+# Slot: fingerprint da chave, expiração (0 = vazio), tamanho do valor
+SLOT_HEADER = struct.Struct("<16sdH")
+
+
+def fingerprint(key: bytes) -> bytes:
+    """
+    Identificador de 16 bytes da chave guardado na tabela
+    """
+    return hashlib.blake2b(key, digest_size=16).digest()
+
+
+class SharedTable:
+    """
+    Tabela hash de tamanho fixo em um arquivo mapeado em memória (mmap)
+
+    Todos os workers mapeiam o mesmo arquivo, então o estado é um só e a memória
+    não cresce com o número de processos. A tabela é dividida em faixas
+    (`stripes`), cada uma protegida por um lock de arquivo (fcntl, entre
+    processos) e por um threading.Lock (entre threads do mesmo processo).
+
+    Cada chave só pode ocupar os `window` slots a partir da sua posição; com a
+    janela cheia, a entrada que expira primeiro é substituída (ou a gravação
+    é recusada, com `evict=False`). Entradas expiradas contam como vagas.
+    """
+
+    def __init__(self, path: str, slots: int, value_size: int = 0, window: int = 8, stripes: int = 64):
+        self.path = path
+        self.stripes = max(1, min(stripes, slots))
+        self.stripe_slots = max(window, -(-slots // self.stripes))
+        self.slots = self.stripe_slots * self.stripes
+        self.value_size = value_size
+        self.window = min(window, self.stripe_slots)
+        self.slot_size = -(-(SLOT_HEADER.size + value_size) // 8) * 8
+        self.size = HEADER_SIZE + self.slots * self.slot_size
+
+        self._locks = [threading.Lock() for _ in range(self.stripes)]
+        # Substituições de entradas válidas por falta de espaço (contador do processo)
+        self.evictions = 0
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            self._initialize()
+        except BaseException:
+            os.close(self._fd)
+            raise
+        self._mmap = mmap.mmap(self._fd, self.size)
+
+    def _initialize(self) -> None:
+        # O primeiro processo cria o arquivo. Um arquivo com outro layout nunca é
+        # redimensionado: encolher um arquivo mapeado por outros workers os derruba (SIGBUS)
+        fcntl.lockf(self._fd, fcntl.LOCK_EX)
+        try:
+            expected = HEADER.pack(MAGIC, self.slots, self.value_size, self.window)
+            size = os.fstat(self._fd).st_size
+            header = os.pread(self._fd, HEADER.size, 0)
+            if size == self.size and header == expected:
+                return
+            if size == 0 or (size == self.size and header == bytes(HEADER.size)):
+                # Arquivo novo (ou criação interrompida antes do cabeçalho)
+                os.ftruncate(self._fd, self.size)
+                os.pwrite(self._fd, expected, 0)
+                return
+            raise ValueError(
+                f"{self.path} já existe com outro layout (slots, tamanho do valor ou janela); "
+                "remova o arquivo com os workers parados ou use outro SHARED_STATE_DIR"
+            )
+        finally:
+            fcntl.lockf(self._fd, fcntl.LOCK_UN)
+
+    def _locate(self, key_fingerprint: bytes) -> Tuple[int, int]:
+        position = int.from_bytes(key_fingerprint[:8], "little")
+        stripe = position % self.stripes
+        return stripe, (position // self.stripes) % self.stripe_slots
+
+    @contextmanager
+    def _locked(self, stripe: int) -> Iterator[None]:
+        with self._locks[stripe]:
+            # Lock de 1 byte por faixa, além do fim do arquivo (não conflita com o conteúdo)
+            fcntl.lockf(self._fd, fcntl.LOCK_EX, 1, self.size + stripe)
+            try:
+                yield
+            finally:
+                fcntl.lockf(self._fd, fcntl.LOCK_UN, 1, self.size + stripe)
+
+    def _offsets(self, stripe: int, start: int) -> Iterator[int]:
+        base = HEADER_SIZE + stripe * self.stripe_slots * self.slot_size
+        for i in range(self.window):
+            yield base + ((start + i) % self.stripe_slots) * self.slot_size
+
+    def _find(self, key_fingerprint: bytes, stripe: int, start: int, now: float) -> Optional[int]:
+        for offset in self._offsets(stripe, start):
+            slot_fingerprint, expires_at, _ = SLOT_HEADER.unpack_from(self._mmap, offset)
+            if slot_fingerprint == key_fingerprint and expires_at > now:
+                return offset
+        return None
+
+    def _read(self, offset: int) -> bytes:
+        _, _, length = SLOT_HEADER.unpack_from(self._mmap, offset)
+        start = offset + SLOT_HEADER.size
+        return self._mmap[start:start + length]
+
+    def _write(self, offset: int, key_fingerprint: bytes, value: bytes, expires_at: float) -> None:
+        start = offset + SLOT_HEADER.size
+        self._mmap[start:start + len(value)] = value
+        SLOT_HEADER.pack_into(self._mmap, offset, key_fingerprint, expires_at, len(value))
+
+    def _free_slot(self, key_fingerprint: bytes, stripe: int, start: int, now: float, evict: bool) -> Optional[int]:
+        # Preferência: a própria chave, depois um slot vazio/expirado, depois o que expira primeiro
+        free = None
+        victim, victim_expires_at = None, float("inf")
+        for offset in self._offsets(stripe, start):
+            slot_fingerprint, expires_at, _ = SLOT_HEADER.unpack_from(self._mmap, offset)
+            if slot_fingerprint == key_fingerprint:
+                return offset
+            if expires_at <= now:
+                if free is None:
+                    free = offset
+            elif expires_at < victim_expires_at:
+                victim, victim_expires_at = offset, expires_at
+        if free is not None:
+            return free
+        if evict and victim is not None:
+            self.evictions += 1
+            return victim
+        return None
+
+    def get(self, key: bytes) -> Optional[bytes]:
+        """
+        Retorna o valor da chave ou None se ausente/expirado
+        """
+        key_fingerprint = fingerprint(key)
+        stripe, start = self._locate(key_fingerprint)
+        with self._locked(stripe):
+            offset = self._find(key_fingerprint, stripe, start, time.time())
+            return None if offset is None else self._read(offset)
+
+    def set(self, key: bytes, value: bytes, expires_at: float, evict: bool = True) -> bool:
+        """
+        Grava o valor até o timestamp `expires_at`; retorna False se não couber
+        """
+        if len(value) > self.value_size or expires_at <= time.time():
+            return False
+        key_fingerprint = fingerprint(key)
+        stripe, start = self._locate(key_fingerprint)
+        with self._locked(stripe):
+            offset = self._free_slot(key_fingerprint, stripe, start, time.time(), evict)
+            if offset is None:
+                return False
+            self._write(offset, key_fingerprint, value, expires_at)
+            return True
+
+    def update(self, key: bytes, func: Callable[[Optional[bytes]], Tuple[bytes, float, Any]]) -> Any:
+        """
+        Leitura e gravação atômicas: `func(valor atual ou None)` retorna
+        (novo valor, nova expiração, resultado) e o resultado é devolvido
+        """
+        key_fingerprint = fingerprint(key)
+        stripe, start = self._locate(key_fingerprint)
+        with self._locked(stripe):
+            now = time.time()
+            offset = self._find(key_fingerprint, stripe, start, now)
+            value, expires_at, result = func(None if offset is None else self._read(offset))
+            if offset is None:
+                offset = self._free_slot(key_fingerprint, stripe, start, now, evict=True)
+            self._write(offset, key_fingerprint, value, expires_at)
+            return result
+
+    def discard(self, key: bytes) -> None:
+        """
+        Remove a chave, se existir
+        """
+        key_fingerprint = fingerprint(key)
+        stripe, start = self._locate(key_fingerprint)
+        with self._locked(stripe):
+            offset = self._find(key_fingerprint, stripe, start, time.time())
+            if offset is not None:
+                SLOT_HEADER.pack_into(self._mmap, offset, bytes(16), 0.0, 0)
+
+    def clear(self) -> None:
+        """
+        Remove todas as entradas
+        """
+        empty = bytes(self.stripe_slots * self.slot_size)
+        for stripe in range(self.stripes):
+            with self._locked(stripe):
+                start = HEADER_SIZE + stripe * self.stripe_slots * self.slot_size
+                self._mmap[start:start + len(empty)] = empty
+
+    def __len__(self) -> int:
+        """
+        Número de entradas não expiradas (percorre a tabela inteira)
+        """
+        now = time.time()
+        count = 0
+        for offset in range(HEADER_SIZE, self.size, self.slot_size):
+            if SLOT_HEADER.unpack_from(self._mmap, offset)[1] > now:
+                count += 1
+        return count
+
+    def close(self) -> None:
+        self._mmap.close()
+        os.close(self._fd)
+
+
+class SharedTTLCache:
+    """
+    Cache com a mesma interface do TTLCache, guardado em uma SharedTable
+
+    Os valores (dicts de claims) são gravados em JSON; valores maiores que o
+    slot não são cacheados, e sim contados em `oversized` (com um aviso no log
+    na primeira vez). Os contadores são do processo.
+    """
+
+    def __init__(self, table: SharedTable):
+        self.table = table
+        self.max_size = table.slots
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.oversized = 0
+
+    def get(self, key: bytes) -> Optional[Any]:
+        value = self.table.get(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return json.loads(value)
+
+    def set(self, key: bytes, value: Any, expires_at: float) -> None:
+        data = json.dumps(value, separators=(",", ":")).encode("utf-8")
+        if len(data) > self.table.value_size:
+            with self._lock:
+                self.oversized += 1
+                first = self.oversized == 1
+            if first:
+                logger.warning(
+                    "Claims com %d bytes não cabem no cache compartilhado (SHARED_CACHE_VALUE_SIZE=%d); "
+                    "tokens assim são verificados a cada requisição",
+                    len(data), self.table.value_size
+                )
+            return
+        self.table.set(key, data, expires_at)
+
+    def discard(self, key: bytes) -> None:
+        self.table.discard(key)
+
+    def clear(self) -> None:
+        self.table.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self.table),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.table.evictions,
+                "expirations": 0,
+                "oversized": self.oversized,
+            }
+
+
+def shared_table(directory: str, name: str, slots: int, value_size: int = 0, **kwargs) -> SharedTable:
+    """
+    Abre (ou cria) a tabela `name` no diretório de estado compartilhado
+
+    O nome do arquivo inclui o layout: workers com outra configuração (em um
+    deploy gradual, por exemplo) usam outro arquivo em vez de redimensionar o
+    que os demais estão mapeando.
+    """
+    os.makedirs(directory, exist_ok=True)
+    layout = json.dumps([MAGIC.decode("ascii"), slots, value_size, sorted(kwargs.items())])
+    version = hashlib.blake2b(layout.encode("utf-8"), digest_size=4).hexdigest()
+    return SharedTable(os.path.join(directory, f"{name}.{version}.mmap"), slots, value_size, **kwargs)
+
+
+def reset_shared_state(directory: str) -> None:
+    """
+    Remove as tabelas de uma execução anterior (chamado pelo processo mestre antes dos workers)
+    """
+    if not directory or not os.path.isdir(directory):
+        return
+    for name in os.listdir(directory):
+        if name.endswith(".mmap"):
+            os.remove(os.path.join(directory, name))
@@ -0,0 +1,24 @@
+from typing import Any, Dict, List
+
+from .jwt_engine import build_engine
+from .keyring import build_keyring
+
+# Engine dos processos do pool de assinatura, montada uma vez pelo initializer.
+# Este módulo não importa o FastAPI nem o restante do app: é tudo o que os
+# processos do pool carregam.
+_engine = None
+
+
+def init_signing_process(engine_name: str) -> None:
+    """
+    Initializer dos processos do pool: monta o keyring e a engine a partir da configuração
+    """
+    global _engine
+    _engine = build_engine(engine_name, build_keyring())
+
+
+def sign_claims(claims_list: List[Dict[str, Any]]) -> List[str]:
+    """
+    Assina uma lista de claims com a engine do processo
+    """
+    return [_engine.encode(claims) for claims in claims_list]
@@ -0,0 +1,257 @@
+import hashlib
+import json
+import logging
+import queue
+import secrets
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def hash_token(token: str) -> str:
+    """
+    Digest SHA-256 do refresh token (o token em claro nunca é gravado)
+    """
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+class ConnectionPool:
+    """
+    Pool fixo de conexões SQLite em modo WAL, compartilhado entre threads
+    """
+
+    def __init__(self, db_path: str, size: int = 4):
+        self._connections: "queue.Queue[sqlite3.Connection]" = queue.Queue(maxsize=size)
+        for _ in range(size):
+            connection = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._connections.put(connection)
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        connection = self._connections.get()
+        try:
+            yield connection
+        finally:
+            self._connections.put(connection)
+
+    def close(self) -> None:
+        while not self._connections.empty():
+            self._connections.get_nowait().close()
+
+
+class RefreshTokenStore:
+    """
+    Armazena refresh tokens (hash SHA-256) em SQLite com gravações em lote
+
+    Emissões não vão direto ao disco: entram em uma fila que uma thread grava
+    em uma única transação a cada `flush_interval` segundos ou a cada
+    `batch_size` tokens. O uso de um token na rotação é gravado na hora, com
+    um UPDATE condicional (`used = 0`): entre threads, processos ou workers
+    que compartilham o arquivo, só uma rotação do mesmo token é aceita.
+    Uma falha ao gravar (banco bloqueado, disco cheio) é registrada no log e
+    as emissões continuam na fila até o próximo flush.
+    """
+
+    # Espera (segundos) antes de tentar de novo depois de uma falha ao gravar
+    RETRY_INTERVAL = 1.0
+
+    def __init__(
+        self,
+        db_path: str,
+        pool_size: int = 4,
+        batch_size: int = 100,
+        flush_interval: float = 0.05,
+        prune_interval: float = 3600
+    ):
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.prune_interval = prune_interval
+        self._pool = ConnectionPool(db_path, size=pool_size)
+        with self._pool.connection() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS refresh_tokens ("
+                " token_hash TEXT PRIMARY KEY,"
+                " user_id TEXT NOT NULL,"
+                " permissions TEXT NOT NULL,"
+                " expires_at REAL NOT NULL,"
+                " used INTEGER NOT NULL DEFAULT 0,"
+                " access_ttl_minutes INTEGER,"
+                " tenant TEXT"
+                ")"
+            )
+            columns = {row[1] for row in connection.execute("PRAGMA table_info(refresh_tokens)")}
+            if "tenant" not in columns:
+                # Bancos criados antes da coluna: tokens sem tenant são recusados na rotação
+                connection.execute("ALTER TABLE refresh_tokens ADD COLUMN tenant TEXT")
+            connection.execute("CREATE INDEX IF NOT EXISTS idx_refresh_expires ON refresh_tokens (expires_at)")
+            connection.commit()
+
+        # Tokens emitidos e ainda não gravados: hash -> registro
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._writes: List[str] = []
+        self._lock = threading.Lock()
+        # Um flush por vez: quando flush() retorna, o que estava na fila já está no banco
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._writer = threading.Thread(target=self._run_writer, name="refresh-token-writer", daemon=True)
+        self._writer.start()
+
+    def issue(
+        self,
+        user_id: str,
+        permissions: List[str],
+        ttl_seconds: int,
+        access_ttl_minutes: Optional[int] = None,
+        tenant: Optional[str] = None
+    ) -> str:
+        """
+        Cria um novo refresh token
+
+        `access_ttl_minutes` guarda a duração dos access tokens emitidos a partir dele
+        e `tenant`, o tenant da API key que o emitiu.
+        """
+        token = secrets.token_urlsafe(32)
+        record = {
+            "user_id": user_id,
+            "permissions": list(permissions),
+            "expires_at": time.time() + ttl_seconds,
+            "access_ttl_minutes": access_ttl_minutes,
+            "tenant": tenant
+        }
+        token_hash = hash_token(token)
+        with self._lock:
+            self._pending[token_hash] = record
+            self._writes.append(token_hash)
+            full = len(self._writes) >= self.batch_size
+        if full:
+            self._wakeup.set()
+        return token
+
+    def rotate(self, token: str, ttl_seconds: int) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """
+        Troca um refresh token válido por um novo, invalidando o anterior
+
+        Retorna (novo token, registro) ou None se o token for desconhecido,
+        expirado ou já tiver sido usado. Faz I/O no banco: chame fora do event loop.
+        """
+        token_hash = hash_token(token)
+        with self._lock:
+            pending = token_hash in self._pending
+        if pending:
+            # Emitido há menos de um flush: grava a fila antes de marcar o uso
+            self.flush()
+
+        record = self._consume(token_hash)
+        if record is None:
+            return None
+
+        new_token = self.issue(
+            record["user_id"], record["permissions"], ttl_seconds, record["access_ttl_minutes"], record["tenant"]
+        )
+        return new_token, record
+
+    def _consume(self, token_hash: str) -> Optional[Dict[str, Any]]:
+        # UPDATE e SELECT na mesma transação: o token lido é o que esta chamada marcou como usado
+        with self._pool.connection() as connection:
+            with connection:
+                cursor = connection.execute(
+                    "UPDATE refresh_tokens SET used = 1"
+                    " WHERE token_hash = ? AND used = 0 AND expires_at > ?",
+                    (token_hash, time.time())
+                )
+                if cursor.rowcount != 1:
+                    return None
+                row = connection.execute(
+                    "SELECT user_id, permissions, expires_at, access_ttl_minutes, tenant"
+                    " FROM refresh_tokens WHERE token_hash = ?",
+                    (token_hash,)
+                ).fetchone()
+        return {
+            "user_id": row[0],
+            "permissions": json.loads(row[1]),
+            "expires_at": row[2],
+            "access_ttl_minutes": row[3],
+            "tenant": row[4]
+        }
+
+    def flush(self) -> None:
+        """
+        Grava os tokens emitidos pendentes em uma única transação
+
+        Em caso de erro os tokens voltam para a fila e a exceção é propagada.
+        """
+        with self._flush_lock:
+            with self._lock:
+                writes, self._writes = self._writes, []
+                records = {token_hash: self._pending[token_hash] for token_hash in writes}
+            if not writes:
+                return
+
+            inserts = [
+                (
+                    token_hash, record["user_id"], json.dumps(record["permissions"]),
+                    record["expires_at"], record["access_ttl_minutes"], record["tenant"]
+                )
+                for token_hash, record in records.items()
+            ]
+            try:
+                with self._pool.connection() as connection:
+                    with connection:
+                        connection.executemany(
+                            "INSERT INTO refresh_tokens"
+                            " (token_hash, user_id, permissions, expires_at, access_ttl_minutes, tenant)"
+                            " VALUES (?, ?, ?, ?, ?, ?)"
+                            " ON CONFLICT(token_hash) DO NOTHING",
+                            inserts
+                        )
+            except Exception:
+                with self._lock:
+                    self._writes[:0] = writes
+                raise
+
+            with self._lock:
+                for token_hash in writes:
+                    self._pending.pop(token_hash, None)
+
+    def prune(self) -> int:
+        """
+        Remove refresh tokens expirados
+        """
+        with self._pool.connection() as connection:
+            with connection:
+                cursor = connection.execute("DELETE FROM refresh_tokens WHERE expires_at <= ?", (time.time(),))
+        return cursor.rowcount
+
+    def _run_writer(self) -> None:
+        next_prune = time.time() + self.prune_interval
+        while not self._stopped.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+                if time.time() >= next_prune:
+                    self.prune()
+                    next_prune = time.time() + self.prune_interval
+            except Exception:
+                logger.exception("Falha ao gravar refresh tokens em %s; nova tentativa em seguida", self.db_path)
+                self._stopped.wait(self.RETRY_INTERVAL)
+
+    def close(self) -> None:
+        """
+        Para a thread de gravação, grava o que estiver pendente e fecha o pool
+        """
+        self._stopped.set()
+        self._wakeup.set()
+        self._writer.join()
+        try:
+            self.flush()
+        finally:
+            self._pool.close()
@@ -0,0 +1,62 @@
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class Warmup:
+    """
+    Etapas de aquecimento executadas uma vez por processo, antes da primeira requisição
+
+    Cada etapa exercita um caminho que só seria inicializado sob demanda (módulos
+    de criptografia importados no primeiro uso, objetos de chave, validadores e
+    serialização das respostas). A execução é idempotente: chamadas seguintes
+    (ex: o /_ah/warmup do App Engine depois da inicialização) retornam o mesmo
+    relatório. Uma etapa que falha é registrada no log e não impede as demais.
+    """
+
+    def __init__(self):
+        self._steps: List[Tuple[str, Callable[[], None]]] = []
+        self._lock = threading.Lock()
+        self.import_seconds: Optional[float] = None
+        self.report: Optional[Dict[str, float]] = None
+
+    def add_step(self, name: str, func: Callable[[], None]) -> None:
+        """
+        Registra uma etapa (executada na ordem de registro)
+        """
+        self._steps.append((name, func))
+
+    def run(self) -> Dict[str, float]:
+        """
+        Executa as etapas (só na primeira chamada) e retorna a duração de cada uma em segundos
+        """
+        with self._lock:
+            if self.report is None:
+                report = {}
+                started = time.perf_counter()
+                for name, func in self._steps:
+                    start = time.perf_counter()
+                    try:
+                        func()
+                    except Exception:
+                        logger.exception("Falha na etapa de aquecimento %s", name)
+                        continue
+                    report[name] = time.perf_counter() - start
+                report["total"] = time.perf_counter() - started
+                self.report = report
+            return self.report
+
+    def metrics(self) -> List[str]:
+        """
+        Tempos de inicialização do processo no formato Prometheus
+        """
+        lines = ["# TYPE auth_api_startup_seconds gauge"]
+        if self.import_seconds is not None:
+            lines.append(f'auth_api_startup_seconds{{phase="import"}} {self.import_seconds}')
+        for name, seconds in (self.report or {}).items():
+            phase = "warmup" if name == "total" else f"warmup_{name}"
+            lines.append(f'auth_api_startup_seconds{{phase="{phase}"}} {seconds}')
+        return lines
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Benchmark dos endpoints de autenticação, executado em processo via ASGI (sem rede)
+
+Mede throughput e latência (p50/p95/p99) de emissão de token, validação e
+/auth/me para cada combinação de concorrência, tamanho de payload e tamanho
+da lista de permissões, e grava os resultados em JSON para comparar execuções.
+
+Uso:
+    python benchmarks/bench_endpoints.py --requests 2000 --concurrency 1,10,50
+    python benchmarks/bench_endpoints.py --permissions 3,100 --payload-sizes 0,4096 --output resultado.json
+    python benchmarks/bench_endpoints.py --baseline resultado.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import sys
+import time
+from datetime import datetime
+
+import httpx
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import config
+from app.main import app
+
+SCENARIOS = ("token", "validate", "me")
+
+def parse_list(value: str) -> list:
+    """Converte "1,10,50" em [1, 10, 50]"""
+    return [int(item) for item in value.split(",") if item.strip()]
+
+def percentile(sorted_values: list, fraction: float) -> float:
+    """Percentil pelo método nearest-rank sobre valores já ordenados"""
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, int(round(fraction * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+def token_payload(permissions: int, payload_size: int) -> dict:
+    """Corpo de /auth/token; `payload_size` caracteres extras vão no user_id (e no token)"""
+    return {
+        "api_key": config.API_KEY,
+        "user_id": "benchmark_user" + "x" * payload_size,
+        "permissions": [f"perm_{i}" for i in range(permissions)]
+    }
+
+async def issue_tokens(client: httpx.AsyncClient, payload: dict, count: int) -> list:
+    """Emite tokens para os cenários de validação"""
+    tokens = []
+    for i in range(count):
+        response = await client.post("/auth/token", json={**payload, "user_id": f"{payload['user_id']}_{i}"})
+        response.raise_for_status()
+        tokens.append(response.json()["access_token"])
+    return tokens
+
+def build_request(scenario: str, payload: dict, tokens: list):
+    """Retorna uma função (índice da requisição) -> (método, url, kwargs)"""
+    if scenario == "token":
+        return lambda i: ("POST", "/auth/token", {"json": payload})
+    if scenario == "validate":
+        return lambda i: ("POST", "/auth/validate", {"json": {"token": tokens[i % len(tokens)]}})
+    return lambda i: ("GET", "/auth/me", {"headers": {"Authorization": f"Bearer {tokens[i % len(tokens)]}"}})
+
+async def run_scenario(client: httpx.AsyncClient, make_request, total: int, concurrency: int) -> dict:
+    """Executa `total` requisições com `concurrency` workers e coleta as latências"""
+    latencies = []
+    errors = 0
+    counter = iter(range(total))
+
+    async def worker():
+        nonlocal errors
+        for i in counter:
+            method, url, kwargs = make_request(i)
+            start = time.perf_counter()
+            response = await client.request(method, url, **kwargs)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code != 200:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "requests": total,
+        "errors": errors,
+        "elapsed_seconds": round(elapsed, 4),
+        "throughput_rps": round(total / elapsed, 1),
+        "latency_ms": {
+            "p50": round(percentile(latencies, 0.50) * 1000, 3),
+            "p95": round(percentile(latencies, 0.95) * 1000, 3),
+            "p99": round(percentile(latencies, 0.99) * 1000, 3),
+            "mean": round(sum(latencies) / len(latencies) * 1000, 3),
+            "max": round(latencies[-1] * 1000, 3)
+        }
+    }
+
+async def run(args) -> list:
+    results = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for permissions in args.permissions:
+            for payload_size in args.payload_sizes:
+                payload = token_payload(permissions, payload_size)
+                tokens = await issue_tokens(client, payload, args.token_pool)
+                for scenario in args.scenarios:
+                    make_request = build_request(scenario, payload, tokens)
+                    for concurrency in args.concurrency:
+                        # Aquecimento: caches, pools e caminhos de código já exercitados
+                        await run_scenario(client, make_request, args.warmup, concurrency)
+                        result = await run_scenario(client, make_request, args.requests, concurrency)
+                        result.update({
+                            "scenario": scenario,
+                            "concurrency": concurrency,
+                            "permissions": permissions,
+                            "payload_size": payload_size
+                        })
+                        results.append(result)
+                        print_result(result)
+    return results
+
+def result_key(result: dict) -> tuple:
+    return (result["scenario"], result["concurrency"], result["permissions"], result["payload_size"])
+
+def print_result(result: dict, baseline: dict = None):
+    latency = result["latency_ms"]
+    line = (
+        f"{result['scenario']:<9} {result['concurrency']:>5} {result['permissions']:>6} {result['payload_size']:>7} "
+        f"{result['throughput_rps']:>10,.0f} {latency['p50']:>8.2f} {latency['p95']:>8.2f} {latency['p99']:>8.2f} "
+        f"{result['errors']:>6}"
+    )
+    if baseline is not None:
+        change = (result["throughput_rps"] / baseline["throughput_rps"] - 1) * 100
+        line += f"  {change:+.1f}% req/s vs baseline"
+    print(line)
+
+def print_header():
+    print(
+        f"{'cenário':<9} {'conc':>5} {'perms':>6} {'payload':>7} "
+        f"{'req/s':>10} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'erros':>6}"
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark em processo dos endpoints de autenticação")
+    parser.add_argument("--requests", type=int, default=2000, help="Requisições por combinação")
+    parser.add_argument("--warmup", type=int, default=200, help="Requisições de aquecimento por combinação")
+    parser.add_argument("--concurrency", type=parse_list, default=[1, 10, 50], help="Ex: 1,10,50")
+    parser.add_argument("--permissions", type=parse_list, default=[3], help="Tamanhos da lista de permissões, ex: 3,100")
+    parser.add_argument("--payload-sizes", type=parse_list, default=[0], help="Caracteres extras no user_id, ex: 0,4096")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="Subconjunto de token,validate,me")
+    parser.add_argument("--token-pool", type=int, default=1,
+                        help="Tokens distintos usados em validate/me (1 = caminho do cache)")
+    parser.add_argument("--output", default="benchmark_results.json", help="Arquivo JSON de resultados")
+    parser.add_argument("--baseline", help="JSON de uma execução anterior para comparação")
+    args = parser.parse_args()
+    args.scenarios = [name for name in args.scenarios.split(",") if name]
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"Cenários desconhecidos: {', '.join(sorted(unknown))}")
+
+    print(f"🏁 Benchmark dos endpoints ({args.requests} requisições por combinação, engine {config.JWT_ENGINE}, "
+          f"{config.ALGORITHM})")
+    print("=" * 80)
+    print_header()
+    results = asyncio.run(run(args))
+
+    report = {
+        "meta": {
+            "timestamp": datetime.utcnow().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "jwt_engine": config.JWT_ENGINE,
+            "algorithm": config.ALGORITHM,
+            "args": {key: value for key, value in vars(args).items() if key not in ("output", "baseline")}
+        },
+        "results": results
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n💾 Resultados gravados em {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = {result_key(result): result for result in json.load(f)["results"]}
+        print(f"\n📊 Comparação com {args.baseline}")
+        print_header()
+        for result in results:
+            previous = baseline.get(result_key(result))
+            print_result(result, previous)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Benchmark da validação de tokens: REST x gRPC
+
+Sobe o uvicorn em um processo novo com GRPC_PORT definido e compara, contra o
+mesmo servidor e os mesmos tokens:
+  - rest:   POST /auth/validate com conexões HTTP/1.1 keep-alive (httpx);
+  - unary:  AuthService.Validate, uma chamada por token em um único canal HTTP/2;
+  - stream: AuthService.ValidateBatch, tokens enviados em streams de --stream-size
+            (latência por stream; req/s contado em tokens).
+
+Para cada nível de concorrência mede requisições por segundo e latência
+p50/p95/p99. Cliente e servidor dividem a mesma máquina: compare execuções
+feitas no mesmo ambiente. Requer as dependências de requirements-grpc.txt.
+
+Uso:
+    python benchmarks/bench_grpc.py
+    python benchmarks/bench_grpc.py --concurrency 1,10,50 --requests 5000
+    python benchmarks/bench_grpc.py --output grpc.json --baseline grpc_anterior.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+import grpc
+import httpx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+sys.path.append(ROOT)
+
+from app import config
+from app.auth_service_pb2 import ValidateRequest
+from app.auth_service_pb2_grpc import AuthServiceStub
+
+SCENARIOS = ("rest", "unary", "stream")
+
+def parse_list(value: str) -> list:
+    """Converte "1,10,50" em [1, 10, 50]"""
+    return [int(item) for item in value.split(",") if item.strip()]
+
+def percentile(sorted_values: list, fraction: float) -> float:
+    """Percentil pelo método nearest-rank sobre valores já ordenados"""
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, int(round(fraction * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def start_server(http_port: int, grpc_port: int) -> subprocess.Popen:
+    """
+    Sobe o uvicorn com o servidor gRPC e espera o /health responder
+    """
+    # Sem limites por IP/API key: o benchmark mede o transporte, não o rate limit
+    env = {**os.environ, "GRPC_PORT": str(grpc_port), "RATE_LIMITS": ""}
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(http_port),
+         "--log-level", "warning"],
+        cwd=ROOT, env=env
+    )
+    with httpx.Client(base_url=f"http://127.0.0.1:{http_port}") as client:
+        while True:
+            if server.poll() is not None:
+                raise RuntimeError("O servidor encerrou antes de responder")
+            try:
+                if client.get("/health").status_code == 200:
+                    return server
+            except httpx.TransportError:
+                time.sleep(0.01)
+
+async def issue_tokens(client: httpx.AsyncClient, count: int) -> list:
+    tokens = []
+    for i in range(count):
+        response = await client.post("/auth/token", json={
+            "api_key": config.API_KEY, "user_id": f"bench_grpc_{i}", "permissions": ["read", "write"]
+        })
+        response.raise_for_status()
+        tokens.append(response.json()["access_token"])
+    return tokens
+
+def build_call(scenario: str, client: httpx.AsyncClient, stub: AuthServiceStub, tokens: list, stream_size: int):
+    """
+    Retorna (corrotina de uma chamada, tokens validados por chamada)
+    """
+    if scenario == "rest":
+        async def call(i: int) -> bool:
+            response = await client.post("/auth/validate", json={"token": tokens[i % len(tokens)]})
+            return response.status_code == 200 and response.json()["valid"]
+        return call, 1
+
+    if scenario == "unary":
+        async def call(i: int) -> bool:
+            return (await stub.Validate(ValidateRequest(token=tokens[i % len(tokens)]))).valid
+        return call, 1
+
+    async def call(i: int) -> bool:
+        requests = (ValidateRequest(token=tokens[(i + j) % len(tokens)]) for j in range(stream_size))
+        responses = [response async for response in stub.ValidateBatch(requests)]
+        return len(responses) == stream_size and all(response.valid for response in responses)
+    return call, stream_size
+
+async def run_scenario(call, calls: int, concurrency: int, tokens_per_call: int) -> dict:
+    """
+    Executa `calls` chamadas com `concurrency` tarefas simultâneas
+    """
+    latencies = []
+    errors = 0
+    counter = iter(range(calls))
+
+    async def worker():
+        nonlocal errors
+        for i in counter:
+            start = time.perf_counter()
+            try:
+                ok = await call(i)
+            except (httpx.HTTPError, grpc.RpcError):
+                ok = False
+            latencies.append(time.perf_counter() - start)
+            if not ok:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "calls": calls,
+        "tokens": calls * tokens_per_call,
+        "errors": errors,
+        "elapsed_seconds": round(elapsed, 4),
+        "throughput_rps": round(calls * tokens_per_call / elapsed, 1),
+        "latency_ms": {
+            "p50": round(percentile(latencies, 0.50) * 1000, 3),
+            "p95": round(percentile(latencies, 0.95) * 1000, 3),
+            "p99": round(percentile(latencies, 0.99) * 1000, 3),
+            "mean": round(sum(latencies) / len(latencies) * 1000, 3),
+            "max": round(latencies[-1] * 1000, 3)
+        }
+    }
+
+async def run(args, http_port: int, grpc_port: int) -> list:
+    results = []
+    limits = httpx.Limits(max_connections=max(args.concurrency), max_keepalive_connections=max(args.concurrency))
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{http_port}", limits=limits) as client, \
+            grpc.aio.insecure_channel(f"127.0.0.1:{grpc_port}") as channel:
+        stub = AuthServiceStub(channel)
+        tokens = await issue_tokens(client, args.token_pool)
+        for scenario in args.scenarios:
+            call, tokens_per_call = build_call(scenario, client, stub, tokens, args.stream_size)
+            # No stream cada chamada valida --stream-size tokens: o total de tokens é o mesmo
+            calls = max(1, args.requests // tokens_per_call)
+            warmup = max(1, args.warmup // tokens_per_call)
+            for concurrency in args.concurrency:
+                # Aquecimento: conexões abertas, caches e caminhos de código já exercitados
+                await run_scenario(call, warmup, concurrency, tokens_per_call)
+                result = await run_scenario(call, calls, concurrency, tokens_per_call)
+                result.update({"scenario": scenario, "concurrency": concurrency})
+                results.append(result)
+                print_result(result)
+    return results
+
+def result_key(result: dict) -> tuple:
+    return (result["scenario"], result["concurrency"])
+
+def print_result(result: dict, baseline: dict = None):
+    latency = result["latency_ms"]
+    line = (
+        f"{result['scenario']:<8} {result['concurrency']:>5} {result['throughput_rps']:>10,.0f} "
+        f"{latency['p50']:>8.2f} {latency['p95']:>8.2f} {latency['p99']:>8.2f} {result['errors']:>6}"
+    )
+    if baseline is not None:
+        change = (result["throughput_rps"] / baseline["throughput_rps"] - 1) * 100
+        line += f"  {change:+.1f}% req/s vs baseline"
+    print(line)
+
+def print_header():
+    print(f"{'cenário':<8} {'conc':>5} {'req/s':>10} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'erros':>6}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da validação de tokens via REST e gRPC")
+    parser.add_argument("--requests", type=int, default=2000, help="Tokens validados por combinação")
+    parser.add_argument("--warmup", type=int, default=200, help="Tokens de aquecimento por combinação")
+    parser.add_argument("--concurrency", type=parse_list, default=[1, 10, 50], help="Ex: 1,10,50")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="Subconjunto de rest,unary,stream")
+    parser.add_argument("--stream-size", type=int, default=100,
+                        help="Tokens por stream do ValidateBatch (até VALIDATE_BATCH_MAX_SIZE)")
+    parser.add_argument("--token-pool", type=int, default=1,
+                        help="Tokens distintos validados (1 = caminho do cache)")
+    parser.add_argument("--output", default="grpc_results.json", help="Arquivo JSON de resultados")
+    parser.add_argument("--baseline", help="JSON de uma execução anterior para comparação")
+    args = parser.parse_args()
+    args.scenarios = [name for name in args.scenarios.split(",") if name]
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"Cenários desconhecidos: {', '.join(sorted(unknown))}")
+
+    http_port, grpc_port = free_port(), free_port()
+    print(f"🏁 Validação REST x gRPC ({args.requests} tokens por combinação, engine {config.JWT_ENGINE}, "
+          f"{config.ALGORITHM})")
+    print("=" * 80)
+    print_header()
+    server = start_server(http_port, grpc_port)
+    try:
+        results = asyncio.run(run(args, http_port, grpc_port))
+    finally:
+        server.terminate()
+        server.wait()
+
+    report = {
+        "meta": {
+            "timestamp": datetime.utcnow().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "jwt_engine": config.JWT_ENGINE,
+            "algorithm": config.ALGORITHM,
+            "args": {key: value for key, value in vars(args).items() if key not in ("output", "baseline")}
+        },
+        "results": results
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n💾 Resultados gravados em {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = {result_key(result): result for result in json.load(f)["results"]}
+        print(f"\n📊 Comparação com {args.baseline}")
+        print_header()
+        for result in results:
+            print_result(result, baseline.get(result_key(result)))
+
+if __name__ == "__main__":
+    main()
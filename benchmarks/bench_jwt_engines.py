@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Benchmark das engines JWT: tokens/segundo para assinatura e verificação
+
+Uso:
+    python benchmarks/bench_jwt_engines.py --iterations 20000 --algorithm HS256
+    python benchmarks/bench_jwt_engines.py --iterations 2000 --algorithm RS256
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.jwt_engine import ENGINES
+from app.keyring import Keyring
+from app.keys import HMAC_ALGORITHMS, HMACKey, AsymmetricKey
+
+SECRET_KEY = "benchmark-secret-key-com-pelo-menos-32-caracteres"
+
+def build_key(algorithm: str):
+    """Cria uma chave efêmera para o algoritmo (segredo HMAC ou par gerado em memória)"""
+    if algorithm in HMAC_ALGORITHMS:
+        return HMACKey(SECRET_KEY, algorithm)
+
+    from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+
+    if algorithm.startswith("RS"):
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    elif algorithm.startswith("ES"):
+        curve = {"ES256": ec.SECP256R1, "ES384": ec.SECP384R1, "ES512": ec.SECP521R1}[algorithm]
+        private_key = ec.generate_private_key(curve())
+    else:
+        private_key = ed25519.Ed25519PrivateKey.generate()
+    return AsymmetricKey(algorithm, private_key=private_key)
+
+def build_claims(permissions: int) -> dict:
+    """Monta claims equivalentes às geradas por /auth/token"""
+    now = datetime.utcnow()
+    return {
+        "user_id": "benchmark_user",
+        "permissions": [f"perm_{i}" for i in range(permissions)],
+        "type": "access_token",
+        "exp": now + timedelta(minutes=30),
+        "iat": now
+    }
+
+def measure(func, arg, iterations: int) -> float:
+    """Executa `func(arg)` N vezes e retorna operações por segundo"""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func(arg)
+    elapsed = time.perf_counter() - start
+    return iterations / elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark das engines JWT")
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--algorithm", default="HS256")
+    parser.add_argument("--permissions", type=int, default=3, help="Tamanho da lista de permissões")
+    args = parser.parse_args()
+
+    claims = build_claims(args.permissions)
+    keyring = Keyring.single(build_key(args.algorithm))
+
+    print(f"🏁 Benchmark JWT ({args.algorithm}, {args.iterations} iterações, {args.permissions} permissões)")
+    print("=" * 60)
+    print(f"{'engine':<10} {'encode (tokens/s)':>20} {'decode (tokens/s)':>20}")
+
+    for name, engine_cls in ENGINES.items():
+        try:
+            engine = engine_cls(keyring)
+        except ValueError as e:
+            print(f"{name:<10} {'n/a':>20} {'n/a':>20}  ({e})")
+            continue
+
+        token = engine.encode(claims)
+        encode_rate = measure(engine.encode, claims, args.iterations)
+        decode_rate = measure(engine.decode, token, args.iterations)
+        print(f"{name:<10} {encode_rate:>20,.0f} {decode_rate:>20,.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Benchmark da serialização das respostas: caminho padrão do FastAPI x FAST_RESPONSES
+
+O caminho padrão instancia o modelo Pydantic, revalida pelo `response_model`
+e serializa com o encoder JSON padrão. O caminho rápido monta o dict pelo
+ResponseShape e serializa com orjson. Antes de medir, confere que os dois
+caminhos produzem exatamente os mesmos bytes.
+
+Uso:
+    python benchmarks/bench_responses.py --iterations 20000
+    python benchmarks/bench_responses.py --nested-iterations 200 --batch-size 100 --bulk-size 1000
+
+Para o efeito ponta a ponta, compare o benchmark dos endpoints nos dois modos:
+    python benchmarks/bench_endpoints.py --output padrao.json
+    FAST_RESPONSES=true python benchmarks/bench_endpoints.py --baseline padrao.json
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import models
+from app.main import app
+from app.responses import FastJSONResponse, ResponseShape
+
+def route_for(path: str):
+    """Rota registrada no app (para usar o mesmo response_model do endpoint)"""
+    return next(route for route in app.routes if getattr(route, "path", None) == path)
+
+def build_cases(batch_size: int, bulk_size: int) -> dict:
+    """Campos de resposta representativos de cada endpoint"""
+    expires_at = datetime.utcnow().replace(microsecond=0) + timedelta(minutes=30)
+    token = "eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9." + "x" * 180 + ".assinatura"
+    validation = dict(
+        valid=True,
+        user_id="usuário_benchmark",
+        permissions=["read", "write", "admin"],
+        expires_at=expires_at,
+        message="Token válido"
+    )
+    return {
+        "/auth/token": {
+            "access_token": token, "token_type": "bearer", "expires_in": 1800, "expires_at": expires_at
+        },
+        "/auth/validate": validation,
+        "/auth/validate/batch": {"results": [validation] * batch_size},
+        "/auth/token/bulk": {
+            "tokens": [{"user_id": f"user_{i}", "access_token": token} for i in range(bulk_size)],
+            "token_type": "bearer", "expires_in": 1800, "expires_at": expires_at
+        }
+    }
+
+# Respostas com listas: campo -> modelo dos itens
+NESTED = {
+    "/auth/validate/batch": ("results", models.TokenValidationResponse),
+    "/auth/token/bulk": ("tokens", models.IssuedToken)
+}
+
+def run_sync(coroutine):
+    """Executa uma corrotina que não suspende (serialize_response com is_coroutine=True)"""
+    try:
+        coroutine.send(None)
+    except StopIteration as e:
+        return e.value
+    raise RuntimeError("A corrotina suspendeu inesperadamente")
+
+def standard_path(route, fields: dict) -> bytes:
+    """Modelo Pydantic -> validação do response_model -> JSONResponse (como o FastAPI faz)"""
+    content = run_sync(serialize_response(
+        field=route.secure_cloned_response_field,
+        response_content=route.response_model(**fields),
+        exclude_none=route.response_model_exclude_none
+    ))
+    return JSONResponse(content).body
+
+def fast_path(shape: ResponseShape, fields: dict, nested=None) -> bytes:
+    """ResponseShape -> dict -> orjson"""
+    if nested is not None:
+        name, item_shape = nested
+        fields = {**fields, name: [item_shape.build(**item) for item in fields[name]]}
+    return FastJSONResponse(shape.build(**fields)).body
+
+def measure(func, iterations: int) -> float:
+    """Executa `func()` N vezes e retorna operações por segundo"""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return iterations / (time.perf_counter() - start)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da serialização das respostas")
+    parser.add_argument("--iterations", type=int, default=20000, help="Iterações das respostas simples")
+    parser.add_argument("--nested-iterations", type=int, default=200, help="Iterações das respostas em lote")
+    parser.add_argument("--batch-size", type=int, default=100, help="Tokens por resposta de /auth/validate/batch")
+    parser.add_argument("--bulk-size", type=int, default=1000, help="Tokens por resposta de /auth/token/bulk")
+    args = parser.parse_args()
+
+    print("🏁 Benchmark de serialização (FAST_RESPONSES x caminho padrão do FastAPI)")
+    print("=" * 72)
+    print(f"{'rota':<22} {'padrão (resp/s)':>16} {'rápido (resp/s)':>16} {'ganho':>8}")
+
+    for path, fields in build_cases(args.batch_size, args.bulk_size).items():
+        route = route_for(path)
+        shape = ResponseShape(route.response_model, route.response_model_exclude_none, enabled=True)
+        nested = None
+        if path in NESTED:
+            name, item_model = NESTED[path]
+            nested = (name, ResponseShape(item_model, enabled=True))
+
+        standard_body = standard_path(route, fields)
+        fast_body = fast_path(shape, fields, nested)
+        if standard_body != fast_body:
+            print(f"❌ {path}: bytes diferentes\n  padrão: {standard_body[:200]!r}\n  rápido: {fast_body[:200]!r}")
+            sys.exit(1)
+
+        iterations = args.nested_iterations if nested else args.iterations
+        standard_rate = measure(lambda: standard_path(route, fields), iterations)
+        fast_rate = measure(lambda: fast_path(shape, fields, nested), iterations)
+        print(f"{path:<22} {standard_rate:>16,.0f} {fast_rate:>16,.0f} {fast_rate / standard_rate:>7.1f}x")
+
+    print("\n✅ Os dois caminhos produzem os mesmos bytes em todas as rotas")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Perfil de inicialização (cold start) da API
+
+Mede, em processos novos a cada execução:
+  - tempo de importação por módulo (`python -X importtime -c "import app.main"`),
+    agrupado por pacote de topo (fastapi, pydantic, app...) e os módulos mais caros;
+  - tempo até a primeira resposta: do início do processo do uvicorn até o primeiro
+    200 do /health, e a latência das primeiras emissões/validações de token
+    comparada com a das seguintes, com e sem WARMUP_ON_STARTUP.
+
+Os resultados são gravados em JSON para acompanhar a evolução entre versões.
+
+Uso:
+    python benchmarks/profile_startup.py --runs 5
+    python benchmarks/profile_startup.py --warmup on,off --output startup.json
+    python benchmarks/profile_startup.py --baseline startup.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+import httpx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+sys.path.append(ROOT)
+
+from app import config
+
+def parse_importtime(output: str) -> list:
+    """
+    Converte a saída do `-X importtime` em [(módulo, self µs, cumulativo µs, profundidade)]
+    """
+    entries = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        depth = (len(name) - len(name.lstrip(" "))) // 2
+        entries.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return entries
+
+def profile_imports(runs: int) -> dict:
+    """
+    Importa app.main em `runs` processos novos e retorna as medianas por módulo e por pacote
+    """
+    per_module = {}
+    totals = []
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", "import app.main"],
+            cwd=ROOT, capture_output=True, text=True, check=True
+        )
+        entries = parse_importtime(result.stderr)
+        for name, self_us, cumulative_us, depth in entries:
+            per_module.setdefault(name, []).append((self_us, cumulative_us, depth))
+        totals.append(next(cumulative for name, _, cumulative, _ in entries if name == "app.main"))
+
+    modules = {
+        name: {
+            "self_ms": round(statistics.median(sample[0] for sample in samples) / 1000, 3),
+            "cumulative_ms": round(statistics.median(sample[1] for sample in samples) / 1000, 3),
+            "depth": samples[0][2]
+        }
+        for name, samples in per_module.items()
+    }
+    packages = {}
+    for name, module in modules.items():
+        package = name.split(".")[0]
+        packages[package] = round(packages.get(package, 0) + module["self_ms"], 3)
+
+    return {
+        "import_app_main_ms": round(statistics.median(totals) / 1000, 3),
+        "packages_self_ms": dict(sorted(packages.items(), key=lambda item: -item[1])),
+        "modules": modules
+    }
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def first_response(warmup: bool, requests: int) -> dict:
+    """
+    Sobe o uvicorn em um processo novo e mede até o primeiro 200 e as primeiras requisições
+    """
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    env = {**os.environ, "WARMUP_ON_STARTUP": str(warmup)}
+
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--log-level", "warning"],
+        cwd=ROOT, env=env
+    )
+    try:
+        with httpx.Client(base_url=base_url) as client:
+            while True:
+                if server.poll() is not None:
+                    raise RuntimeError("O servidor encerrou antes de responder")
+                try:
+                    if client.get("/health").status_code == 200:
+                        break
+                except httpx.TransportError:
+                    time.sleep(0.005)
+            ready = time.perf_counter() - start
+
+            token_ms, validate_ms = [], []
+            for i in range(requests):
+                request_start = time.perf_counter()
+                response = client.post("/auth/token", json={
+                    "api_key": config.API_KEY, "user_id": f"startup_{i}", "permissions": ["read"]
+                })
+                token_ms.append((time.perf_counter() - request_start) * 1000)
+                response.raise_for_status()
+
+                request_start = time.perf_counter()
+                client.post("/auth/validate", json={"token": response.json()["access_token"]}).raise_for_status()
+                validate_ms.append((time.perf_counter() - request_start) * 1000)
+    finally:
+        server.terminate()
+        server.wait()
+
+    return {
+        "warmup": warmup,
+        "ready_ms": round(ready * 1000, 3),
+        "first_token_ms": round(token_ms[0], 3),
+        "steady_token_ms": round(statistics.median(token_ms[1:]), 3),
+        "first_validate_ms": round(validate_ms[0], 3),
+        "steady_validate_ms": round(statistics.median(validate_ms[1:]), 3)
+    }
+
+def median_runs(results: list) -> dict:
+    """Mediana de cada medida entre as execuções"""
+    merged = {"warmup": results[0]["warmup"]}
+    for key in results[0]:
+        if key != "warmup":
+            merged[key] = round(statistics.median(result[key] for result in results), 3)
+    return merged
+
+def print_imports(imports: dict, top: int):
+    print(f"\n📦 import app.main: {imports['import_app_main_ms']:.1f} ms (mediana)")
+    print(f"\n{'pacote':<28} {'self ms':>10}")
+    for package, self_ms in list(imports["packages_self_ms"].items())[:top]:
+        print(f"{package:<28} {self_ms:>10.1f}")
+
+    print(f"\n{'módulo':<44} {'self ms':>10} {'cumul. ms':>10}")
+    by_self = sorted(imports["modules"].items(), key=lambda item: -item[1]["self_ms"])
+    for name, module in by_self[:top]:
+        print(f"{name:<44} {module['self_ms']:>10.1f} {module['cumulative_ms']:>10.1f}")
+
+    print(f"\n{'módulos do app':<44} {'self ms':>10} {'cumul. ms':>10}")
+    for name, module in sorted(imports["modules"].items()):
+        if name.split(".")[0] == "app":
+            print(f"{name:<44} {module['self_ms']:>10.1f} {module['cumulative_ms']:>10.1f}")
+
+def print_first_response(result: dict, baseline: dict = None):
+    line = (
+        f"{'on' if result['warmup'] else 'off':<7} {result['ready_ms']:>10.1f} "
+        f"{result['first_token_ms']:>11.2f} {result['steady_token_ms']:>11.2f} "
+        f"{result['first_validate_ms']:>11.2f} {result['steady_validate_ms']:>11.2f}"
+    )
+    if baseline is not None:
+        line += f"  {result['ready_ms'] - baseline['ready_ms']:+.1f} ms até a 1ª resposta vs baseline"
+    print(line)
+
+def print_first_response_header():
+    print(
+        f"{'warmup':<7} {'pronto ms':>10} {'1º token':>11} {'token':>11} "
+        f"{'1º validate':>11} {'validate':>11}"
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description="Perfil de inicialização (cold start) da API")
+    parser.add_argument("--runs", type=int, default=5, help="Processos novos por medida (mediana)")
+    parser.add_argument("--requests", type=int, default=20, help="Emissões/validações após o primeiro 200")
+    parser.add_argument("--warmup", default="on,off", help="Modos de WARMUP_ON_STARTUP medidos: on,off")
+    parser.add_argument("--top", type=int, default=15, help="Pacotes e módulos listados")
+    parser.add_argument("--output", default="startup_profile.json", help="Arquivo JSON de resultados")
+    parser.add_argument("--baseline", help="JSON de uma execução anterior para comparação")
+    args = parser.parse_args()
+    if args.requests < 2:
+        parser.error("--requests deve ser pelo menos 2 (a primeira requisição é comparada com as seguintes)")
+    modes = [mode.strip() == "on" for mode in args.warmup.split(",") if mode.strip()]
+
+    print(f"🥶 Perfil de inicialização ({args.runs} processos por medida, engine {config.JWT_ENGINE}, "
+          f"{config.ALGORITHM})")
+    print("=" * 80)
+    imports = profile_imports(args.runs)
+    print_imports(imports, args.top)
+
+    print("\n⏱️  Tempo até a primeira resposta (uvicorn, 1 worker)")
+    print_first_response_header()
+    first_responses = []
+    for warmup in modes:
+        result = median_runs([first_response(warmup, args.requests) for _ in range(args.runs)])
+        first_responses.append(result)
+        print_first_response(result)
+
+    report = {
+        "meta": {
+            "timestamp": datetime.utcnow().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "jwt_engine": config.JWT_ENGINE,
+            "algorithm": config.ALGORITHM,
+            "args": {key: value for key, value in vars(args).items() if key not in ("output", "baseline")}
+        },
+        "imports": imports,
+        "first_response": first_responses
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n💾 Resultados gravados em {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        change = imports["import_app_main_ms"] - baseline["imports"]["import_app_main_ms"]
+        print(f"\n📊 Comparação com {args.baseline}")
+        print(f"import app.main: {change:+.1f} ms")
+        previous = {result["warmup"]: result for result in baseline["first_response"]}
+        print_first_response_header()
+        for result in first_responses:
+            print_first_response(result, previous.get(result["warmup"]))
+
+if __name__ == "__main__":
+    main()
@@ -4,26 +4,236 @@ Exemplo de cliente para a API de Autenticação
 Demonstra como integrar com a API em uma aplicação real
 """
 
+import asyncio
 import requests
+import base64
 import json
+import re
+import threading
+import time
+import httpx
+from collections import OrderedDict
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
+from jose import jwk as jose_jwk, jws
+from jose.exceptions import JOSEError
+
+def b64url_decode(data: str) -> bytes:
+    """Decodifica base64url sem padding"""
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+def cache_max_age(headers, default: float) -> float:
+    """Lê o max-age do Cache-Control (ou usa o padrão)"""
+    match = re.search(r"max-age=(\d+)", headers.get("cache-control", ""))
+    return float(match.group(1)) if match else default
+
+class LocalVerificationUnavailable(Exception):
+    """O token não pode ser verificado localmente (ex: HS256 sem chave pública)"""
+
+class LocalTokenVerifier:
+    """
+    Verificação local de tokens com as chaves públicas do servidor (JWKS)
+
+    Não faz I/O: os clientes buscam /.well-known/jwks.json (e o registro de
+    permissões, para tokens compactos) e entregam aqui. As chaves valem pelo
+    max-age informado pelo servidor; um `kid` desconhecido pede uma nova busca,
+    no máximo uma vez a cada `refetch_interval` segundos. Resultados ficam em um
+    cache pequeno até o `exp` do token. Revogações não são vistas localmente:
+    para chamadas sensíveis a revogação use a validação remota.
+    """
+    
+    def __init__(self, jwks_ttl: float = 3600, refetch_interval: float = 30, cache_size: int = 1024, leeway: int = 0):
+        self.jwks_ttl = jwks_ttl
+        self.refetch_interval = refetch_interval
+        self.cache_size = cache_size
+        self.leeway = leeway
+        self._keys: Dict[str, Tuple[str, Any]] = {}
+        self._keys_expire_at = 0.0
+        self._last_fetch = 0.0
+        self._permission_versions: Dict[int, list] = {}
+        self._results: "OrderedDict[str, Tuple[Dict[str, Any], float]]" = OrderedDict()
+    
+    def load_jwks(self, jwks: Dict[str, Any], max_age: float = None):
+        """Carrega o JWK Set publicado pelo servidor"""
+        keys = {}
+        for key_data in jwks.get("keys", []):
+            alg = key_data.get("alg")
+            if alg == "EdDSA":
+                # A curva (Ed25519 ou Ed448) vem do "crv"; curvas desconhecidas ficam com o servidor
+                key_class = self.okp_key_class(key_data.get("crv"))
+                if key_class is not None:
+                    keys[key_data["kid"]] = (alg, key_class.from_public_bytes(b64url_decode(key_data["x"])))
+            elif alg:
+                # Objeto de chave pré-construído: o parse não se repete a cada verificação
+                keys[key_data["kid"]] = (alg, jose_jwk.construct(key_data, alg))
+        self._keys = keys
+        self._last_fetch = time.monotonic()
+        self._keys_expire_at = self._last_fetch + (self.jwks_ttl if max_age is None else max_age)
+    
+    @staticmethod
+    def okp_key_class(crv: Optional[str]):
+        """Classe de chave pública do cryptography para a curva de uma chave OKP (ou None)"""
+        if crv == "Ed25519":
+            from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PublicKey
+            return Ed25519PublicKey
+        if crv == "Ed448":
+            from cryptography.hazmat.primitives.asymmetric.ed448 import Ed448PublicKey
+            return Ed448PublicKey
+        return None
+    
+    def load_permissions(self, registry: Dict[str, Any]):
+        """Carrega o registro de permissões (/.well-known/permissions.json)"""
+        self._permission_versions = {
+            entry["version"]: entry["permissions"] for entry in registry.get("versions", [])
+        }
+    
+    def needs_jwks(self, token: str = None) -> bool:
+        """Indica se as chaves devem ser (re)buscadas antes de verificar o token"""
+        now = time.monotonic()
+        if now >= self._keys_expire_at:
+            return True
+        if token is not None and now - self._last_fetch >= self.refetch_interval:
+            try:
+                return self.token_kid(token) not in self._keys
+            except LocalVerificationUnavailable:
+                return False
+        return False
+    
+    def needs_permissions(self, claims: Dict[str, Any]) -> bool:
+        """Indica se o token compacto usa uma versão do registro ainda não carregada"""
+        return "pv" in claims and claims["pv"] not in self._permission_versions
+    
+    @staticmethod
+    def token_kid(token: str) -> Optional[str]:
+        try:
+            header = json.loads(b64url_decode(token.split(".", 1)[0]))
+        except (ValueError, IndexError):
+            raise LocalVerificationUnavailable("Header do token inválido")
+        return header.get("kid")
+    
+    def verify_signature(self, token: str) -> Dict[str, Any]:
+        """
+        Confere a assinatura e retorna as claims (sem validar expiração)
+
+        Raises:
+            LocalVerificationUnavailable: chave desconhecida ou algoritmo simétrico
+            ValueError: assinatura inválida ou token malformado
+        """
+        kid = self.token_kid(token)
+        if kid not in self._keys:
+            raise LocalVerificationUnavailable(f"Chave '{kid}' não publicada no JWKS")
+        
+        alg, key = self._keys[kid]
+        try:
+            header_segment, payload_segment, signature_segment = token.split(".")
+            header = json.loads(b64url_decode(header_segment))
+        except ValueError:
+            raise ValueError("Token malformado")
+        # O algoritmo vem da chave publicada, nunca do header (evita troca de algoritmo)
+        if header.get("alg") != alg:
+            raise ValueError("Algoritmo do token não corresponde à chave")
+        
+        if alg == "EdDSA":
+            from cryptography.exceptions import InvalidSignature
+            try:
+                key.verify(b64url_decode(signature_segment), f"{header_segment}.{payload_segment}".encode())
+            except InvalidSignature:
+                raise ValueError("Assinatura inválida")
+            payload = b64url_decode(payload_segment)
+        else:
+            try:
+                payload = jws.verify(token, key, algorithms=[alg])
+            except JOSEError:
+                raise ValueError("Assinatura inválida")
+        return json.loads(payload)
+    
+    def expand_claims(self, claims: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Expande tokens compactos (máscara de permissões) para as claims completas
+
+        Raises:
+            LocalVerificationUnavailable: versão do registro desconhecida ou bit fora dela
+                (o token é validado no servidor, em vez de seguir sem permissões)
+        """
+        if "pv" not in claims:
+            return claims
+        names = self._permission_versions.get(claims["pv"])
+        mask = claims.get("pm", 0)
+        if names is None and (mask or claims["pv"]):
+            raise LocalVerificationUnavailable(f"Versão {claims['pv']} do registro de permissões desconhecida")
+        names = names or []
+        if mask >> len(names):
+            raise LocalVerificationUnavailable(f"Máscara de permissões fora da versão {claims['pv']} do registro")
+        permissions = [name for bit, name in enumerate(names) if mask >> bit & 1]
+        return {
+            **claims,
+            "user_id": claims.get("sub"),
+            "type": "access_token" if claims.get("typ") == "at" else claims.get("typ"),
+            "permissions": permissions + list(claims.get("px", []))
+        }
+    
+    def cached(self, token: str) -> Optional[Dict[str, Any]]:
+        """Resultado em cache, se o token ainda não expirou"""
+        entry = self._results.get(token)
+        if entry is None:
+            return None
+        result, expires_at = entry
+        if time.time() >= expires_at:
+            del self._results[token]
+            return None
+        self._results.move_to_end(token)
+        return result
+    
+    def validate(self, claims: Dict[str, Any], token: str = None) -> Dict[str, Any]:
+        """
+        Valida exp/nbf das claims já verificadas e monta a resposta no formato de /auth/validate
+
+        Raises:
+            LocalVerificationUnavailable: token compacto com versão de permissões desconhecida
+        """
+        now = time.time()
+        exp = claims.get("exp")
+        if exp is not None and now > exp + self.leeway:
+            return self.invalid("Token expirado")
+        if claims.get("nbf") is not None and now < claims["nbf"] - self.leeway:
+            return self.invalid()
+        
+        claims = self.expand_claims(claims)
+        result = {
+            "valid": True,
+            "user_id": claims.get("user_id"),
+            "permissions": claims.get("permissions", []),
+            "expires_at": datetime.utcfromtimestamp(exp).isoformat() if exp is not None else None,
+            "message": "Token válido"
+        }
+        if token is not None and exp is not None:
+            self._results[token] = (result, exp + self.leeway)
+            if len(self._results) > self.cache_size:
+                self._results.popitem(last=False)
+        return result
+    
+    @staticmethod
+    def invalid(message: str = "Token inválido ou expirado") -> Dict[str, Any]:
+        return {"valid": False, "user_id": None, "permissions": [], "expires_at": None, "message": message}
 
 class AuthClient:
     """Cliente para a API de Autenticação"""
     
-    def __init__(self, base_url: str, api_key: str):
+    def __init__(self, base_url: str, api_key: str, local_verification: bool = False):
         """
         Inicializa o cliente
         
         Args:
             base_url: URL base da API (ex: https://sua-api.com)
             api_key: Chave da API para gerar tokens
+            local_verification: Valida tokens localmente com as chaves do JWKS
         """
         self.base_url = base_url.rstrip('/')
         self.api_key = api_key
         self.current_token = None
         self.token_expires_at = None
+        self.local_verification = local_verification
+        self.local_verifier = LocalTokenVerifier()
     
     def generate_token(self, user_id: str, permissions: list = None) -> Dict[str, Any]:
         """
@@ -56,12 +266,14 @@ class AuthClient:
         
         return token_data
     
-    def validate_token(self, token: str = None) -> Dict[str, Any]:
+    def validate_token(self, token: str = None, remote: bool = None) -> Dict[str, Any]:
         """
         Valida um token JWT
         
         Args:
             token: Token a ser validado (usa o token atual se não especificado)
+            remote: True força a validação no servidor (vê revogações); o padrão
+                segue `local_verification`
             
         Returns:
             Resultado da validação
@@ -72,12 +284,42 @@ class AuthClient:
         if not token_to_validate:
             raise ValueError("Nenhum token disponível para validação")
         
+        local = self.local_verification if remote is None else not remote
+        if local:
+            try:
+                return self._validate_locally(token_to_validate)
+            except LocalVerificationUnavailable:
+                pass  # ex: tokens HS256, sem chave pública: valida no servidor
+        
         payload = {"token": token_to_validate}
         response = requests.post(url, json=payload)
         response.raise_for_status()
         
         return response.json()
     
+    def _validate_locally(self, token: str) -> Dict[str, Any]:
+        verifier = self.local_verifier
+        result = verifier.cached(token)
+        if result is not None:
+            return result
+        
+        if verifier.needs_jwks(token):
+            response = requests.get(f"{self.base_url}/.well-known/jwks.json")
+            response.raise_for_status()
+            verifier.load_jwks(response.json(), cache_max_age(response.headers, verifier.jwks_ttl))
+        
+        try:
+            claims = verifier.verify_signature(token)
+        except ValueError:
+            return verifier.invalid()
+        
+        if verifier.needs_permissions(claims):
+            response = requests.get(f"{self.base_url}/.well-known/permissions.json")
+            response.raise_for_status()
+            verifier.load_permissions(response.json())
+        
+        return verifier.validate(claims, token)
+    
     def get_current_user(self, token: str = None) -> Dict[str, Any]:
         """
         Obtém informações do usuário atual
@@ -141,6 +383,291 @@ class AuthClient:
         response.raise_for_status()
         return response.json()
 
+class AsyncAuthClient:
+    """
+    Cliente assíncrono para a API de Autenticação
+
+    Mantém um pool de conexões keep-alive (httpx.AsyncClient) e renova o token
+    antes de `token_expires_at`: chamadas concorrentes que encontram o token
+    perto de expirar aguardam uma única renovação em andamento, em vez de
+    dispararem várias requisições para /auth/token.
+    """
+    
+    def __init__(
+        self,
+        base_url: str,
+        api_key: str,
+        user_id: str = None,
+        permissions: list = None,
+        refresh_margin: float = 60,
+        max_connections: int = 100,
+        timeout: float = 10,
+        local_verification: bool = False,
+        **client_kwargs
+    ):
+        """
+        Inicializa o cliente
+        
+        Args:
+            base_url: URL base da API (ex: https://sua-api.com)
+            api_key: Chave da API para gerar tokens
+            user_id: ID do usuário dos tokens renovados automaticamente
+            permissions: Permissões dos tokens renovados automaticamente
+            refresh_margin: Segundos antes da expiração em que o token é renovado
+            max_connections: Tamanho máximo do pool de conexões
+            timeout: Timeout das requisições em segundos
+            local_verification: Valida tokens localmente com as chaves do JWKS
+            client_kwargs: Argumentos extras para o httpx.AsyncClient (ex: transport)
+        """
+        self.base_url = base_url.rstrip('/')
+        self.api_key = api_key
+        self.user_id = user_id
+        self.permissions = permissions or []
+        self.refresh_margin = refresh_margin
+        self.current_token = None
+        self.token_expires_at = None
+        self.refresh_token = None
+        self._refresh_at = 0.0
+        self._expires_at = 0.0
+        self._refresh_task: Optional[asyncio.Future] = None
+        self.local_verification = local_verification
+        self.local_verifier = LocalTokenVerifier()
+        self._fetch_lock: Optional[asyncio.Lock] = None
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            **client_kwargs
+        )
+    
+    async def __aenter__(self) -> "AsyncAuthClient":
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+    
+    async def aclose(self):
+        """Fecha as conexões do pool"""
+        await self._client.aclose()
+    
+    def _store_token(self, token_data: Dict[str, Any]):
+        # Prazos em relógio monotônico, imunes a diferenças de horário com o servidor
+        now = time.monotonic()
+        expires_in = token_data["expires_in"]
+        self.current_token = token_data["access_token"]
+        self.token_expires_at = datetime.fromisoformat(token_data["expires_at"].replace('Z', '+00:00'))
+        self.refresh_token = token_data.get("refresh_token") or self.refresh_token
+        self._expires_at = now + expires_in
+        self._refresh_at = now + max(expires_in - self.refresh_margin, expires_in / 2)
+    
+    async def generate_token(self, user_id: str = None, permissions: list = None) -> Dict[str, Any]:
+        """
+        Gera um novo token JWT (com refresh token, usado nas renovações)
+        
+        Args:
+            user_id: ID do usuário (padrão: o informado no construtor)
+            permissions: Lista de permissões (padrão: as informadas no construtor)
+            
+        Returns:
+            Dados do token gerado
+        """
+        if user_id is not None:
+            self.user_id = user_id
+        if permissions is not None:
+            self.permissions = permissions
+        
+        response = await self._client.post("/auth/token", json={
+            "api_key": self.api_key,
+            "user_id": self.user_id,
+            "permissions": self.permissions,
+            "include_refresh_token": True
+        })
+        response.raise_for_status()
+        
+        token_data = response.json()
+        self._store_token(token_data)
+        return token_data
+    
+    async def _renew(self) -> str:
+        try:
+            if self.refresh_token:
+                response = await self._client.post("/auth/refresh", json={"refresh_token": self.refresh_token})
+                if response.status_code == 200:
+                    self._store_token(response.json())
+                    return self.current_token
+                # Refresh token expirado ou já usado: volta para a API key
+                self.refresh_token = None
+            await self.generate_token()
+        except httpx.HTTPError:
+            # Falha na renovação antecipada: o token atual segue em uso até expirar
+            if self.current_token and time.monotonic() < self._expires_at:
+                return self.current_token
+            raise
+        return self.current_token
+    
+    async def get_token(self, force_refresh: bool = False) -> str:
+        """
+        Retorna um token válido, renovando-o antes da expiração
+
+        Chamadas concorrentes compartilham a mesma renovação em andamento.
+        """
+        if not force_refresh and self.current_token and time.monotonic() < self._refresh_at:
+            return self.current_token
+        
+        if self._refresh_task is None:
+            self._refresh_task = asyncio.ensure_future(self._renew())
+            self._refresh_task.add_done_callback(self._clear_refresh_task)
+        # shield: o cancelamento de um chamador não cancela a renovação dos demais
+        return await asyncio.shield(self._refresh_task)
+    
+    def _clear_refresh_task(self, task: asyncio.Future):
+        if self._refresh_task is task:
+            self._refresh_task = None
+    
+    async def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """
+        Requisição autenticada pelo pool; em caso de 401 renova o token e tenta uma vez mais
+        """
+        token = await self.get_token()
+        headers = {**kwargs.pop("headers", {}), "Authorization": f"Bearer {token}"}
+        response = await self._client.request(method, url, headers=headers, **kwargs)
+        if response.status_code == 401:
+            if self.current_token == token:
+                token = await self.get_token(force_refresh=True)
+            else:
+                token = await self.get_token()
+            headers["Authorization"] = f"Bearer {token}"
+            response = await self._client.request(method, url, headers=headers, **kwargs)
+        return response
+    
+    async def validate_token(self, token: str = None, remote: bool = None) -> Dict[str, Any]:
+        """
+        Valida um token JWT (usa o token atual se não especificado)
+
+        `remote=True` força a validação no servidor (vê revogações); o padrão
+        segue `local_verification`.
+        """
+        token_to_validate = token or await self.get_token()
+        local = self.local_verification if remote is None else not remote
+        if local:
+            try:
+                return await self._validate_locally(token_to_validate)
+            except LocalVerificationUnavailable:
+                pass  # ex: tokens HS256, sem chave pública: valida no servidor
+        
+        response = await self._client.post("/auth/validate", json={"token": token_to_validate})
+        response.raise_for_status()
+        return response.json()
+    
+    async def _fetch(self, path: str, needed) -> Optional[httpx.Response]:
+        # Buscas concorrentes das chaves viram uma só: quem espera o lock reavalia `needed`
+        if self._fetch_lock is None:
+            self._fetch_lock = asyncio.Lock()
+        async with self._fetch_lock:
+            if not needed():
+                return None
+            response = await self._client.get(path)
+            response.raise_for_status()
+            return response
+    
+    async def _validate_locally(self, token: str) -> Dict[str, Any]:
+        verifier = self.local_verifier
+        result = verifier.cached(token)
+        if result is not None:
+            return result
+        
+        if verifier.needs_jwks(token):
+            response = await self._fetch("/.well-known/jwks.json", lambda: verifier.needs_jwks(token))
+            if response is not None:
+                verifier.load_jwks(response.json(), cache_max_age(response.headers, verifier.jwks_ttl))
+        
+        try:
+            claims = verifier.verify_signature(token)
+        except ValueError:
+            return verifier.invalid()
+        
+        if verifier.needs_permissions(claims):
+            response = await self._fetch("/.well-known/permissions.json", lambda: verifier.needs_permissions(claims))
+            if response is not None:
+                verifier.load_permissions(response.json())
+        
+        return verifier.validate(claims, token)
+    
+    async def get_current_user(self) -> Dict[str, Any]:
+        """
+        Obtém informações do usuário do token atual
+        """
+        response = await self.request("GET", "/auth/me")
+        response.raise_for_status()
+        return response.json()
+    
+    async def health_check(self) -> Dict[str, Any]:
+        """
+        Verifica se a API está funcionando
+        """
+        response = await self._client.get("/health")
+        response.raise_for_status()
+        return response.json()
+
+class SyncAuthClient:
+    """
+    Wrapper síncrono do AsyncAuthClient para código existente
+
+    As chamadas rodam em um event loop dedicado em segundo plano, então threads
+    diferentes compartilham o mesmo pool de conexões e a mesma renovação do token.
+    """
+    
+    def __init__(self, base_url: str, api_key: str, **kwargs):
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="auth-client-loop", daemon=True)
+        self._thread.start()
+        self._client = self._run(self._create(base_url, api_key, kwargs))
+    
+    async def _create(self, base_url: str, api_key: str, kwargs: Dict[str, Any]) -> AsyncAuthClient:
+        return AsyncAuthClient(base_url, api_key, **kwargs)
+    
+    def _run(self, coroutine):
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+    
+    def __enter__(self) -> "SyncAuthClient":
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    @property
+    def current_token(self) -> Optional[str]:
+        return self._client.current_token
+    
+    @property
+    def token_expires_at(self) -> Optional[datetime]:
+        return self._client.token_expires_at
+    
+    def generate_token(self, user_id: str = None, permissions: list = None) -> Dict[str, Any]:
+        return self._run(self._client.generate_token(user_id, permissions))
+    
+    def get_token(self, force_refresh: bool = False) -> str:
+        return self._run(self._client.get_token(force_refresh))
+    
+    def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        return self._run(self._client.request(method, url, **kwargs))
+    
+    def validate_token(self, token: str = None, remote: bool = None) -> Dict[str, Any]:
+        return self._run(self._client.validate_token(token, remote))
+    
+    def get_current_user(self) -> Dict[str, Any]:
+        return self._run(self._client.get_current_user())
+    
+    def health_check(self) -> Dict[str, Any]:
+        return self._run(self._client.health_check())
+    
+    def close(self):
+        """Fecha o pool de conexões e encerra o event loop"""
+        self._run(self._client.aclose())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
 def demo_client():
     """Demonstra o uso do cliente"""
     print("🚀 Demonstração do Cliente de Autenticação")
@@ -217,6 +744,26 @@ def demo_client():
     except Exception as e:
         print(f"❌ Erro inesperado: {e}")
 
+async def demo_async_client():
+    """Demonstra o cliente assíncrono com renovação compartilhada do token"""
+    print("\n⚡ Demonstração do Cliente Assíncrono")
+    print("=" * 50)
+    
+    async with AsyncAuthClient(
+        base_url="http://localhost:8000",
+        api_key="api-key-super-secreta-123456789",
+        user_id="cliente_async_123",
+        permissions=["read", "write"]
+    ) as client:
+        try:
+            # 20 chamadas concorrentes disparam uma única emissão de token
+            users = await asyncio.gather(*(client.get_current_user() for _ in range(20)))
+            print(f"   {len(users)} requisições autenticadas para: {users[0]['user_id']}")
+            print(f"   Token expira em: {client.token_expires_at}")
+            print("✅ Demonstração assíncrona concluída!")
+        except httpx.HTTPError as e:
+            print(f"❌ Erro: {e}")
+
 class ExampleApplication:
     """Exemplo de como integrar o cliente em uma aplicação"""
     
@@ -257,6 +804,9 @@ if __name__ == "__main__":
     # Executar demonstração do cliente
     demo_client()
     
+    # Executar demonstração do cliente assíncrono
+    asyncio.run(demo_async_client())
+    
     # Executar exemplo de aplicação
     try:
         app = ExampleApplication()
@@ -0,0 +1,78 @@
+"""
+Configuração do gunicorn para produção: vários workers uvicorn na mesma porta
+
+Uso:
+    gunicorn -c gunicorn.conf.py app.main:app
+
+Reinício gracioso (recarrega o código sem derrubar conexões):
+    kill -HUP <pid do gunicorn>
+"""
+
+import math
+
+from decouple import config as env
+
+bind = f"0.0.0.0:{env('PORT', default=8000, cast=int)}"
+
+# Sem cota de CPU no cgroup (VM, máquina local) o padrão é pequeno e fixo
+DEFAULT_WORKERS = 2
+
+def cgroup_cpu_limit():
+    """
+    Número de CPUs da cota do cgroup (v2: cpu.max, v1: cfs_quota/cfs_period), arredondado para cima
+
+    O cpu_count() do processo enxerga todos os núcleos do host, mesmo num container
+    limitado a 1 ou 2 CPUs. Retorna None sem cota definida.
+    """
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()[:2]
+    except (OSError, ValueError):
+        try:
+            with open("/sys/fs/cgroup/cpu/cpu.cfs_quota_us") as f:
+                quota = f.read().strip()
+            with open("/sys/fs/cgroup/cpu/cpu.cfs_period_us") as f:
+                period = f.read().strip()
+        except OSError:
+            return None
+    if quota in ("max", "-1"):
+        return None
+    try:
+        return max(1, math.ceil(int(quota) / int(period)))
+    except (ValueError, ZeroDivisionError):
+        return None
+
+# Um worker por CPU da cota (assinatura/verificação JWT é CPU-bound); WEB_CONCURRENCY sobrescreve
+workers = env("WEB_CONCURRENCY", default=cgroup_cpu_limit() or DEFAULT_WORKERS, cast=int)
+worker_class = "uvicorn.workers.UvicornWorker"
+
+# No HUP (ou ao reciclar um worker), requisições em andamento têm este prazo para terminar
+graceful_timeout = env("GRACEFUL_TIMEOUT", default=30, cast=int)
+timeout = env("WORKER_TIMEOUT", default=60, cast=int)
+keepalive = env("KEEPALIVE", default=5, cast=int)
+
+# Recicla workers periodicamente (0 = nunca); o jitter evita que todos reiniciem juntos
+max_requests = env("MAX_REQUESTS", default=0, cast=int)
+max_requests_jitter = env("MAX_REQUESTS_JITTER", default=0, cast=int)
+
+# Cada worker importa a aplicação: conexões SQLite e threads não podem atravessar o fork
+preload_app = False
+
+accesslog = "-"
+
+def on_starting(server):
+    """
+    Ao iniciar o mestre, descarta o estado compartilhado e as métricas da execução anterior
+
+    No HUP o mestre continua de pé, então cache, buckets e revogações sobrevivem ao reinício.
+    """
+    import glob
+    import os
+
+    from app.shared_state import reset_shared_state
+
+    reset_shared_state(env("SHARED_STATE_DIR", default=""))
+    metrics_dir = env("METRICS_MULTIPROC_DIR", default="")
+    if metrics_dir:
+        for path in glob.glob(os.path.join(metrics_dir, "metrics_*.json")):
+            os.remove(path)
@@ -0,0 +1,16 @@
+#!/bin/bash
+
+# Script para executar a aplicação em modo produção (vários workers)
+
+echo "🚀 Iniciando API de Autenticação em modo produção..."
+
+# Estado compartilhado entre os workers (cache de tokens, rate limit, revogações, métricas)
+export SHARED_STATE_DIR="${SHARED_STATE_DIR:-/dev/shm/auth-api}"
+export METRICS_MULTIPROC_DIR="${METRICS_MULTIPROC_DIR:-$SHARED_STATE_DIR/metrics}"
+export RATE_LIMIT_BACKEND="${RATE_LIMIT_BACKEND:-shared}"
+
+echo "👷 Workers: ${WEB_CONCURRENCY:-cota de CPU do cgroup ou 2}"
+echo "🔁 Reinício gracioso: kill -HUP \$(pgrep -f 'gunicorn: master')"
+echo ""
+
+exec gunicorn -c gunicorn.conf.py app.main:app
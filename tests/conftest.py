@@ -0,0 +1,76 @@
+"""
+Fixtures compartilhadas pelos testes (pytest)
+
+Os testes usam o app em processo (TestClient, sem startup/shutdown) e trocam o
+estado persistente (refresh tokens) por arquivos temporários.
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient
+
+from app import auth, config, dependencies, main
+from app.cache import TTLCache
+from app.main import app
+from app.rate_limit import InMemoryBackend
+from app.token_store import RefreshTokenStore
+
+
+@pytest.fixture
+def client() -> TestClient:
+    # Sem o `with`: o shutdown encerraria o executor compartilhado pelos outros testes
+    return TestClient(app)
+
+
+@pytest.fixture
+def api_key() -> str:
+    return config.API_KEY
+
+
+@pytest.fixture
+def limits(monkeypatch):
+    """
+    Limites por rota do app durante o teste (RATE_LIMITS vazio por padrão)
+    """
+    monkeypatch.setattr(dependencies.rate_limiter, "backend", InMemoryBackend())
+    monkeypatch.setattr(dependencies.rate_limiter, "limits", {})
+    return dependencies.rate_limiter.limits
+
+
+@pytest.fixture
+def refresh_store(tmp_path, monkeypatch) -> RefreshTokenStore:
+    """
+    Store de refresh tokens em um SQLite temporário, usado também pelo app
+    """
+    store = RefreshTokenStore(str(tmp_path / "refresh_tokens.db"), flush_interval=0.01)
+    monkeypatch.setattr(auth, "_refresh_store", store)
+    yield store
+    store.close()
+
+
+@pytest.fixture
+def issue(client, api_key):
+    """
+    Emite um token via /auth/token e retorna o corpo da resposta
+    """
+    def issue_token(**fields) -> dict:
+        response = client.post("/auth/token", json={"api_key": api_key, "user_id": "pytest", **fields})
+        assert response.status_code == 200, response.text
+        return response.json()
+    return issue_token
+
+
+@pytest.fixture
+def token_cache(monkeypatch) -> TTLCache:
+    """
+    Cache de tokens verificados vazio, usado também pelo app
+    """
+    cache = TTLCache(max_size=10)
+    monkeypatch.setattr(auth, "token_cache", cache)
+    monkeypatch.setattr(main, "token_cache", cache)
+    return cache
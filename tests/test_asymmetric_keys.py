@@ -0,0 +1,95 @@
+import time
+
+import pytest
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+from cryptography.hazmat.primitives.serialization import Encoding, NoEncryption, PrivateFormat
+
+from app import main
+from app.jwt_engine import ENGINES, InvalidSignatureError, JoseEngine, build_engine
+from app.keyring import Keyring
+from app.keys import AsymmetricKey, HMACKey, load_signing_key
+
+PRIVATE_KEYS = {
+    "RS256": lambda: rsa.generate_private_key(public_exponent=65537, key_size=2048),
+    "ES256": lambda: ec.generate_private_key(ec.SECP256R1()),
+    "ES384": lambda: ec.generate_private_key(ec.SECP384R1()),
+    "EdDSA": ed25519.Ed25519PrivateKey.generate,
+}
+
+
+def claims() -> dict:
+    now = int(time.time())
+    return {"user_id": "alice", "iat": now, "exp": now + 60}
+
+
+def engines_for(alg: str) -> list:
+    return [name for name in sorted(ENGINES) if alg not in getattr(ENGINES[name], "UNSUPPORTED_ALGORITHMS", ())]
+
+
+@pytest.mark.parametrize("alg", sorted(PRIVATE_KEYS))
+def test_asymmetric_tokens_round_trip_across_engines(alg):
+    keyring = Keyring.single(AsymmetricKey(alg, private_key=PRIVATE_KEYS[alg]()))
+    for signer in engines_for(alg):
+        token = build_engine(signer, keyring).encode(claims())
+        for verifier in engines_for(alg):
+            assert build_engine(verifier, keyring).decode(token)["user_id"] == "alice"
+
+
+@pytest.mark.parametrize("alg", sorted(PRIVATE_KEYS))
+def test_public_key_only_verifies(alg):
+    private_key = PRIVATE_KEYS[alg]()
+    signer = AsymmetricKey(alg, private_key=private_key, kid="k1")
+    verifier = AsymmetricKey(alg, public_key=private_key.public_key(), kid="k1")
+    assert not verifier.can_sign
+    with pytest.raises(ValueError):
+        Keyring.single(verifier)
+
+    # Keyring de quem só verifica: a chave pública fica ao lado de uma chave local de assinatura
+    keyring = Keyring([verifier, HMACKey("segredo", "HS256")], signing_kid="default")
+    token = build_engine("native", Keyring.single(signer)).encode(claims())
+    assert build_engine("native", keyring).decode(token)["user_id"] == "alice"
+
+    forged = build_engine("native", Keyring.single(AsymmetricKey(alg, private_key=PRIVATE_KEYS[alg](), kid="k1")))
+    with pytest.raises(InvalidSignatureError):
+        build_engine("native", keyring).decode(forged.encode(claims()))
+
+
+def test_jwks_publishes_only_public_asymmetric_keys():
+    rsa_key = AsymmetricKey("RS256", private_key=PRIVATE_KEYS["RS256"]())
+    ec_key = AsymmetricKey("ES256", private_key=PRIVATE_KEYS["ES256"]())
+    ed_key = AsymmetricKey("EdDSA", private_key=PRIVATE_KEYS["EdDSA"]())
+    keyring = Keyring([rsa_key, ec_key, ed_key, HMACKey("segredo", "HS256")], signing_kid=rsa_key.kid)
+
+    jwks = {jwk["kid"]: jwk for jwk in keyring.public_jwks()["keys"]}
+    assert set(jwks) == {rsa_key.kid, ec_key.kid, ed_key.kid}
+    assert {jwk["kty"] for jwk in jwks.values()} == {"RSA", "EC", "OKP"}
+    assert all(jwk["use"] == "sig" and "d" not in jwk for jwk in jwks.values())
+    # Sem kid explícito, o kid é o thumbprint RFC 7638 da chave pública
+    assert rsa_key.kid == rsa_key.thumbprint
+
+
+def test_key_type_must_match_the_algorithm(tmp_path):
+    with pytest.raises(ValueError):
+        AsymmetricKey("ES256", private_key=PRIVATE_KEYS["ES384"]())
+    with pytest.raises(ValueError):
+        AsymmetricKey("RS256", private_key=PRIVATE_KEYS["EdDSA"]())
+
+    pem = tmp_path / "ed25519.pem"
+    pem.write_bytes(PRIVATE_KEYS["EdDSA"]().private_bytes(Encoding.PEM, PrivateFormat.PKCS8, NoEncryption()))
+    assert load_signing_key("EdDSA", private_key_path=str(pem)).can_sign
+    with pytest.raises(ValueError):
+        load_signing_key("RS256")
+
+
+def test_jose_engine_refuses_eddsa():
+    with pytest.raises(ValueError):
+        JoseEngine(Keyring.single(AsymmetricKey("EdDSA", private_key=PRIVATE_KEYS["EdDSA"]())))
+
+
+def test_jwks_endpoint_serves_the_engine_keys(client, monkeypatch):
+    ed_key = AsymmetricKey("EdDSA", private_key=PRIVATE_KEYS["EdDSA"]())
+    monkeypatch.setattr(main, "jwt_engine", build_engine("native", Keyring.single(ed_key)))
+
+    response = client.get("/.well-known/jwks.json")
+    assert response.status_code == 200
+    assert response.json()["keys"] == [ed_key.public_jwk()]
@@ -0,0 +1,76 @@
+import asyncio
+
+import httpx
+import pytest
+
+pytest.importorskip("requests")
+
+from app import config
+from app.main import app
+from client_example import AsyncAuthClient
+
+
+class RecordingTransport(httpx.ASGITransport):
+    """
+    Transporte ASGI em processo que registra os caminhos requisitados
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(app=app, **kwargs)
+        self.paths = []
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.paths.append(request.url.path)
+        return await super().handle_async_request(request)
+
+
+def auth_client(transport: httpx.AsyncBaseTransport, **kwargs) -> AsyncAuthClient:
+    return AsyncAuthClient(
+        "http://testserver", config.API_KEY, user_id="pytest", permissions=["read"], transport=transport, **kwargs
+    )
+
+
+def test_concurrent_calls_share_one_token_request():
+    transport = RecordingTransport()
+
+    async def scenario():
+        async with auth_client(transport) as client:
+            return await asyncio.gather(*(client.get_current_user() for _ in range(20)))
+
+    users = asyncio.run(scenario())
+    assert {user["user_id"] for user in users} == {"pytest"}
+    assert transport.paths.count("/auth/token") == 1
+    assert transport.paths.count("/auth/me") == 20
+
+
+def test_renewal_uses_the_refresh_token_once():
+    transport = RecordingTransport()
+
+    async def scenario():
+        async with auth_client(transport) as client:
+            first = await client.get_token()
+            # Dentro da margem de renovação: as chamadas concorrentes aguardam um único refresh
+            client._refresh_at = 0
+            renewed = await asyncio.gather(*(client.get_token() for _ in range(5)))
+            return first, renewed
+
+    first, renewed = asyncio.run(scenario())
+    assert len(set(renewed)) == 1 and renewed[0] != first
+    assert transport.paths == ["/auth/token", "/auth/refresh"]
+
+
+def test_failed_early_renewal_keeps_the_current_token():
+    class FailingRefresh(RecordingTransport):
+        async def handle_async_request(self, request):
+            if request.url.path == "/auth/refresh":
+                raise httpx.ConnectError("indisponível", request=request)
+            return await super().handle_async_request(request)
+
+    async def scenario():
+        async with auth_client(FailingRefresh()) as client:
+            token = await client.get_token()
+            client._refresh_at = 0
+            return token, await client.get_token()
+
+    token, after_failure = asyncio.run(scenario())
+    assert after_failure == token
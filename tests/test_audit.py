@@ -0,0 +1,78 @@
+import json
+
+import pytest
+
+from app import audit, auth
+from app.audit import AuditLog
+from app.jwt_engine import ENGINES, build_engine
+from app.keys import b64url_encode
+
+
+@pytest.fixture
+def audit_events(tmp_path, monkeypatch):
+    """
+    Log de auditoria em um arquivo temporário; retorna uma função que grava a fila e lê os eventos
+    """
+    path = tmp_path / "audit.jsonl"
+    log = AuditLog(str(path), flush_interval=60)
+    log.start()
+    monkeypatch.setattr(audit, "audit_log", log)
+
+    def read() -> list:
+        log.flush()
+        return [json.loads(line) for line in path.read_text().splitlines()]
+
+    yield read
+    log.close()
+
+
+@pytest.fixture(params=sorted(ENGINES))
+def engine(request, monkeypatch):
+    """
+    Engine JWT do app durante o teste: os motivos das recusas são os mesmos nas duas
+    """
+    monkeypatch.setattr(auth, "jwt_engine", build_engine(request.param, auth.keyring))
+
+
+def tampered(token: str) -> str:
+    header, payload, signature = token.split(".")
+    return ".".join([header, payload, ("A" if signature[0] != "A" else "B") + signature[1:]])
+
+
+def not_json(token: str) -> str:
+    """
+    Token assinado com a chave da API, mas com um payload que não é JSON
+    """
+    header = token.split(".")[0]
+    signing_input = f"{header}.{b64url_encode(b'not-json').decode()}".encode()
+    return f"{signing_input.decode()}.{b64url_encode(auth.keyring.signing_key.sign(signing_input)).decode()}"
+
+
+def test_validation_rejections_carry_the_engine_reason(client, api_key, issue, audit_events, engine):
+    token = issue()["access_token"]
+    revoked = issue(permissions=["read"])["access_token"]
+    assert client.post("/auth/revoke", json={"token": revoked, "api_key": api_key}).json()["revoked"]
+
+    for candidate in (token, tampered(token), not_json(token), "a.b", revoked):
+        assert client.post("/auth/validate", json={"token": candidate}).status_code == 200
+    client.post("/auth/introspect", data={"token": tampered(token), "api_key": api_key})
+
+    events = [event for event in audit_events() if event["route"] in ("/auth/validate", "/auth/introspect")]
+    assert [(event["event"], event.get("reason")) for event in events] == [
+        ("validated", None),
+        ("rejected", "bad_signature"),
+        ("rejected", "malformed"),
+        ("rejected", "bad_segments"),
+        ("rejected", "revoked"),
+        ("rejected", "bad_signature")
+    ]
+    assert events[0]["user_id"] == "pytest"
+
+
+def test_issuance_is_audited(issue, audit_events):
+    issue(permissions=["read"])
+
+    event = audit_events()[-1]
+    assert event["event"] == "issued"
+    assert event["route"] == "/auth/token"
+    assert event["permissions"] == ["read"]
@@ -0,0 +1,68 @@
+import base64
+import json
+import time
+
+import pytest
+
+pytest.importorskip("requests")
+
+from cryptography.hazmat.primitives.asymmetric import ed448, ed25519
+from cryptography.hazmat.primitives.serialization import Encoding, PublicFormat
+
+from client_example import LocalTokenVerifier, LocalVerificationUnavailable
+
+
+def b64url(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def signed_token(private_key, claims: dict, kid: str = "k1") -> str:
+    signing_input = ".".join([
+        b64url(json.dumps({"alg": "EdDSA", "typ": "JWT", "kid": kid}).encode()),
+        b64url(json.dumps(claims).encode())
+    ])
+    return f"{signing_input}.{b64url(private_key.sign(signing_input.encode()))}"
+
+
+def jwks_for(private_key, crv: str, kid: str = "k1") -> dict:
+    raw = private_key.public_key().public_bytes(Encoding.Raw, PublicFormat.Raw)
+    return {"keys": [{"kty": "OKP", "crv": crv, "x": b64url(raw), "alg": "EdDSA", "kid": kid, "use": "sig"}]}
+
+
+@pytest.mark.parametrize("crv, key_class", [
+    ("Ed25519", ed25519.Ed25519PrivateKey),
+    ("Ed448", ed448.Ed448PrivateKey),
+])
+def test_eddsa_keys_follow_the_jwk_curve(crv, key_class):
+    private_key = key_class.generate()
+    verifier = LocalTokenVerifier()
+    verifier.load_jwks(jwks_for(private_key, crv))
+
+    claims = {"user_id": "alice", "permissions": ["read"], "exp": time.time() + 60}
+    assert verifier.verify_signature(signed_token(private_key, claims))["user_id"] == "alice"
+
+    other = key_class.generate()
+    with pytest.raises(ValueError):
+        verifier.verify_signature(signed_token(other, claims))
+
+
+def test_unknown_okp_curve_is_left_to_the_server():
+    verifier = LocalTokenVerifier()
+    verifier.load_jwks({"keys": [{"kty": "OKP", "crv": "X25519", "x": "AAAA", "alg": "EdDSA", "kid": "k1"}]})
+    token = signed_token(ed25519.Ed25519PrivateKey.generate(), {"exp": time.time() + 60})
+    with pytest.raises(LocalVerificationUnavailable):
+        verifier.verify_signature(token)
+
+
+def test_compact_token_with_unknown_permission_version_is_not_degraded():
+    verifier = LocalTokenVerifier()
+    verifier.load_permissions({"versions": [{"version": 1, "permissions": ["read", "write"]}]})
+    exp = time.time() + 60
+
+    result = verifier.validate({"sub": "alice", "typ": "at", "pm": 3, "pv": 1, "exp": exp})
+    assert result["permissions"] == ["read", "write"]
+
+    with pytest.raises(LocalVerificationUnavailable):
+        verifier.validate({"sub": "alice", "typ": "at", "pm": 1, "pv": 2, "exp": exp})
+    with pytest.raises(LocalVerificationUnavailable):
+        verifier.validate({"sub": "alice", "typ": "at", "pm": 4, "pv": 1, "exp": exp})
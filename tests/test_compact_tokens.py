@@ -0,0 +1,80 @@
+import json
+
+import pytest
+from jose import jwt
+
+from app import auth, config, main
+from app.permissions import PermissionRegistry, UnknownPermissionVersionError, parse_permission_registry
+
+VERSIONS = {1: ("read", "write"), 2: ("read", "write", "admin")}
+
+
+@pytest.fixture
+def compact(monkeypatch):
+    """
+    Emissão no formato compacto com o registro de VERSIONS
+    """
+    registry = PermissionRegistry(VERSIONS)
+    monkeypatch.setattr(config, "COMPACT_TOKENS", True)
+    monkeypatch.setattr(auth, "permission_registry", registry)
+    monkeypatch.setattr(main, "permission_registry", registry)
+    return registry
+
+
+def test_claims_round_trip_through_the_bitmask():
+    registry = PermissionRegistry(VERSIONS)
+    data = {"user_id": "alice", "permissions": ["admin", "read", "billing"], "type": "access_token", "tenant": "acme"}
+
+    compact = registry.compact_claims(data)
+    assert compact == {"sub": "alice", "pm": 0b101, "pv": 2, "px": ["billing"], "typ": "at", "tn": "acme"}
+    assert registry.expand_claims(compact) == {
+        "user_id": "alice", "permissions": ["read", "admin", "billing"], "type": "access_token", "tenant": "acme"
+    }
+    # Tokens no formato completo não são alterados
+    assert registry.expand_claims(data) is data
+
+
+def test_old_versions_keep_expanding():
+    registry = PermissionRegistry(VERSIONS)
+    assert registry.decode(0b11, version=1) == ["read", "write"]
+    with pytest.raises(UnknownPermissionVersionError):
+        registry.decode(0b1, version=3)
+    with pytest.raises(UnknownPermissionVersionError):
+        registry.decode(0b100, version=1)
+
+
+def test_registry_file_is_validated(tmp_path):
+    with pytest.raises(ValueError):
+        parse_permission_registry({"versions": [{"version": 1, "permissions": ["read", "read"]}]})
+    with pytest.raises(ValueError):
+        parse_permission_registry({"versions": [{"version": 1, "permissions": []}] * 2})
+
+    path = tmp_path / "permissions.json"
+    path.write_text(json.dumps({"versions": [{"version": v, "permissions": list(p)} for v, p in VERSIONS.items()]}))
+    registry = PermissionRegistry.from_file(str(path))
+    assert registry.current_version == 2
+    assert registry.to_json()["versions"][0] == {"version": 1, "permissions": ["read", "write"]}
+    assert PermissionRegistry.from_file("").current_version == 0
+
+
+def test_compact_tokens_validate_with_full_claims(client, issue, compact):
+    token = issue(permissions=["write", "billing"])["access_token"]
+
+    claims = jwt.get_unverified_claims(token)
+    assert "permissions" not in claims and "user_id" not in claims
+    assert (claims["sub"], claims["pm"], claims["pv"], claims["px"]) == ("pytest", 0b10, 2, ["billing"])
+
+    response = client.post("/auth/validate", json={"token": token}).json()
+    assert response["valid"]
+    assert response["user_id"] == "pytest"
+    assert response["permissions"] == ["write", "billing"]
+
+    assert client.get("/.well-known/permissions.json").json() == compact.to_json()
+
+
+def test_non_string_permissions_travel_as_extras(client, issue, compact):
+    token = issue(permissions=["read", {"a": 1}, 1, {"a": 1}])["access_token"]
+
+    claims = jwt.get_unverified_claims(token)
+    assert (claims["pm"], claims["px"]) == (0b1, [{"a": 1}, 1])
+    assert client.post("/auth/validate", json={"token": token}).json()["permissions"] == ["read", {"a": 1}, 1]
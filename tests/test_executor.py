@@ -0,0 +1,86 @@
+import asyncio
+import threading
+
+import pytest
+from cryptography.hazmat.primitives.asymmetric import ed25519
+from fastapi import HTTPException
+
+from app import auth, config
+from app.executor import CryptoExecutor
+from app.keyring import Keyring
+from app.keys import AsymmetricKey, HMACKey
+
+
+@pytest.fixture
+def saturated():
+    """
+    Executor com a única vaga ocupada por um job bloqueado em uma thread
+    """
+    executor = CryptoExecutor(threads=1, max_pending=1, min_offload=8)
+    release = threading.Event()
+
+    async def occupy():
+        job = asyncio.ensure_future(executor.run(release.wait, size=8))
+        while executor.pending == 0:
+            await asyncio.sleep(0)
+        return job
+
+    yield executor, occupy, release
+    release.set()
+    executor.shutdown()
+
+
+def test_inline_jobs_are_admitted(saturated):
+    executor, occupy, release = saturated
+
+    async def scenario():
+        job = await occupy()
+        # Um único token roda no event loop, mas também passa pelo controle de admissão
+        assert not executor.offloads(1)
+        with pytest.raises(HTTPException) as excinfo:
+            await executor.run(len, "token")
+        with pytest.raises(HTTPException):
+            await executor.sign(lambda claims: "token", [{"sub": "alice"}])
+        release.set()
+        await job
+        return excinfo.value
+
+    error = asyncio.run(scenario())
+    assert error.status_code == 503
+    assert error.headers["Retry-After"] == "1"
+    assert executor.rejected == 2
+    assert asyncio.run(executor.run(len, "token")) == 5
+
+
+def test_overloaded_executor_sheds_single_token_endpoints(client, api_key, issue, saturated, monkeypatch):
+    token = issue()["access_token"]
+    executor, occupy, release = saturated
+    monkeypatch.setattr(auth, "crypto_executor", executor)
+    # Sem o cache de tokens válidos, que dispensaria a verificação
+    monkeypatch.setattr(auth, "token_cache", auth.TTLCache(max_size=0))
+
+    loop = asyncio.new_event_loop()
+    loop.run_until_complete(occupy())
+    try:
+        responses = [
+            client.post("/auth/token", json={"api_key": api_key, "user_id": "pytest"}),
+            client.post("/auth/validate", json={"token": token}),
+            client.get("/auth/me", headers={"Authorization": f"Bearer {token}"})
+        ]
+    finally:
+        release.set()
+        loop.run_until_complete(asyncio.sleep(0.05))
+        loop.close()
+
+    for response in responses:
+        assert response.status_code == 503, response.text
+        assert response.headers["Retry-After"] == "1"
+
+
+def test_asymmetric_keys_offload_every_job():
+    hmac_keyring = Keyring([HMACKey("segredo", "HS256")], "default")
+    assert auth.offload_min_tokens(hmac_keyring) == config.EXECUTOR_OFFLOAD_MIN_TOKENS
+
+    ed_key = AsymmetricKey("EdDSA", private_key=ed25519.Ed25519PrivateKey.generate(), kid="ed")
+    mixed_keyring = Keyring([HMACKey("segredo", "HS256"), ed_key], "ed")
+    assert auth.offload_min_tokens(mixed_keyring) == 1
@@ -0,0 +1,57 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from app import config, main
+from app.models import TokenResponse
+from app.responses import ResponseShape, json_datetime
+
+
+@pytest.fixture
+def fast_responses(monkeypatch):
+    """
+    Liga ou desliga FAST_RESPONSES no app, inclusive nos formatos já criados em app.main
+    """
+    def set_enabled(enabled: bool) -> None:
+        monkeypatch.setattr(config, "FAST_RESPONSES", enabled)
+        for shape in vars(main).values():
+            if isinstance(shape, ResponseShape):
+                monkeypatch.setattr(shape, "enabled", enabled)
+    return set_enabled
+
+
+def test_shape_follows_the_model_fields():
+    shape = ResponseShape(TokenResponse, exclude_none=True, enabled=True)
+    expires_at = datetime(2026, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+
+    content = shape.build(access_token="t", token_type="bearer", expires_in=60, expires_at=expires_at)
+    assert list(content) == ["access_token", "token_type", "expires_in", "expires_at"]
+    assert content["expires_at"] == "2026-01-02T03:04:05Z"
+    with pytest.raises(TypeError):
+        shape.build(access_token="t")
+
+    assert isinstance(ResponseShape(TokenResponse, enabled=False).item(**content), TokenResponse)
+    assert json_datetime(datetime(2026, 1, 2, 3, 4, 5)) == "2026-01-02T03:04:05"
+
+
+def test_fast_responses_keep_the_same_bytes(client, issue, fast_responses):
+    token = issue(permissions=["read", "write"])["access_token"]
+    requests = [
+        ("post", "/auth/validate", {"json": {"token": token}}),
+        ("post", "/auth/validate", {"json": {"token": "invalido"}}),
+        ("post", "/auth/validate/batch", {"json": {"tokens": [token, "invalido", token]}}),
+        ("post", "/auth/revoke", {"json": {"token": "invalido", "api_key": config.API_KEY}}),
+        ("get", "/auth/me", {"headers": {"Authorization": f"Bearer {token}"}}),
+    ]
+
+    bodies = {}
+    for enabled in (False, True):
+        fast_responses(enabled)
+        for method, path, kwargs in requests:
+            response = getattr(client, method)(path, **kwargs)
+            assert response.status_code == 200
+            assert response.headers["content-type"] == "application/json"
+            bodies.setdefault((method, path, repr(kwargs)), []).append(response.content)
+
+    for standard, fast in bodies.values():
+        assert standard == fast
@@ -0,0 +1,129 @@
+import asyncio
+import socket
+import time
+
+import pytest
+
+grpc = pytest.importorskip("grpc")
+
+from app import auth, config
+from app.auth_service_pb2 import IssueTokenRequest, ValidateRequest
+from app.auth_service_pb2_grpc import AuthServiceStub
+from app.cache import token_digest
+from app.grpc_server import start_server
+from app.rate_limit import RateLimit
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def call_grpc():
+    """
+    Executa `scenario(stub)` contra um servidor gRPC em processo, em um event loop novo
+    """
+    def run(scenario):
+        async def main():
+            port = free_port()
+            server = await start_server(port)
+            try:
+                async with grpc.aio.insecure_channel(f"127.0.0.1:{port}") as channel:
+                    return await scenario(AuthServiceStub(channel))
+            finally:
+                await server.stop(grace=None)
+        return asyncio.run(main())
+    return run
+
+
+def test_issue_and_validate(call_grpc):
+    async def scenario(stub):
+        issued = await stub.IssueToken(IssueTokenRequest(api_key=config.API_KEY, user_id="grpc", permissions=["read"]))
+        valid = await stub.Validate(ValidateRequest(token=issued.access_token))
+        invalid = await stub.Validate(ValidateRequest(token="a.b.c"))
+        batch = [response.valid async for response in stub.ValidateBatch(
+            iter([ValidateRequest(token=token) for token in (issued.access_token, "x", issued.access_token)])
+        )]
+        return issued, valid, invalid, batch
+
+    issued, valid, invalid, batch = call_grpc(scenario)
+    assert issued.token_type == "bearer" and issued.expires_in > 0
+    assert valid.valid and valid.user_id == "grpc" and list(valid.permissions) == ["read"]
+    assert not invalid.valid
+    assert batch == [True, False, True]
+
+
+def test_issue_rejects_invalid_api_key(call_grpc):
+    async def scenario(stub):
+        with pytest.raises(grpc.aio.AioRpcError) as excinfo:
+            await stub.IssueToken(IssueTokenRequest(api_key="invalida"))
+        return excinfo.value.code()
+
+    assert call_grpc(scenario) == grpc.StatusCode.UNAUTHENTICATED
+
+
+def test_validate_batch_enforces_the_rest_cap(call_grpc, issue, monkeypatch):
+    token = issue()["access_token"]
+    monkeypatch.setattr(config, "VALIDATE_BATCH_MAX_SIZE", 3)
+
+    async def scenario(stub):
+        accepted = [response.valid async for response in stub.ValidateBatch(
+            iter([ValidateRequest(token=token)] * 3)
+        )]
+        received = []
+        with pytest.raises(grpc.aio.AioRpcError) as excinfo:
+            async for response in stub.ValidateBatch(iter([ValidateRequest(token=token)] * 4)):
+                received.append(response.valid)
+        return accepted, received, excinfo.value.code()
+
+    accepted, received, code = call_grpc(scenario)
+    assert accepted == [True] * 3
+    assert received == [True] * 3
+    assert code == grpc.StatusCode.INVALID_ARGUMENT
+
+
+def test_validate_batch_is_rate_limited_per_stream(call_grpc, limits):
+    limits["/auth/validate/batch"] = RateLimit(2, 60)
+
+    async def scenario(stub):
+        codes = []
+        for _ in range(3):
+            # Streams vazios: o servidor recusa antes de ler, e uma mensagem ainda não enviada
+            # faria o cliente falhar com INTERNAL em vez de receber o status
+            try:
+                [response async for response in stub.ValidateBatch(iter([]))]
+                codes.append(grpc.StatusCode.OK)
+            except grpc.aio.AioRpcError as e:
+                codes.append(e.code())
+        return codes
+
+    assert call_grpc(scenario) == [grpc.StatusCode.OK, grpc.StatusCode.OK, grpc.StatusCode.RESOURCE_EXHAUSTED]
+
+
+def test_validate_returns_legacy_permissions_as_text(call_grpc, monkeypatch):
+    # Claims de um token antigo, emitido antes de `permissions` ser tipado como lista de strings
+    token = "legado.token.assinado"
+    cache = auth.TTLCache(max_size=10)
+    cache.set(token_digest(token), {"user_id": "alice", "permissions": [1, {"a": 1}, "read"]},
+              expires_at=time.time() + 60)
+    monkeypatch.setattr(auth, "token_cache", cache)
+
+    async def scenario(stub):
+        return await stub.Validate(ValidateRequest(token=token))
+
+    response = call_grpc(scenario)
+    assert response.valid
+    assert list(response.permissions) == ["1", "{'a': 1}", "read"]
+
+
+def test_start_server_fails_when_the_port_is_taken():
+    async def main():
+        with socket.socket() as sock:
+            sock.bind(("0.0.0.0", 0))
+            sock.listen()
+            with pytest.raises(RuntimeError):
+                await start_server(sock.getsockname()[1])
+
+    asyncio.run(main())
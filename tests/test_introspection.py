@@ -0,0 +1,48 @@
+import pytest
+
+
+@pytest.mark.parametrize("permissions", [[1, "a"], [{"a": 1}], [None]])
+def test_non_string_permissions_are_accepted_and_introspected(client, api_key, issue, permissions):
+    # `permissions` segue aceitando qualquer lista, como antes; só a introspecção converte para texto
+    token = issue(permissions=permissions)["access_token"]
+    assert client.post("/auth/validate", json={"token": token}).json()["permissions"] == permissions
+
+    response = client.post("/auth/introspect", data={"token": token, "api_key": api_key})
+    assert response.status_code == 200
+    assert response.json()["scope"] == " ".join(map(str, permissions))
+
+    response = client.post("/auth/token/bulk", json={"api_key": api_key, "tokens": [{"permissions": permissions}]})
+    assert response.status_code == 200
+
+
+def test_active_token_is_cacheable_and_revalidated_with_etag(client, api_key, issue):
+    token = issue(permissions=["read", "write"])["access_token"]
+
+    response = client.post("/auth/introspect", data={"token": token, "api_key": api_key})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["active"] is True
+    assert body["scope"] == "read write"
+    assert body["sub"] == "pytest"
+    assert response.headers["Cache-Control"].startswith("private, max-age=")
+
+    etag = response.headers["ETag"]
+    response = client.post(
+        "/auth/introspect", data={"token": token, "api_key": api_key}, headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 304
+
+
+def test_introspection_requires_an_api_key(client, issue):
+    token = issue()["access_token"]
+
+    assert client.post("/auth/introspect", data={"token": token}).status_code == 422
+    assert client.post("/auth/introspect", data={"token": token, "api_key": "invalida"}).status_code == 401
+    # Sem GET: o token não vai para a query string (logs de acesso, caches compartilhados)
+    assert client.get("/auth/introspect", params={"token": token}).status_code == 405
+
+
+def test_inactive_token_is_never_cached(client, api_key):
+    response = client.post("/auth/introspect", data={"token": "a.b.c", "api_key": api_key})
+    assert response.json() == {"active": False}
+    assert response.headers["Cache-Control"] == "no-store"
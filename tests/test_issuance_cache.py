@@ -0,0 +1,36 @@
+from datetime import timedelta
+
+import pytest
+
+from app import auth, config
+
+
+@pytest.fixture
+def issuance_cache(monkeypatch):
+    """
+    Ativa o reaproveitamento de tokens (ISSUANCE_CACHE_SECONDS) com um cache vazio
+    """
+    monkeypatch.setattr(config, "ISSUANCE_CACHE_SECONDS", 60)
+    cache = auth.TTLCache(max_size=100)
+    monkeypatch.setattr(auth, "issuance_cache", cache)
+    return cache
+
+
+def test_identical_requests_reuse_the_token(issue, issuance_cache):
+    first = issue(permissions=["read", "write"])
+    assert issue(permissions=["write", "read", "read"])["access_token"] == first["access_token"]
+    assert issue(permissions=["read"])["access_token"] != first["access_token"]
+    assert issue(permissions=["read", "write"], user_id="outro")["access_token"] != first["access_token"]
+
+
+@pytest.mark.parametrize("permissions", [[1, "a"], [{"a": 1}, "read"], [["x"], None]])
+def test_issuance_key_accepts_any_permission_values(permissions):
+    data = {"user_id": "alice", "permissions": permissions}
+    key = auth.issuance_key(config.API_KEY, data, timedelta(minutes=5))
+    assert key == auth.issuance_key(config.API_KEY, {**data, "permissions": permissions[::-1]}, timedelta(minutes=5))
+
+
+def test_issuance_key_keeps_permission_types_apart():
+    expires = timedelta(minutes=5)
+    assert (auth.issuance_key(config.API_KEY, {"user_id": "alice", "permissions": [1]}, expires)
+            != auth.issuance_key(config.API_KEY, {"user_id": "alice", "permissions": ["1"]}, expires))
@@ -0,0 +1,82 @@
+import time
+
+import pytest
+
+from app.jwt_engine import (
+    ENGINES, ExpiredTokenError, InvalidSignatureError, MalformedTokenError, TokenError, UnknownKeyError,
+    build_engine
+)
+from app.keyring import Keyring
+from app.keys import HMACKey, b64url_encode
+
+
+def hmac_keyring(secret: str = "segredo-de-teste", kid: str = "default") -> Keyring:
+    return Keyring.single(HMACKey(secret, "HS256", kid=kid))
+
+
+def claims(**extra) -> dict:
+    now = int(time.time())
+    return {"user_id": "alice", "permissions": ["read"], "iat": now, "exp": now + 60, **extra}
+
+
+@pytest.mark.parametrize("signer", sorted(ENGINES))
+@pytest.mark.parametrize("verifier", sorted(ENGINES))
+def test_engines_accept_each_others_tokens(signer, verifier):
+    keyring = hmac_keyring()
+    token = build_engine(signer, keyring).encode(claims())
+
+    decoded = build_engine(verifier, keyring).decode(token)
+    assert decoded["user_id"] == "alice"
+    assert decoded["permissions"] == ["read"]
+
+
+@pytest.mark.parametrize("name", sorted(ENGINES))
+def test_engines_report_the_rejection_reason(name):
+    engine = build_engine(name, hmac_keyring())
+    token = engine.encode(claims())
+
+    with pytest.raises(InvalidSignatureError):
+        build_engine(name, hmac_keyring("outro-segredo")).decode(token)
+    with pytest.raises(MalformedTokenError):
+        engine.decode("nao-e-um-jwt")
+    with pytest.raises(ExpiredTokenError):
+        engine.decode(engine.encode(claims(exp=int(time.time()) - 10)))
+    with pytest.raises(UnknownKeyError):
+        build_engine(name, hmac_keyring(kid="outro")).decode(token)
+
+
+def signed_payload(keyring: Keyring, payload: bytes) -> str:
+    """
+    Token com assinatura válida sobre um payload arbitrário
+    """
+    header = build_engine("native", keyring).encode(claims()).split(".")[0]
+    signing_input = f"{header}.{b64url_encode(payload).decode()}".encode()
+    return f"{signing_input.decode()}.{b64url_encode(keyring.signing_key.sign(signing_input)).decode()}"
+
+
+@pytest.mark.parametrize("name", sorted(ENGINES))
+def test_engines_agree_on_the_rejection_reason(name):
+    keyring = hmac_keyring()
+    native = build_engine("native", keyring)
+    token = native.encode(claims())
+    now = int(time.time())
+    cases = {
+        "malformed": [
+            signed_payload(keyring, b"nao-e-json"), signed_payload(keyring, b"[1]"),
+            "a.b", "á.b.c", "!!!.b.c", token + ".d", ""
+        ],
+        "bad_signature": [token.rsplit(".", 1)[0] + ".@@@"],
+        "invalid": [native.encode({"nbf": now + 60}), native.encode({"iat": "agora"})],
+    }
+
+    engine = build_engine(name, keyring)
+    for reason, tokens in cases.items():
+        for candidate in tokens:
+            with pytest.raises(TokenError) as error:
+                engine.decode(candidate)
+            assert error.value.reason == reason, candidate
+
+
+def test_unknown_engine_is_refused():
+    with pytest.raises(ValueError):
+        build_engine("desconhecida", hmac_keyring())
@@ -0,0 +1,79 @@
+import json
+import time
+
+import pytest
+from jose import jwt
+
+from app.jwt_engine import ENGINES, UnknownKeyError, build_engine
+from app.keyring import Keyring, keyring_from_manifest, load_keyring
+from app.keys import HMACKey
+
+
+def claims() -> dict:
+    now = int(time.time())
+    return {"user_id": "alice", "iat": now, "exp": now + 60}
+
+
+def manifest(signing_kid: str, retired_at=None, legacy_kid=None) -> dict:
+    old = {"kid": "2025-01", "alg": "HS256", "secret": "segredo-antigo"}
+    if retired_at is not None:
+        old["retired_at"] = retired_at
+    return {
+        "signing_kid": signing_kid,
+        "legacy_kid": legacy_kid,
+        "keys": [old, {"kid": "2025-06", "alg": "HS512", "secret": "segredo-novo"}]
+    }
+
+
+@pytest.mark.parametrize("engine", sorted(ENGINES))
+def test_rotation_keeps_old_tokens_valid_during_grace(engine):
+    before = build_engine(engine, keyring_from_manifest(manifest("2025-01")))
+    old_token = before.encode(claims())
+
+    # Nova chave de assinatura; a antiga foi aposentada agora, com 60 s de carência
+    after = build_engine(engine, keyring_from_manifest(manifest("2025-06", retired_at=time.time()), grace_seconds=60))
+    new_token = after.encode(claims())
+    assert after.decode(old_token)["user_id"] == "alice"
+    assert after.decode(new_token)["user_id"] == "alice"
+
+    # Fora da carência os tokens da chave antiga são recusados
+    expired = build_engine(engine, keyring_from_manifest(manifest("2025-06", retired_at="2020-01-01T00:00:00Z")))
+    with pytest.raises(UnknownKeyError):
+        expired.decode(old_token)
+
+
+def test_retired_keys_leave_the_jwks_and_verification_set():
+    keyring = keyring_from_manifest(manifest("2025-06", retired_at=time.time() - 10), grace_seconds=5)
+    assert keyring.get("2025-01") is None
+    assert [key.kid for key in keyring.verification_keys()] == ["2025-06"]
+    assert len(keyring.all_keys()) == 2
+
+
+@pytest.mark.parametrize("engine", sorted(ENGINES))
+def test_legacy_kid_verifies_tokens_without_kid(engine):
+    legacy = HMACKey("segredo-antigo", "HS256", kid="2025-01")
+    old_token = build_engine("jose", Keyring([legacy], signing_kid="2025-01")).encode(claims())
+    # Tokens emitidos antes do keyring não têm `kid` no header
+    unkeyed = jwt.encode(claims(), "segredo-antigo", algorithm="HS256")
+
+    keyring = keyring_from_manifest(manifest("2025-06", legacy_kid="2025-01"))
+    assert build_engine(engine, keyring).decode(old_token)["user_id"] == "alice"
+    assert build_engine(engine, keyring).decode(unkeyed)["user_id"] == "alice"
+    with pytest.raises(UnknownKeyError):
+        build_engine(engine, keyring_from_manifest(manifest("2025-06"))).decode(unkeyed)
+
+
+def test_invalid_manifests_are_refused(tmp_path):
+    with pytest.raises(ValueError):
+        keyring_from_manifest(manifest("2025-01", retired_at=time.time()))
+    with pytest.raises(ValueError):
+        keyring_from_manifest(manifest("desconhecida"))
+    with pytest.raises(ValueError):
+        keyring_from_manifest({"signing_kid": "a", "keys": [{"alg": "HS256", "secret": "x"}]})
+    with pytest.raises(ValueError):
+        Keyring([HMACKey("a", "HS256"), HMACKey("b", "HS256")], signing_kid="default")
+
+    (tmp_path / "keyring.json").write_text(json.dumps(manifest("2025-06")))
+    assert load_keyring(keyring_dir=str(tmp_path)).signing_kid == "2025-06"
+    assert load_keyring(keyring_json=json.dumps(manifest("2025-01"))).signing_kid == "2025-01"
+    assert load_keyring() is None
@@ -0,0 +1,48 @@
+import json
+import os
+import subprocess
+import sys
+
+from app.metrics import MetricsRegistry
+
+
+def dead_pid() -> int:
+    process = subprocess.Popen([sys.executable, "-c", "pass"])
+    process.wait()
+    return process.pid
+
+
+def test_dead_worker_snapshots_are_retired(tmp_path):
+    registry = MetricsRegistry(multiprocess_dir=str(tmp_path))
+    requests = registry.counter("requests_total", "Requisições", ("route",))
+    requests.inc("/a")
+
+    # Snapshot de um worker que já saiu (reciclado pelo gunicorn)
+    pid = dead_pid()
+    (tmp_path / f"metrics_{pid}.json").write_text(json.dumps({"requests_total": {json.dumps(["/a"]): 2}}))
+
+    assert 'requests_total{route="/a"} 3' in registry.render()
+    assert not (tmp_path / f"metrics_{pid}.json").exists()
+    assert (tmp_path / "metrics_retired.json").exists()
+
+    # O total continua monotônico e o snapshot aposentado não é somado de novo
+    requests.inc("/a")
+    assert 'requests_total{route="/a"} 4' in registry.render()
+    assert sorted(os.listdir(tmp_path)) == [".retired.lock", f"metrics_{os.getpid()}.json", "metrics_retired.json"]
+
+
+def test_live_worker_snapshots_are_summed(tmp_path):
+    registry = MetricsRegistry(multiprocess_dir=str(tmp_path))
+    latency = registry.histogram("latency_seconds", "Latência", ("route",), buckets=(0.1, 1.0))
+    latency.observe(0.05, "/a")
+
+    # Outro worker vivo (o processo pai serve de pid ativo)
+    other = MetricsRegistry(multiprocess_dir=str(tmp_path))
+    other.histogram("latency_seconds", "Latência", ("route",), buckets=(0.1, 1.0)).observe(0.5, "/a")
+    (tmp_path / f"metrics_{os.getppid()}.json").write_text(json.dumps(other.snapshot()))
+
+    rendered = registry.render()
+    assert 'latency_seconds_bucket{route="/a",le="0.1"} 1' in rendered
+    assert 'latency_seconds_bucket{route="/a",le="1"} 2' in rendered
+    assert 'latency_seconds_count{route="/a"} 2' in rendered
+    assert (tmp_path / f"metrics_{os.getppid()}.json").exists()
@@ -0,0 +1,42 @@
+import json
+
+import pytest
+
+from app import auth
+from app.keyring import Keyring
+from app.keys import HMACKey, b64url_encode
+from app.precheck import TokenPrecheck
+
+
+def segment(data: dict) -> str:
+    return b64url_encode(json.dumps(data).encode()).decode()
+
+
+@pytest.fixture
+def precheck() -> TokenPrecheck:
+    return TokenPrecheck(Keyring.single(HMACKey("segredo", "HS256", kid="k1")), max_length=200)
+
+
+@pytest.mark.parametrize("token, reason", [
+    ("a" * 201, "too_long"),
+    ("a.b", "bad_segments"),
+    ("a.b.c$", "bad_alphabet"),
+    ("bm9wZQ.b.c", "bad_header"),
+    (f"{segment({'alg': 'HS256', 'kid': 'outro'})}.b.c", "unknown_kid"),
+    (f"{segment({'alg': 'none', 'kid': 'k1'})}.b.c", "bad_alg"),
+])
+def test_structural_rejections(precheck, token, reason):
+    assert precheck.check(token) == reason
+
+
+def test_well_formed_tokens_pass(precheck):
+    assert precheck.check(f"{segment({'alg': 'HS256', 'kid': 'k1', 'typ': 'JWT'})}.b.c") is None
+
+
+def test_rejections_skip_the_engine(client, monkeypatch):
+    def decode(token):
+        raise AssertionError("a engine não deveria ser chamada")
+
+    monkeypatch.setattr(auth.jwt_engine, "decode", decode)
+    for token in ("a.b", "x" * 10000, f"{segment({'alg': 'none'})}.b.c"):
+        assert client.post("/auth/validate", json={"token": token}).json()["valid"] is False
@@ -0,0 +1,47 @@
+import asyncio
+import time
+
+from app.rate_limit import RateLimit, RateLimiter, RedisBackend
+
+
+def test_ip_limit_returns_429_with_retry_after(client, limits):
+    limits["/auth/validate"] = RateLimit(2, 60)
+
+    statuses = [client.post("/auth/validate", json={"token": "x"}).status_code for _ in range(3)]
+    assert statuses == [200, 200, 429]
+
+    response = client.post("/auth/validate", json={"token": "x"})
+    assert response.headers["Retry-After"] == "30"
+
+
+def test_api_key_limit_applies_to_token_issuance(client, api_key, limits):
+    limits["/auth/token"] = RateLimit(1, 60)
+    # O limite por IP é consumido primeiro; com capacidade 1 os dois escopos esgotam juntos
+    assert client.post("/auth/token", json={"api_key": api_key}).status_code == 200
+    assert client.post("/auth/token", json={"api_key": api_key}).status_code == 429
+
+
+def test_redis_backend_does_not_block_the_event_loop():
+    calls = []
+
+    async def slow_script(keys, args):
+        calls.append(keys[0])
+        await asyncio.sleep(0.05)
+        return "0"
+
+    # Sem servidor Redis: só o script é substituído, o resto do backend é o real
+    backend = RedisBackend.__new__(RedisBackend)
+    backend.prefix = "auth-api:ratelimit:"
+    backend._script = slow_script
+    limiter = RateLimiter({"/auth/validate": RateLimit(10, 60)}, backend)
+
+    async def run():
+        start = time.perf_counter()
+        results = await asyncio.gather(*(limiter.check("/auth/validate", "ip", str(i)) for i in range(10)))
+        return results, time.perf_counter() - start
+
+    results, elapsed = asyncio.run(run())
+    assert results == [None] * 10
+    assert calls[0] == "auth-api:ratelimit:/auth/validate:ip:0"
+    # As dez idas ao Redis se sobrepõem em vez de somar 0,5 s
+    assert elapsed < 0.25
@@ -0,0 +1,112 @@
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+from app.token_store import RefreshTokenStore
+
+
+def wait_until(condition, timeout: float = 5.0) -> bool:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return condition()
+
+
+def test_rotation_accepts_each_token_once(refresh_store):
+    token = refresh_store.issue("alice", ["read"], ttl_seconds=60, access_ttl_minutes=5)
+
+    rotated = refresh_store.rotate(token, ttl_seconds=60)
+    assert rotated is not None
+    new_token, record = rotated
+    assert record["user_id"] == "alice"
+    assert record["permissions"] == ["read"]
+    assert record["access_ttl_minutes"] == 5
+
+    assert refresh_store.rotate(token, ttl_seconds=60) is None
+    assert refresh_store.rotate(new_token, ttl_seconds=60) is not None
+
+
+def test_rotation_rejects_unknown_and_expired_tokens(refresh_store):
+    assert refresh_store.rotate("desconhecido", ttl_seconds=60) is None
+
+    expired = refresh_store.issue("alice", ["read"], ttl_seconds=-1)
+    assert refresh_store.rotate(expired, ttl_seconds=60) is None
+
+
+def test_concurrent_rotation_across_workers_accepts_one(tmp_path):
+    # Dois stores no mesmo arquivo fazem o papel de dois workers do gunicorn
+    db_path = str(tmp_path / "shared.db")
+    stores = [RefreshTokenStore(db_path, flush_interval=0.01) for _ in range(2)]
+    try:
+        for _ in range(20):
+            token = stores[0].issue("alice", ["read"], ttl_seconds=60)
+            stores[0].flush()
+
+            barrier = threading.Barrier(8)
+            results = []
+
+            def rotate(store):
+                barrier.wait()
+                results.append(store.rotate(token, ttl_seconds=60))
+
+            threads = [threading.Thread(target=rotate, args=(stores[i % 2],)) for i in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            assert sum(result is not None for result in results) == 1
+    finally:
+        for store in stores:
+            store.close()
+
+
+def test_rotation_by_another_worker_is_seen(tmp_path):
+    db_path = str(tmp_path / "shared.db")
+    first, second = RefreshTokenStore(db_path), RefreshTokenStore(db_path)
+    try:
+        token = first.issue("alice", ["read"], ttl_seconds=60)
+        first.flush()
+        assert second.rotate(token, ttl_seconds=60) is not None
+        assert first.rotate(token, ttl_seconds=60) is None
+    finally:
+        first.close()
+        second.close()
+
+
+def test_writer_survives_failed_flush(tmp_path):
+    store = RefreshTokenStore(str(tmp_path / "refresh.db"), flush_interval=0.01)
+    store.RETRY_INTERVAL = 0.01
+    connection = store._pool.connection
+    failures = [sqlite3.OperationalError("database is locked")] * 3
+
+    @contextmanager
+    def flaky_connection():
+        if failures:
+            raise failures.pop()
+        with connection() as conn:
+            yield conn
+
+    try:
+        store._pool.connection = flaky_connection
+        token = store.issue("alice", ["read"], ttl_seconds=60)
+
+        assert wait_until(lambda: not failures and not store._pending)
+        assert store._writer.is_alive()
+        assert store.rotate(token, ttl_seconds=60) is not None
+    finally:
+        store.close()
+
+
+def test_refresh_endpoint_rotates_once(client, issue, refresh_store):
+    refresh_token = issue(include_refresh_token=True)["refresh_token"]
+
+    response = client.post("/auth/refresh", json={"refresh_token": refresh_token})
+    assert response.status_code == 200
+    assert response.json()["refresh_token"] != refresh_token
+
+    response = client.post("/auth/refresh", json={"refresh_token": refresh_token})
+    assert response.status_code == 401
@@ -0,0 +1,54 @@
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from app.dependencies import current_token_payload, require_permissions
+
+
+@pytest.fixture
+def protected() -> TestClient:
+    """
+    App com uma rota que exige read e reports
+    """
+    app = FastAPI()
+
+    @app.get("/relatorios")
+    async def relatorios(
+        payload: dict = Depends(require_permissions("read", "reports")),
+        same_payload: dict = Depends(current_token_payload)
+    ):
+        return {"user_id": payload["user_id"], "same": payload is same_payload}
+
+    return TestClient(app)
+
+
+def bearer(token: str) -> dict:
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_route_requires_every_permission(protected, issue):
+    granted = issue(permissions=["reports", "read", "write"])["access_token"]
+    response = protected.get("/relatorios", headers=bearer(granted))
+    assert response.status_code == 200
+    assert response.json() == {"user_id": "pytest", "same": True}
+
+    # Valores que não são strings não concedem permissão (nem quebram o frozenset)
+    missing = issue(permissions=["read", {"reports": True}])["access_token"]
+    response = protected.get("/relatorios", headers=bearer(missing))
+    assert response.status_code == 403
+    assert response.json()["detail"] == "Permissões insuficientes: reports"
+
+
+def test_invalid_or_missing_token_is_unauthorized(protected):
+    response = protected.get("/relatorios", headers=bearer("invalido"))
+    assert response.status_code == 401
+    assert response.headers["WWW-Authenticate"] == "Bearer"
+    assert protected.get("/relatorios").status_code == 403
+
+
+def test_token_is_verified_once_per_request(protected, issue, token_cache):
+    token = issue(permissions=["read", "reports"])["access_token"]
+    assert protected.get("/relatorios", headers=bearer(token)).status_code == 200
+
+    stats = token_cache.stats()
+    assert (stats["misses"], stats["hits"]) == (1, 0)
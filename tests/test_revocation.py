@@ -0,0 +1,121 @@
+import sqlite3
+import time
+
+from app.revocation import BloomFilter, RevocationList
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    items = [f"jti-{i}" for i in range(1000)]
+    for item in items:
+        bloom.add(item)
+
+    assert all(item in bloom for item in items)
+    false_positives = sum(f"outro-{i}" in bloom for i in range(10000))
+    assert false_positives < 500
+
+
+def test_revocation_lasts_until_the_token_expires(tmp_path):
+    revocations = RevocationList(str(tmp_path / "revoked.db"))
+    revocations.revoke("ativo", expires_at=time.time() + 60)
+    revocations.revoke("vencido", expires_at=time.time() - 1)
+
+    assert revocations.is_revoked("ativo")
+    assert not revocations.is_revoked("vencido")
+    assert not revocations.is_revoked("desconhecido")
+    assert not revocations.is_revoked(None)
+
+
+def test_revocations_are_shared_through_sqlite(tmp_path):
+    db_path = str(tmp_path / "revoked.db")
+    first, second = RevocationList(db_path), RevocationList(db_path)
+    first.revoke("jti-1", expires_at=time.time() + 60)
+
+    # Outro processo vê a revogação no próximo sync (a cada prune_interval)
+    assert not second.is_revoked("jti-1")
+    second.sync()
+    assert second.is_revoked("jti-1")
+    # E um processo novo a carrega na inicialização
+    assert RevocationList(db_path).is_revoked("jti-1")
+
+
+def test_prune_drops_expired_revocations(tmp_path):
+    revocations = RevocationList(str(tmp_path / "revoked.db"), prune_interval=0)
+    revocations.revoke("curto", expires_at=time.time() + 0.05)
+    revocations.revoke("longo", expires_at=time.time() + 60)
+    assert len(revocations) == 2
+
+    time.sleep(0.1)
+    revocations.prune()
+    assert len(revocations) == 1
+    assert revocations.is_revoked("longo")
+    assert not revocations.is_revoked("curto")
+
+
+def test_revocations_after_a_prune_reach_other_instances(tmp_path):
+    db_path = str(tmp_path / "revoked.db")
+    first, second = RevocationList(db_path), RevocationList(db_path)
+    first.revoke("longo", expires_at=time.time() + 60)
+    first.revoke("curto", expires_at=time.time() + 0.05)
+    second.sync()
+
+    # O prune apaga a linha mais recente; o id dela não pode ser reaproveitado
+    time.sleep(0.1)
+    first.prune()
+    first.revoke("novo", expires_at=time.time() + 60)
+
+    second.sync()
+    assert second.is_revoked("novo")
+    assert second.is_revoked("longo")
+
+    # Uma revogação local não faz o sync pular as gravadas antes por outro processo
+    second.revoke("do-segundo", expires_at=time.time() + 60)
+    first.revoke("do-primeiro", expires_at=time.time() + 60)
+    first.sync()
+    assert first.is_revoked("do-segundo")
+
+
+def test_legacy_table_is_migrated(tmp_path):
+    db_path = str(tmp_path / "revoked.db")
+    db = sqlite3.connect(db_path)
+    db.execute("CREATE TABLE revoked_tokens (jti TEXT PRIMARY KEY, expires_at REAL NOT NULL)")
+    db.execute("INSERT INTO revoked_tokens VALUES (?, ?)", ("antigo", time.time() + 60))
+    db.commit()
+    db.close()
+
+    revocations = RevocationList(db_path)
+    assert revocations.is_revoked("antigo")
+    revocations.revoke("novo", expires_at=time.time() + 60)
+    assert RevocationList(db_path).is_revoked("novo")
+
+
+def test_revoke_endpoint_rejects_the_token(client, api_key, issue):
+    token = issue()["access_token"]
+    assert client.post("/auth/validate", json={"token": token}).json()["valid"]
+
+    response = client.post("/auth/revoke", json={"token": token, "api_key": api_key})
+    assert response.status_code == 200 and response.json()["revoked"]
+
+    # Recusado mesmo estando no cache de tokens válidos
+    assert not client.post("/auth/validate", json={"token": token}).json()["valid"]
+    assert client.get("/auth/me", headers={"Authorization": f"Bearer {token}"}).status_code == 401
+
+
+def test_maintenance_thread_prunes_and_syncs(tmp_path):
+    db_path = str(tmp_path / "revoked.db")
+    writer = RevocationList(db_path)
+    revocations = RevocationList(db_path, prune_interval=0.05)
+    revocations.revoke("curto", expires_at=time.time() + 0.05)
+
+    revocations.start()
+    try:
+        writer.revoke("de-outro-processo", expires_at=time.time() + 60)
+        deadline = time.time() + 2
+        while (len(revocations) != 1 or not revocations.is_revoked("de-outro-processo")) and time.time() < deadline:
+            time.sleep(0.02)
+    finally:
+        revocations.close()
+
+    assert revocations.is_revoked("de-outro-processo")
+    assert not revocations.is_revoked("curto")
+    assert len(revocations) == 1
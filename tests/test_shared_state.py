@@ -0,0 +1,69 @@
+import logging
+import multiprocessing
+import time
+
+import pytest
+
+from app.shared_state import SharedTable, SharedTTLCache, shared_table
+
+# fork: o processo filho herda o sys.path e o app já importado
+fork = multiprocessing.get_context("fork")
+
+
+def _write_and_read(directory: str, results) -> None:
+    table = shared_table(directory, "tabela", 64, 32)
+    table.set(b"do-filho", b"filho", time.time() + 60)
+    results.put(table.get(b"do-pai"))
+    table.close()
+
+
+def test_workers_see_each_others_entries(tmp_path):
+    table = shared_table(str(tmp_path), "tabela", 64, 32)
+    table.set(b"do-pai", b"pai", time.time() + 60)
+
+    results = fork.Queue()
+    child = fork.Process(target=_write_and_read, args=(str(tmp_path), results))
+    child.start()
+    assert results.get(timeout=10) == b"pai"
+    child.join(10)
+    assert child.exitcode == 0
+    assert table.get(b"do-filho") == b"filho"
+
+
+def test_layout_change_uses_another_file(tmp_path):
+    table = shared_table(str(tmp_path), "tabela", 64, 32)
+    table.set(b"chave", b"valor", time.time() + 60)
+
+    # Outra configuração (ex: worker de um deploy novo) não toca no arquivo mapeado
+    resized = shared_table(str(tmp_path), "tabela", 4096, 32)
+    assert resized.path != table.path
+    assert table.get(b"chave") == b"valor"
+    assert resized.get(b"chave") is None
+    assert len(list(tmp_path.glob("tabela.*.mmap"))) == 2
+
+
+def test_mismatched_file_is_refused(tmp_path):
+    path = str(tmp_path / "tabela.mmap")
+    table = SharedTable(path, 64, 32)
+    table.set(b"chave", b"valor", time.time() + 60)
+    size = table.size
+
+    with pytest.raises(ValueError):
+        SharedTable(path, 4096, 32)
+    assert (tmp_path / "tabela.mmap").stat().st_size == size
+    assert table.get(b"chave") == b"valor"
+
+
+def test_oversized_values_are_counted_and_logged(tmp_path, caplog):
+    cache = SharedTTLCache(shared_table(str(tmp_path), "cache", 64, 32))
+
+    with caplog.at_level(logging.WARNING, logger="app.shared_state"):
+        cache.set(b"grande", {"permissions": ["x" * 64]}, time.time() + 60)
+        cache.set(b"outro-grande", {"permissions": ["y" * 64]}, time.time() + 60)
+    cache.set(b"pequeno", {"ok": 1}, time.time() + 60)
+
+    assert cache.get(b"grande") is None
+    assert cache.get(b"pequeno") == {"ok": 1}
+    assert cache.stats()["oversized"] == 2
+    # Um aviso só, na primeira vez
+    assert len(caplog.records) == 1
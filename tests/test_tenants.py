@@ -0,0 +1,108 @@
+import json
+import sqlite3
+
+import pytest
+
+from app import auth
+from app.api_keys import ApiKeyRegistry, hash_api_key
+from app.token_store import RefreshTokenStore
+
+ACME_KEY = "acme-api-key"
+
+
+def write_registry(path, tenants):
+    path.write_text(json.dumps({
+        "keys": [{"tenant": tenant, "key_sha256": hash_api_key(key).hex()} for tenant, key in tenants]
+    }))
+
+
+@pytest.fixture
+def registry_file(tmp_path, monkeypatch, api_key):
+    """
+    Registro com o tenant "acme" (além do "default" da API_KEY), relido a cada consulta
+    """
+    path = tmp_path / "api_keys.json"
+    write_registry(path, [("acme", ACME_KEY)])
+    monkeypatch.setattr(auth, "api_key_registry", ApiKeyRegistry(str(path), default_api_key=api_key, reload_interval=0))
+    return path
+
+
+def test_tokens_carry_the_issuing_tenant(client, registry_file):
+    response = client.post("/auth/token", json={"api_key": ACME_KEY, "user_id": "alice"})
+    assert auth.verify_token(response.json()["access_token"])["tenant"] == "acme"
+
+
+def test_refresh_rejected_after_tenant_removed(client, registry_file, refresh_store):
+    response = client.post("/auth/token", json={"api_key": ACME_KEY, "include_refresh_token": True})
+    refresh_token = response.json()["refresh_token"]
+
+    response = client.post("/auth/refresh", json={"refresh_token": refresh_token})
+    assert response.status_code == 200
+    assert auth.verify_token(response.json()["access_token"])["tenant"] == "acme"
+
+    write_registry(registry_file, [])
+    response = client.post("/auth/refresh", json={"refresh_token": response.json()["refresh_token"]})
+    assert response.status_code == 401
+
+
+def test_restricted_tenant_refuses_non_string_permissions(client, tmp_path, monkeypatch, api_key):
+    path = tmp_path / "api_keys.json"
+    path.write_text(json.dumps({
+        "keys": [{"tenant": "acme", "key_sha256": hash_api_key(ACME_KEY).hex(), "permissions": ["read"]}]
+    }))
+    monkeypatch.setattr(auth, "api_key_registry", ApiKeyRegistry(str(path), default_api_key=api_key, reload_interval=0))
+
+    for permissions in (["read", {"a": 1}], ["read", 1]):
+        response = client.post("/auth/token", json={"api_key": ACME_KEY, "permissions": permissions})
+        assert response.status_code == 403
+        response = client.post("/auth/token/bulk", json={"api_key": ACME_KEY, "tokens": [{"permissions": permissions}]})
+        assert response.status_code == 403
+    assert client.post("/auth/token", json={"api_key": ACME_KEY, "permissions": ["read"]}).status_code == 200
+
+
+def test_revoke_is_scoped_to_the_callers_tenant(client, api_key, registry_file):
+    token = client.post("/auth/token", json={"api_key": ACME_KEY}).json()["access_token"]
+
+    response = client.post("/auth/revoke", json={"api_key": api_key, "token": token})
+    assert response.json()["revoked"] is False
+    assert client.post("/auth/validate", json={"token": token}).json()["valid"] is True
+
+    response = client.post("/auth/revoke", json={"api_key": ACME_KEY, "token": token})
+    assert response.json()["revoked"] is True
+    assert client.post("/auth/validate", json={"token": token}).json()["valid"] is False
+
+
+def test_legacy_tokens_without_tenant_belong_to_the_default_tenant(client, api_key, registry_file):
+    # Token emitido antes dos tenants: sem a claim `tenant`
+    token = auth.create_access_token({"user_id": "legado", "permissions": []})
+
+    response = client.post("/auth/revoke", json={"api_key": ACME_KEY, "token": token})
+    assert response.json()["revoked"] is False
+
+    response = client.post("/auth/revoke", json={"api_key": api_key, "token": token})
+    assert response.json()["revoked"] is True
+    assert client.post("/auth/validate", json={"token": token}).json()["valid"] is False
+
+
+def test_revoke_requires_a_registered_api_key(client, issue):
+    token = issue()["access_token"]
+    response = client.post("/auth/revoke", json={"api_key": "invalida", "token": token})
+    assert response.status_code == 401
+
+
+def test_legacy_refresh_tokens_without_tenant_are_rejected(client, tmp_path, monkeypatch):
+    db_path = str(tmp_path / "legacy.db")
+    with sqlite3.connect(db_path) as connection:
+        connection.execute(
+            "CREATE TABLE refresh_tokens (token_hash TEXT PRIMARY KEY, user_id TEXT NOT NULL,"
+            " permissions TEXT NOT NULL, expires_at REAL NOT NULL, used INTEGER NOT NULL DEFAULT 0,"
+            " access_ttl_minutes INTEGER)"
+        )
+    store = RefreshTokenStore(db_path)
+    monkeypatch.setattr(auth, "_refresh_store", store)
+    try:
+        refresh_token = store.issue("alice", ["read"], ttl_seconds=60)
+        response = client.post("/auth/refresh", json={"refresh_token": refresh_token})
+        assert response.status_code == 401
+    finally:
+        store.close()
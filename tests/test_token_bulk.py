@@ -0,0 +1,55 @@
+import json
+
+from app import auth, config, main
+from app.metrics import stage_duration
+
+
+def bulk(client, api_key, **fields):
+    return client.post("/auth/token/bulk", json={
+        "api_key": api_key,
+        "tokens": [{"user_id": "ana", "permissions": ["read"]}, {"user_id": "bia"}, {}],
+        **fields
+    })
+
+
+def test_bulk_tokens_share_issue_and_expiry(client, api_key):
+    response = bulk(client, api_key)
+    assert response.status_code == 200
+    body = response.json()
+    assert [item["user_id"] for item in body["tokens"]] == ["ana", "bia", "anonymous"]
+    assert body["token_type"] == "bearer" and body["expires_in"] > 0
+
+    payloads = [auth.verify_token(item["access_token"]) for item in body["tokens"]]
+    assert payloads[0]["permissions"] == ["read"] and payloads[1]["permissions"] == []
+    assert len({payload["exp"] for payload in payloads}) == 1
+
+
+def test_bulk_tokens_can_be_streamed_as_ndjson(client, api_key):
+    response = bulk(client, api_key, stream=True)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["user_id"] for line in lines] == ["ana", "bia", "anonymous"]
+    assert all(auth.verify_token(line["access_token"]) for line in lines)
+
+
+def sign_count(route: str) -> int:
+    counts, _ = stage_duration.snapshot().get(json.dumps([route, "sign"]), [[], 0])
+    return sum(counts)
+
+
+def test_streamed_chunks_keep_the_route_label(client, api_key, monkeypatch):
+    monkeypatch.setattr(main, "BULK_STREAM_CHUNK_SIZE", 1)
+    before = sign_count("/auth/token/bulk"), sign_count("")
+
+    assert len(bulk(client, api_key, stream=True).text.splitlines()) == 3
+    # Os lotes assinados depois do primeiro, já durante o envio do corpo, ficam na rota
+    assert (sign_count("/auth/token/bulk"), sign_count("")) == (before[0] + 3, before[1])
+
+
+def test_bulk_rejects_invalid_key_and_oversized_batches(client, api_key, monkeypatch):
+    assert bulk(client, "invalida").status_code == 401
+
+    monkeypatch.setattr(config, "TOKEN_BULK_MAX_SIZE", 2)
+    assert bulk(client, api_key).status_code == 413
@@ -0,0 +1,60 @@
+import time
+
+from app import auth
+from app.cache import TTLCache, token_digest
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache(max_size=2)
+    expires_at = time.time() + 60
+    cache.set(b"a", 1, expires_at)
+    cache.set(b"b", 2, expires_at)
+    assert cache.get(b"a") == 1
+    cache.set(b"c", 3, expires_at)
+
+    assert cache.get(b"b") is None
+    assert cache.get(b"a") == 1 and cache.get(b"c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_entries_expire_individually():
+    cache = TTLCache(max_size=10)
+    cache.set(b"curto", 1, time.time() + 0.05)
+    cache.set(b"longo", 2, time.time() + 60)
+    cache.set(b"vencido", 3, time.time() - 1)
+
+    time.sleep(0.1)
+    assert cache.get(b"curto") is None
+    assert cache.get(b"longo") == 2
+    assert cache.get(b"vencido") is None
+    assert cache.stats()["expirations"] == 1
+    assert TTLCache(max_size=0).get(b"x") is None
+
+
+def test_verified_tokens_are_cached_until_exp(issue, token_cache):
+    token = issue()["access_token"]
+
+    first = auth.verify_token(token)
+    second = auth.verify_token(token)
+    assert first == second and first["user_id"] == "pytest"
+    assert token_cache.stats()["hits"] == 1
+    # A chave é o digest: o token não fica em claro no cache
+    assert token_cache.get(token_digest(token))["exp"] == first["exp"]
+
+    # Alterar o dict retornado não altera o cache
+    second["user_id"] = "outro"
+    assert auth.verify_token(token)["user_id"] == "pytest"
+
+
+def test_invalid_tokens_are_not_cached(token_cache):
+    assert auth.verify_token("token-invalido") is None
+    assert token_cache.stats()["size"] == 0
+
+
+def test_stats_endpoint(client, issue, token_cache):
+    token = issue()["access_token"]
+    for _ in range(3):
+        assert client.post("/auth/validate", json={"token": token}).json()["valid"]
+
+    stats = client.get("/auth/cache/stats").json()
+    assert (stats["size"], stats["hits"], stats["misses"], stats["max_size"]) == (1, 2, 1, 10)
@@ -0,0 +1,30 @@
+from app import config
+
+
+def test_results_follow_the_token_order(client, issue):
+    first = issue(user_id="primeiro")["access_token"]
+    second = issue(user_id="segundo", permissions=["read"])["access_token"]
+
+    response = client.post("/auth/validate/batch", json={"tokens": [second, "invalido", first]})
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [result["valid"] for result in results] == [True, False, True]
+    assert [result["user_id"] for result in results] == ["segundo", None, "primeiro"]
+    assert results[0]["permissions"] == ["read"]
+    assert results[0] == client.post("/auth/validate", json={"token": second}).json()
+
+
+def test_repeated_tokens_are_verified_once(client, issue, token_cache):
+    token = issue()["access_token"]
+
+    results = client.post("/auth/validate/batch", json={"tokens": [token] * 5}).json()["results"]
+    assert len(results) == 5 and all(result["valid"] for result in results)
+    assert (token_cache.stats()["misses"], token_cache.stats()["hits"]) == (1, 0)
+
+
+def test_batch_size_is_capped(client, monkeypatch):
+    monkeypatch.setattr(config, "VALIDATE_BATCH_MAX_SIZE", 2)
+
+    assert client.post("/auth/validate/batch", json={"tokens": ["a", "b"]}).status_code == 200
+    assert client.post("/auth/validate/batch", json={"tokens": ["a", "b", "c"]}).status_code == 413
+    assert client.post("/auth/validate/batch", json={"tokens": []}).json() == {"results": []}
@@ -0,0 +1,49 @@
+import logging
+
+from app import auth
+from app.warmup import Warmup
+
+
+def test_steps_run_once_and_failures_are_skipped(caplog):
+    calls = []
+
+    def failing():
+        raise RuntimeError("falhou")
+
+    warmup = Warmup()
+    warmup.add_step("primeira", lambda: calls.append("primeira"))
+    warmup.add_step("falha", failing)
+    warmup.add_step("segunda", lambda: calls.append("segunda"))
+
+    with caplog.at_level(logging.ERROR, logger="app.warmup"):
+        report = warmup.run()
+    assert calls == ["primeira", "segunda"]
+    assert set(report) == {"primeira", "segunda", "total"}
+    assert "falha" in caplog.text
+
+    # Chamadas seguintes (ex: /_ah/warmup depois do startup) devolvem o mesmo relatório
+    assert warmup.run() is report
+    assert calls == ["primeira", "segunda"]
+
+    warmup.import_seconds = 0.5
+    lines = warmup.metrics()
+    assert 'auth_api_startup_seconds{phase="import"} 0.5' in lines
+    assert any(line.startswith('auth_api_startup_seconds{phase="warmup_primeira"}') for line in lines)
+
+
+def test_crypto_warm_up_leaves_no_state(token_cache):
+    auth.warm_up_crypto()
+    assert token_cache.stats()["size"] == 0
+    assert not auth.revocation_list.is_revoked("warmup")
+
+
+def test_app_engine_warmup_endpoint(client):
+    response = client.get("/_ah/warmup")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["status"] == "warm"
+    assert {"crypto", "responses", "total"} <= set(body["seconds"])
+
+    metrics = client.get("/metrics").text
+    assert 'auth_api_startup_seconds{phase="import"}' in metrics
+    assert 'auth_api_startup_seconds{phase="warmup_crypto"}' in metrics